@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def enforce_query_budgets(settings):
+    """Fail any test whose requests run more queries than the view's budget."""
+    settings.REQUEST_METRICS_QUERY_BUDGET_MODE = "raise"
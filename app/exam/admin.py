@@ -1,12 +1,33 @@
 from django.contrib import admin
 
 from exam.models import Exam, ExamQuestion
+from utils.admin import LargeTableAdmin, LinkOnlyRawIdWidget
 
 
 class ExamQuestionInline(admin.TabularInline):
     model = ExamQuestion
+    # A select would list the whole question bank on every row.
+    raw_id_fields = ("question",)
+
+    def get_queryset(self, request):
+        # Each row is titled with ExamQuestion.__str__, which reads both.
+        return (
+            super()
+            .get_queryset(request)
+            .select_related("exam", "question")
+            .defer("question__search_vector")
+        )
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.name == "question":
+            kwargs["widget"] = LinkOnlyRawIdWidget(
+                db_field.remote_field, self.admin_site, using=kwargs.get("using")
+            )
+        return super().formfield_for_foreignkey(db_field, request, **kwargs)
 
 
 @admin.register(Exam)
-class ExamAdmin(admin.ModelAdmin):
+class ExamAdmin(LargeTableAdmin):
     inlines = [ExamQuestionInline]
+    list_display = ("id", "name")
+    search_fields = ("id",)
@@ -0,0 +1,242 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+from exam.models import ExamQuestion
+from question.models import Alternative
+
+CACHE_KEY_PREFIX = "exam:answer-key"
+
+
+class AnswerKey:
+    """
+    Immutable snapshot of the question/alternative graph of an exam.
+
+    It holds everything needed to validate and score a submission without
+    touching the database: the exam's question ids (in exam order), the valid
+    alternative ids of each question and the ids of the correct alternatives.
+    """
+
+    def __init__(self, exam_id, question_ids, alternatives, correct_alternative_ids):
+        self.exam_id = exam_id
+        self.question_ids = tuple(question_ids)
+        self.alternatives = {
+            question_id: frozenset(alternative_ids)
+            for question_id, alternative_ids in alternatives.items()
+        }
+        self.correct_alternative_ids = frozenset(correct_alternative_ids)
+        self.alternative_questions = {
+            alternative_id: question_id
+            for question_id, alternative_ids in self.alternatives.items()
+            for alternative_id in alternative_ids
+        }
+
+    @classmethod
+    def load(cls, exam_id):
+        question_ids = list(cls._question_ids(exam_id))
+        rows = cls._alternative_rows(question_ids) if question_ids else []
+        return cls._from_rows(exam_id, question_ids, rows)
+
+    @classmethod
+    async def aload(cls, exam_id):
+        question_ids = [pk async for pk in cls._question_ids(exam_id)]
+        rows = []
+        if question_ids:
+            rows = [row async for row in cls._alternative_rows(question_ids)]
+        return cls._from_rows(exam_id, question_ids, rows)
+
+    @staticmethod
+    def _question_ids(exam_id):
+        return (
+            ExamQuestion.objects.filter(exam_id=exam_id)
+            .order_by("number")
+            .values_list("question_id", flat=True)
+        )
+
+    @staticmethod
+    def _alternative_rows(question_ids):
+        return Alternative.objects.filter(
+            question_id__in=set(question_ids)
+        ).values_list("id", "question_id", "is_correct")
+
+    @classmethod
+    def _from_rows(cls, exam_id, question_ids, alternative_rows):
+        alternatives = {question_id: set() for question_id in question_ids}
+        correct_alternative_ids = set()
+        for alternative_id, question_id, is_correct in alternative_rows:
+            alternatives[question_id].add(alternative_id)
+            if is_correct:
+                correct_alternative_ids.add(alternative_id)
+        return cls(exam_id, question_ids, alternatives, correct_alternative_ids)
+
+    def to_data(self):
+        return (
+            self.exam_id,
+            self.question_ids,
+            {key: tuple(value) for key, value in self.alternatives.items()},
+            tuple(self.correct_alternative_ids),
+        )
+
+    @classmethod
+    def from_data(cls, data):
+        return cls(*data)
+
+    def correct_alternatives_for(self, question_id):
+        return (
+            self.alternatives.get(question_id, frozenset())
+            & self.correct_alternative_ids
+        )
+
+    def score(self, selected_alternative_ids):
+        return sum(
+            alternative_id in self.correct_alternative_ids
+            for alternative_id in selected_alternative_ids
+        )
+
+
+class AnswerKeyCache:
+    """
+    Bounded in-process LRU of answer keys, optionally backed by one of
+    Django's cache backends so that several processes share the same keys.
+
+    When a shared cache is configured, every entry carries a token that is
+    rotated on invalidation, which lets each process notice that its local
+    copy went stale with a single small cache read. Invalidations only reach
+    other processes through that cache, so with several processes it must
+    be shared (e.g. Redis) and not the per-process LocMem cache. Local
+    entries also expire after `timeout` seconds, which bounds how long a
+    process can keep a stale key when the cache isn't shared.
+    """
+
+    def __init__(self, maxsize=None, cache_alias=None, timeout=None):
+        self.maxsize = maxsize
+        self.cache_alias = cache_alias
+        self.timeout = timeout
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def shared_cache(self):
+        if self.cache_alias is None:
+            return None
+        return caches[self.cache_alias]
+
+    def get(self, exam_id):
+        shared_cache = self.shared_cache
+        token = None
+        if shared_cache is not None:
+            token = shared_cache.get(self._token_key(exam_id))
+
+        answer_key = self._local(exam_id, shared_cache, token)
+        if answer_key is not None:
+            return answer_key
+
+        if token is not None:
+            data = shared_cache.get(self._data_key(exam_id, token))
+            if data is not None:
+                answer_key = AnswerKey.from_data(data)
+
+        if answer_key is None:
+            answer_key = AnswerKey.load(exam_id)
+            if shared_cache is not None:
+                token = uuid.uuid4().hex
+                shared_cache.set(
+                    self._data_key(exam_id, token), answer_key.to_data(), self.timeout
+                )
+                shared_cache.set(self._token_key(exam_id), token, self.timeout)
+
+        self._store(exam_id, token, answer_key)
+        return answer_key
+
+    async def aget(self, exam_id):
+        """Async version of `get`, loading missing keys with the async ORM."""
+        shared_cache = self.shared_cache
+        token = None
+        if shared_cache is not None:
+            token = await shared_cache.aget(self._token_key(exam_id))
+
+        answer_key = self._local(exam_id, shared_cache, token)
+        if answer_key is not None:
+            return answer_key
+
+        if token is not None:
+            data = await shared_cache.aget(self._data_key(exam_id, token))
+            if data is not None:
+                answer_key = AnswerKey.from_data(data)
+
+        if answer_key is None:
+            answer_key = await AnswerKey.aload(exam_id)
+            if shared_cache is not None:
+                token = uuid.uuid4().hex
+                await shared_cache.aset(
+                    self._data_key(exam_id, token), answer_key.to_data(), self.timeout
+                )
+                await shared_cache.aset(self._token_key(exam_id), token, self.timeout)
+
+        self._store(exam_id, token, answer_key)
+        return answer_key
+
+    def invalidate(self, exam_id):
+        with self._lock:
+            self._entries.pop(exam_id, None)
+        shared_cache = self.shared_cache
+        if shared_cache is not None:
+            shared_cache.delete(self._token_key(exam_id))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def _local(self, exam_id, shared_cache, token):
+        with self._lock:
+            entry = self._entries.get(exam_id)
+            if entry is None:
+                return None
+            stored_token, expires_at, answer_key = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[exam_id]
+                return None
+            if shared_cache is None or stored_token == token:
+                self._entries.move_to_end(exam_id)
+                return answer_key
+        return None
+
+    def _store(self, exam_id, token, answer_key):
+        expires_at = None
+        if self.timeout is not None:
+            expires_at = time.monotonic() + self.timeout
+        with self._lock:
+            self._entries[exam_id] = (token, expires_at, answer_key)
+            self._entries.move_to_end(exam_id)
+            while self.maxsize is not None and len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def _token_key(self, exam_id):
+        return f"{CACHE_KEY_PREFIX}:{exam_id}:token"
+
+    def _data_key(self, exam_id, token):
+        return f"{CACHE_KEY_PREFIX}:{exam_id}:{token}"
+
+
+answer_key_cache = AnswerKeyCache(
+    maxsize=settings.EXAM_ANSWER_KEY_CACHE_SIZE,
+    cache_alias=settings.EXAM_ANSWER_KEY_CACHE_ALIAS,
+    timeout=settings.EXAM_ANSWER_KEY_CACHE_TIMEOUT,
+)
+
+
+def get_answer_key(exam_id):
+    return answer_key_cache.get(exam_id)
+
+
+async def aget_answer_key(exam_id):
+    return await answer_key_cache.aget(exam_id)
+
+
+def invalidate_answer_key(*exam_ids):
+    for exam_id in exam_ids:
+        answer_key_cache.invalidate(exam_id)
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class ExamConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "exam"
+
+    def ready(self):
+        from exam import signals  # noqa: F401
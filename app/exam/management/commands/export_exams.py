@@ -0,0 +1,31 @@
+from django.core.management import BaseCommand, CommandError
+
+from exam.models import Exam
+from exam.transfer import export_exams
+
+
+class Command(BaseCommand):
+    """
+    Command that streams exams, with their questions and alternatives, as
+    JSON Lines.
+
+    You can call it by terminal like this:
+    -> "python manage.py export_exams 1 2 > exams.jsonl"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("exam_ids", type=int, nargs="+")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        exam_ids = options["exam_ids"]
+        missing = set(exam_ids) - set(
+            Exam.objects.filter(id__in=exam_ids).values_list("id", flat=True)
+        )
+        if missing:
+            raise CommandError(
+                f"Exams {', '.join(map(str, sorted(missing)))} do not exist."
+            )
+
+        for chunk in export_exams(exam_ids, batch_size=options["batch_size"]):
+            self.stdout.write(chunk, ending="")
@@ -0,0 +1,48 @@
+import sys
+from contextlib import nullcontext
+
+from django.core.management import BaseCommand, CommandError
+from exam.transfer import ExamImportError, import_exams
+
+
+class Command(BaseCommand):
+    """
+    Command that creates exams from a JSON Lines file in the format of
+    "export_exams", reading it one line at a time, or with "--update" updates
+    the exams and questions whose ids exist.
+
+    You can call it by terminal like this:
+    -> "python manage.py import_exams exams.jsonl"
+    -> "python manage.py import_exams - --update < exams.jsonl"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help='File to read, or "-" for stdin.')
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--update",
+            action="store_true",
+            help=(
+                "Update the exams and questions whose ids exist instead of "
+                "creating new ones. Only use it with files exported from this "
+                "database."
+            ),
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        try:
+            with nullcontext(sys.stdin) if path == "-" else open(path) as lines:
+                exams = import_exams(
+                    lines, batch_size=options["batch_size"], update=options["update"]
+                )
+        except (OSError, ExamImportError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        for exam in exams:
+            action = "Created" if exam["created"] else "Updated"
+            self.stdout.write(
+                f"{action} exam {exam['id']} ({exam['name']}) with "
+                f"{exam['questions']} questions."
+            )
+        self.stdout.write(self.style.SUCCESS(f"Imported {len(exams)} exams."))
@@ -0,0 +1,36 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exam", "0002_create_exams"),
+        ("question", "0002_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="examquestion",
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name="examquestion",
+            name="exam",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                to="exam.exam",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="examquestion",
+            constraint=models.UniqueConstraint(
+                fields=("exam", "number"),
+                include=("question",),
+                name="examquestion_exam_number_uniq",
+            ),
+        ),
+    ]
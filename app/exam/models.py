@@ -14,12 +14,20 @@ class Exam(models.Model):
 
 
 class ExamQuestion(models.Model):
-    exam = models.ForeignKey(Exam, on_delete=models.CASCADE)
+    # Indexed by the (exam, number) constraint, which also covers the question
+    # so an exam's questions are read in order from the index alone.
+    exam = models.ForeignKey(Exam, on_delete=models.CASCADE, db_index=False)
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     number = models.PositiveIntegerField()
 
     class Meta:
-        unique_together = ("exam", "number")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["exam", "number"],
+                include=["question"],
+                name="examquestion_exam_number_uniq",
+            ),
+        ]
         ordering = ["number"]
 
     def __str__(self):
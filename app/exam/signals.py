@@ -0,0 +1,53 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from exam.answer_key import invalidate_answer_key
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+
+
+def _invalidate(*exam_ids):
+    # Invalidate right away for this process and again once the transaction
+    # commits, so a concurrent reader cannot re-cache the uncommitted state.
+    invalidate_answer_key(*exam_ids)
+    transaction.on_commit(lambda: invalidate_answer_key(*exam_ids))
+
+
+def _exam_ids_for_question(question_id):
+    return list(
+        ExamQuestion.objects.filter(question_id=question_id).values_list(
+            "exam_id", flat=True
+        )
+    )
+
+
+@receiver([post_save, post_delete], sender=Exam)
+def invalidate_exam_answer_key(sender, instance, **kwargs):
+    _invalidate(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=ExamQuestion)
+def invalidate_exam_question_answer_key(sender, instance, **kwargs):
+    _invalidate(instance.exam_id)
+
+
+@receiver(m2m_changed, sender=Exam.questions.through)
+def invalidate_exam_questions_answer_key(sender, instance, action, **kwargs):
+    if isinstance(instance, Exam):
+        if action.startswith("post_"):
+            _invalidate(instance.pk)
+    elif action == "pre_clear":
+        _invalidate(*_exam_ids_for_question(instance.pk))
+    elif action.startswith("post_"):
+        _invalidate(*(kwargs["pk_set"] or ()))
+
+
+@receiver([post_save, post_delete], sender=Question)
+def invalidate_question_answer_keys(sender, instance, **kwargs):
+    _invalidate(*_exam_ids_for_question(instance.pk))
+
+
+@receiver([post_save, post_delete], sender=Alternative)
+def invalidate_alternative_answer_keys(sender, instance, **kwargs):
+    _invalidate(*_exam_ids_for_question(instance.question_id))
@@ -0,0 +1,324 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.urls import reverse
+from rest_framework.test import APIClient
+from exam.answer_key import answer_key_cache, get_answer_key
+from exam.models import Exam, ExamQuestion
+from exam.transfer import ExamImportError, export_exams, import_exams
+from question.models import Alternative, Question
+from student.models import Student
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def admin_client(api_client, db):
+    admin = Student.objects.create_superuser(
+        username="admin", email="admin@x.io", password="admin"
+    )
+    api_client.force_login(admin)
+    return api_client
+
+
+@pytest.fixture(autouse=True)
+def clear_answer_key_cache():
+    answer_key_cache.clear()
+    yield
+    answer_key_cache.clear()
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2, 3):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2, 3):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == number),
+            )
+    return exam
+
+
+def _lines(exam, batch_size=500):
+    return [
+        json.loads(line)
+        for chunk in export_exams([exam.id], batch_size=batch_size)
+        for line in chunk.splitlines()
+    ]
+
+
+def _structure(exam):
+    return [
+        (
+            exam_question.number,
+            exam_question.question.content,
+            list(
+                exam_question.question.alternatives.order_by("option").values_list(
+                    "option", "content", "is_correct"
+                )
+            ),
+        )
+        for exam_question in ExamQuestion.objects.filter(exam=exam)
+        .select_related("question")
+        .order_by("number")
+    ]
+
+
+def test_export_exam(exam, django_assert_num_queries):
+    with django_assert_num_queries(1 + 2 * 2 + 1):
+        lines = _lines(exam, batch_size=2)
+
+    assert lines[0] == {"exam": {"id": exam.id, "name": "Test Exam"}}
+    assert [line["question"]["number"] for line in lines[1:]] == [1, 2, 3]
+    first = ExamQuestion.objects.get(exam=exam, number=1).question
+    assert lines[1]["question"] == {
+        "id": first.id,
+        "number": 1,
+        "content": "Question 1",
+        "alternatives": [
+            {"option": 1, "content": "Option 1", "is_correct": True},
+            {"option": 2, "content": "Option 2", "is_correct": False},
+            {"option": 3, "content": "Option 3", "is_correct": False},
+        ],
+    }
+
+
+def test_import_copies_the_exam(exam, django_assert_max_num_queries):
+    lines = [json.dumps(line) for line in _lines(exam)]
+
+    with django_assert_max_num_queries(20):
+        (summary,) = import_exams(lines, batch_size=2)
+
+    assert summary["created"] is True
+    assert summary["questions"] == 3
+    copy = Exam.objects.get(id=summary["id"])
+    assert copy.name == "Test Exam"
+    assert _structure(copy) == _structure(exam)
+    assert not set(copy.questions.all()) & set(exam.questions.all())
+
+
+def test_import_leaves_rows_with_the_same_ids_alone(exam):
+    # A file from another database whose ids happen to match this exam's.
+    lines = _lines(exam)
+    lines[0]["exam"]["name"] = "Other exam"
+    lines[1]["question"]["content"] = "Other question"
+    del lines[2:]
+    structure = _structure(exam)
+
+    (summary,) = import_exams(json.dumps(line) for line in lines)
+
+    assert summary["created"] is True
+    assert summary["id"] != exam.id
+    exam.refresh_from_db()
+    assert exam.name == "Test Exam"
+    assert _structure(exam) == structure
+    assert _structure(Exam.objects.get(id=summary["id"]))[0][1] == "Other question"
+
+
+def test_import_upserts_and_invalidates_the_answer_key(exam):
+    old_answer_key = get_answer_key(exam.id)
+    lines = _lines(exam)
+    lines[0]["exam"]["name"] = "Renamed"
+    lines[1]["question"]["content"] = "Edited"
+    lines[1]["question"]["alternatives"][0]["is_correct"] = False
+    lines[1]["question"]["alternatives"][1]["is_correct"] = True
+    lines[2]["question"]["alternatives"].append(
+        {"option": 4, "content": "Option 4", "is_correct": False}
+    )
+    lines.append(
+        {
+            "question": {
+                "number": 4,
+                "content": "New question",
+                "alternatives": [{"option": 1, "content": "Yes", "is_correct": True}],
+            }
+        }
+    )
+    questions = Question.objects.count()
+
+    (summary,) = import_exams((json.dumps(line) for line in lines), update=True)
+
+    assert summary == {
+        "id": exam.id,
+        "name": "Renamed",
+        "created": False,
+        "questions": 4,
+    }
+    assert Question.objects.count() == questions + 1
+    structure = _structure(exam)
+    assert structure[0] == (
+        1,
+        "Edited",
+        [(1, "Option 1", False), (2, "Option 2", True), (3, "Option 3", False)],
+    )
+    assert len(structure[1][2]) == 4
+    assert structure[3] == (4, "New question", [(1, "Yes", True)])
+
+    answer_key = get_answer_key(exam.id)
+    assert answer_key is not old_answer_key
+    assert len(answer_key.question_ids) == 4
+    assert answer_key.correct_alternative_ids == set(
+        Alternative.objects.filter(
+            question__examquestion__exam=exam, is_correct=True
+        ).values_list("id", flat=True)
+    )
+
+
+def test_import_then_export_gives_back_the_file(exam):
+    lines = _lines(exam)
+    # The third question's correct alternative moves from option 3 to 1, and
+    # the second question is left out of the exam.
+    for alternative in lines[3]["question"]["alternatives"]:
+        alternative["is_correct"] = alternative["option"] == 1
+    del lines[2]
+
+    import_exams((json.dumps(line) for line in lines), update=True)
+
+    assert _lines(exam) == lines
+    assert get_answer_key(exam.id).correct_alternative_ids == set(
+        Alternative.objects.filter(
+            question__examquestion__exam=exam, option=1
+        ).values_list("id", flat=True)
+    )
+
+
+def test_import_keeps_left_out_alternatives_as_incorrect(exam):
+    lines = _lines(exam)
+    lines[3]["question"]["alternatives"] = [
+        {"option": 1, "content": "Option 1", "is_correct": True}
+    ]
+
+    import_exams((json.dumps(line) for line in lines), update=True)
+
+    assert _structure(exam)[2][2] == [
+        (1, "Option 1", True),
+        (2, "Option 2", False),
+        (3, "Option 3", False),
+    ]
+
+
+@pytest.mark.parametrize(
+    "lines, line, message",
+    [
+        (['{"question": {}}'], 1, 'must follow an "exam"'),
+        (['{"exam": {"name": "x"}}', "{"], 2, "Expecting property name"),
+        (['{"exam": {"name": "x"}}', "[]"], 2, 'either an "exam" or a "question"'),
+        (
+            [
+                '{"exam": {"name": "x"}}',
+                '{"question": {"number": 1, "content": "q", "alternatives": ['
+                '{"option": 1, "content": "a"}, {"option": 1, "content": "b"}]}}',
+            ],
+            2,
+            "Each option can appear only once",
+        ),
+        (
+            [
+                '{"exam": {"name": "x"}}',
+                '{"question": {"number": 2147483648, "content": "q", "alternatives": ['
+                '{"option": 1, "content": "a"}]}}',
+            ],
+            2,
+            "less than or equal to 2147483647",
+        ),
+    ],
+)
+def test_import_errors_report_the_line(db, lines, line, message):
+    exams = Exam.objects.count()
+
+    with pytest.raises(ExamImportError) as excinfo:
+        import_exams(lines)
+
+    assert excinfo.value.line == line
+    assert message in str(excinfo.value.errors)
+    assert Exam.objects.count() == exams
+
+
+def test_export_and_import_commands(exam, tmp_path):
+    path = tmp_path / "exams.jsonl"
+    out = io.StringIO()
+    call_command("export_exams", str(exam.id), stdout=out)
+    path.write_text(out.getvalue())
+
+    out = io.StringIO()
+    call_command("import_exams", str(path), stdout=out)
+
+    copy = Exam.objects.exclude(id=exam.id).get(name="Test Exam")
+    assert f"Created exam {copy.id} (Test Exam) with 3 questions." in out.getvalue()
+    assert _structure(copy) == _structure(exam)
+
+    path.write_text('{"exam": {"name": "x"}}\n[]\n')
+    with pytest.raises(CommandError, match=r'Line 2: \["Each line must have either'):
+        call_command("import_exams", str(path))
+    with pytest.raises(CommandError, match="Exams 999999 do not exist."):
+        call_command("export_exams", "999999")
+
+
+def test_export_and_import_endpoints(admin_client, exam):
+    response = admin_client.get(reverse("exam-export", kwargs={"exam_id": exam.id}))
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+    body = b"".join(response.streaming_content)
+
+    response = admin_client.post(
+        reverse("exam-import"),
+        body,
+        content_type="application/x-ndjson",
+    )
+    assert response.status_code == 200
+    (summary,) = response.json()["exams"]
+    assert summary["created"] is True
+    assert _structure(Exam.objects.get(id=summary["id"])) == _structure(exam)
+
+    response = admin_client.post(
+        reverse("exam-import") + "?update=1",
+        body.replace(b'"Test Exam"', b'"Renamed"'),
+        content_type="application/x-ndjson",
+    )
+    assert response.status_code == 200
+    assert response.json()["exams"] == [
+        {"id": exam.id, "name": "Renamed", "created": False, "questions": 3}
+    ]
+
+    response = admin_client.post(
+        reverse("exam-import"), b'{"exam": {}}\n', content_type="application/x-ndjson"
+    )
+    assert response.status_code == 400
+    assert response.json() == {
+        "line": 1,
+        "errors": {"name": ["This field is required."]},
+    }
+    assert (
+        admin_client.get(reverse("exam-export", kwargs={"exam_id": 999999})).status_code
+        == 404
+    )
+
+
+def test_export_and_import_endpoints_need_an_admin(api_client, exam):
+    url = reverse("exam-export", kwargs={"exam_id": exam.id})
+    assert api_client.get(url).status_code in (401, 403)
+
+    name = json.dumps({"exam": {"id": exam.id, "name": "Renamed"}}).encode()
+    response = api_client.post(
+        reverse("exam-import"), name, content_type="application/x-ndjson"
+    )
+    assert response.status_code in (401, 403)
+
+    student = Student.objects.create(username="student", email="student@x.io")
+    api_client.force_login(student)
+    response = api_client.post(
+        reverse("exam-import"), name, content_type="application/x-ndjson"
+    )
+    assert response.status_code == 403
+    assert Exam.objects.get(id=exam.id).name == "Test Exam"
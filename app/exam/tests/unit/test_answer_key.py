@@ -0,0 +1,147 @@
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import caches
+from exam.answer_key import (
+    AnswerKeyCache,
+    aget_answer_key,
+    answer_key_cache,
+    get_answer_key,
+)
+from exam.models import Exam, ExamQuestion
+from question.models import Question, Alternative
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2, 3):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == number),
+            )
+    return exam
+
+
+@pytest.fixture(autouse=True)
+def clear_answer_key_cache():
+    answer_key_cache.clear()
+    yield
+    answer_key_cache.clear()
+
+
+def test_answer_key_content(exam):
+    answer_key = get_answer_key(exam.id)
+
+    exam_questions = ExamQuestion.objects.filter(exam=exam).order_by("number")
+    assert answer_key.question_ids == tuple(eq.question_id for eq in exam_questions)
+    for question_id in answer_key.question_ids:
+        assert answer_key.alternatives[question_id] == set(
+            Alternative.objects.filter(question_id=question_id).values_list(
+                "id", flat=True
+            )
+        )
+        assert answer_key.correct_alternatives_for(question_id) == set(
+            Alternative.objects.filter(
+                question_id=question_id, is_correct=True
+            ).values_list("id", flat=True)
+        )
+
+
+def test_answer_key_is_served_from_memory(exam, django_assert_num_queries):
+    get_answer_key(exam.id)
+    with django_assert_num_queries(0):
+        get_answer_key(exam.id)
+
+
+def test_answer_key_async_load(exam, django_assert_num_queries):
+    answer_key = async_to_sync(aget_answer_key)(exam.id)
+
+    assert answer_key.to_data() == get_answer_key(exam.id).to_data()
+    with django_assert_num_queries(0):
+        assert async_to_sync(aget_answer_key)(exam.id) is answer_key
+
+
+def test_answer_key_cache_is_bounded(db):
+    cache = AnswerKeyCache(maxsize=2)
+    exams = [Exam.objects.create(name=f"Exam {number}") for number in range(3)]
+    for exam in exams:
+        cache.get(exam.id)
+    assert list(cache._entries) == [exams[1].id, exams[2].id]
+
+
+def test_answer_key_invalidated_on_alternative_change(exam):
+    answer_key = get_answer_key(exam.id)
+    question_id = answer_key.question_ids[0]
+    alternative = Alternative.objects.filter(
+        question_id=question_id, is_correct=False
+    ).first()
+
+    alternative.is_correct = True
+    alternative.save()
+
+    assert alternative.id in get_answer_key(exam.id).correct_alternative_ids
+
+
+def test_answer_key_invalidated_on_exam_question_change(exam):
+    get_answer_key(exam.id)
+    question = Question.objects.create(content="Question 3")
+    ExamQuestion.objects.create(exam=exam, question=question, number=3)
+
+    assert question.id in get_answer_key(exam.id).question_ids
+
+
+def test_answer_key_invalidated_on_question_delete(exam):
+    question_id = get_answer_key(exam.id).question_ids[0]
+    Question.objects.filter(id=question_id).get().delete()
+
+    assert question_id not in get_answer_key(exam.id).question_ids
+
+
+def test_shared_answer_key_cache(exam, django_assert_num_queries):
+    caches["default"].clear()
+    first_process = AnswerKeyCache(maxsize=8, cache_alias="default")
+    second_process = AnswerKeyCache(maxsize=8, cache_alias="default")
+
+    first_process.get(exam.id)
+    with django_assert_num_queries(0):
+        answer_key = second_process.get(exam.id)
+    assert len(answer_key.question_ids) == 2
+
+    first_process.invalidate(exam.id)
+    with django_assert_num_queries(2):
+        second_process.get(exam.id)
+
+
+def test_answer_key_change_reaches_other_processes(exam):
+    caches["default"].clear()
+    other_process = AnswerKeyCache(maxsize=8, cache_alias="default")
+    question_id = other_process.get(exam.id).question_ids[0]
+    alternative = Alternative.objects.filter(
+        question_id=question_id, is_correct=False
+    ).first()
+
+    # Saved by this process, whose signal handlers only invalidate its own
+    # cache and the token in the shared one.
+    alternative.is_correct = True
+    alternative.save()
+
+    assert alternative.id in other_process.get(exam.id).correct_alternative_ids
+
+
+def test_answer_key_expires_after_timeout(exam, monkeypatch, django_assert_num_queries):
+    now = 1000.0
+    monkeypatch.setattr("exam.answer_key.time.monotonic", lambda: now)
+    cache = AnswerKeyCache(maxsize=8, timeout=60)
+    cache.get(exam.id)
+
+    now += 59
+    with django_assert_num_queries(0):
+        cache.get(exam.id)
+    now += 1
+    with django_assert_num_queries(2):
+        cache.get(exam.id)
@@ -0,0 +1,283 @@
+import json
+from collections import defaultdict
+
+from django.db import transaction
+from rest_framework import serializers
+
+from exam.answer_key import invalidate_answer_key
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from question.utils import AlternativesChoices
+
+CONTENT_TYPE = "application/x-ndjson"
+
+
+class ExamImportError(Exception):
+    def __init__(self, line, errors):
+        super().__init__(f"Line {line}: {json.dumps(errors, ensure_ascii=False)}")
+        self.line = line
+        self.errors = errors
+
+
+class AlternativeLineSerializer(serializers.Serializer):
+    option = serializers.ChoiceField(choices=AlternativesChoices.choices)
+    content = serializers.CharField()
+    is_correct = serializers.BooleanField(allow_null=True, default=False)
+
+
+class QuestionLineSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    # The limits of ExamQuestion.number, a PositiveIntegerField.
+    number = serializers.IntegerField(min_value=1, max_value=2147483647)
+    content = serializers.CharField()
+    alternatives = AlternativeLineSerializer(
+        many=True, allow_empty=False, max_length=len(AlternativesChoices)
+    )
+
+    def validate_alternatives(self, alternatives):
+        options = [alternative["option"] for alternative in alternatives]
+        if len(set(options)) != len(options):
+            raise serializers.ValidationError("Each option can appear only once.")
+        return alternatives
+
+
+class ExamLineSerializer(serializers.Serializer):
+    id = serializers.IntegerField(required=False)
+    name = serializers.CharField(max_length=100)
+
+
+def _line(data):
+    return json.dumps(data, separators=(",", ":"), ensure_ascii=False) + "\n"
+
+
+def export_exams(exam_ids, batch_size=500):
+    """
+    Yield exams as JSON Lines: an "exam" line followed by one "question" line
+    per question, in exam order, with its alternatives.
+
+    Questions are read `batch_size` at a time (two queries per batch), so
+    memory use doesn't depend on the size of the exam.
+    """
+    exams = Exam.objects.filter(id__in=exam_ids).order_by("pk").values("id", "name")
+    for exam in exams:
+        yield _line({"exam": exam})
+        last_number = 0
+        while True:
+            rows = list(
+                ExamQuestion.objects.filter(exam_id=exam["id"], number__gt=last_number)
+                .order_by("number")
+                .values_list("number", "question_id", "question__content")[:batch_size]
+            )
+            if not rows:
+                break
+            alternatives = defaultdict(list)
+            for question_id, option, content, is_correct in (
+                Alternative.objects.filter(question_id__in={row[1] for row in rows})
+                .order_by("question_id", "option")
+                .values_list("question_id", "option", "content", "is_correct")
+            ):
+                alternatives[question_id].append(
+                    {"option": option, "content": content, "is_correct": is_correct}
+                )
+            yield "".join(
+                _line(
+                    {
+                        "question": {
+                            "id": question_id,
+                            "number": number,
+                            "content": content,
+                            "alternatives": alternatives[question_id],
+                        }
+                    }
+                )
+                for number, question_id, content in rows
+            )
+            last_number = rows[-1][0]
+
+
+class ExamImporter:
+    """
+    Upserts exams read line by line, writing their questions in batches of
+    `batch_size` with a fixed number of queries per batch.
+
+    Exams and questions are created, ignoring their "id": the ids of another
+    database may belong to unrelated rows here. With `update`, the ones with
+    an "id" that exists are updated instead. Questions are placed in the exam
+    by their number, replacing the question that had it, and alternatives are
+    matched to the existing ones by option, so importing an export with
+    `update` gives back the same exam. Questions and alternatives are never deleted, as that
+    would also delete the answers given to them: the numbers an updated exam
+    has but the file doesn't are removed from the exam, and the alternatives
+    an updated question has but the file doesn't are kept as incorrect.
+    """
+
+    def __init__(self, batch_size=500, update=False):
+        self.batch_size = batch_size
+        self.update = update
+        self.exams = []
+        self._questions = []
+        self._numbers = set()
+
+    def add(self, data):
+        if not isinstance(data, dict) or len(data.keys() & {"exam", "question"}) != 1:
+            raise serializers.ValidationError(
+                'Each line must have either an "exam" or a "question".'
+            )
+        if "exam" in data:
+            self.finish()
+            self._start_exam(self._validated(ExamLineSerializer, data["exam"]))
+            return
+
+        if not self.exams:
+            raise serializers.ValidationError('A "question" must follow an "exam".')
+        question = self._validated(QuestionLineSerializer, data["question"])
+        if question["number"] in self._numbers:
+            raise serializers.ValidationError(
+                f"Question number {question['number']} is repeated in the exam."
+            )
+        self._numbers.add(question["number"])
+        self._questions.append(question)
+        if len(self._questions) == self.batch_size:
+            self.flush()
+
+    @staticmethod
+    def _validated(serializer_class, data):
+        serializer = serializer_class(data=data)
+        serializer.is_valid(raise_exception=True)
+        return serializer.validated_data
+
+    def _start_exam(self, data):
+        exam_id = data.get("id") if self.update else None
+        created = not (
+            exam_id is not None
+            and Exam.objects.filter(id=exam_id).update(name=data["name"])
+        )
+        if created:
+            exam_id = Exam.objects.create(name=data["name"]).id
+        self.exams.append(
+            {"id": exam_id, "name": data["name"], "created": created, "questions": 0}
+        )
+        self._numbers = set()
+        _invalidate(exam_id)
+
+    def finish(self):
+        """Write the current exam's pending questions and drop its left-out numbers."""
+        self.flush()
+        if self.exams and not self.exams[-1]["created"]:
+            ExamQuestion.objects.filter(exam_id=self.exams[-1]["id"]).exclude(
+                number__in=self._numbers
+            ).delete()
+
+    def flush(self):
+        questions, self._questions = self._questions, []
+        if not questions:
+            return
+        exam = self.exams[-1]
+
+        existing_ids = set()
+        if self.update:
+            existing_ids = set(
+                Question.objects.filter(
+                    id__in={
+                        question["id"] for question in questions if "id" in question
+                    }
+                ).values_list("id", flat=True)
+            )
+        updated = [
+            Question(id=question["id"], content=question["content"])
+            for question in questions
+            if question.get("id") in existing_ids
+        ]
+        Question.objects.bulk_update(updated, ["content"])
+        created = Question.objects.bulk_create(
+            Question(content=question["content"])
+            for question in questions
+            if question.get("id") not in existing_ids
+        )
+        created_ids = iter(question.id for question in created)
+        question_ids = [
+            question["id"] if question.get("id") in existing_ids else next(created_ids)
+            for question in questions
+        ]
+
+        ExamQuestion.objects.bulk_create(
+            [
+                ExamQuestion(
+                    exam_id=exam["id"],
+                    question_id=question_id,
+                    number=question["number"],
+                )
+                for question_id, question in zip(question_ids, questions)
+            ],
+            update_conflicts=True,
+            unique_fields=["exam", "number"],
+            update_fields=["question"],
+        )
+
+        alternative_ids = {
+            (question_id, option): pk
+            for pk, question_id, option in Alternative.objects.filter(
+                question_id__in=existing_ids
+            ).values_list("id", "question_id", "option")
+        }
+        alternatives = [
+            Alternative(
+                id=alternative_ids.get((question_id, alternative["option"])),
+                question_id=question_id,
+                **alternative,
+            )
+            for question_id, question in zip(question_ids, questions)
+            for alternative in question["alternatives"]
+        ]
+        Alternative.objects.bulk_update(
+            [alternative for alternative in alternatives if alternative.id],
+            ["content", "is_correct"],
+        )
+        Alternative.objects.bulk_create(
+            alternative for alternative in alternatives if not alternative.id
+        )
+        left_out_ids = alternative_ids.keys() - {
+            (alternative.question_id, alternative.option)
+            for alternative in alternatives
+        }
+        Alternative.objects.filter(
+            id__in=[alternative_ids[key] for key in left_out_ids], is_correct=True
+        ).update(is_correct=False)
+
+        exam["questions"] += len(questions)
+        # Updated questions may also belong to other exams.
+        _invalidate(
+            exam["id"],
+            *ExamQuestion.objects.filter(question_id__in=existing_ids)
+            .values_list("exam_id", flat=True)
+            .distinct(),
+        )
+
+
+def _invalidate(*exam_ids):
+    # Bulk writes skip the model signals that keep answer keys up to date.
+    invalidate_answer_key(*exam_ids)
+    transaction.on_commit(lambda: invalidate_answer_key(*exam_ids))
+
+
+def import_exams(lines, batch_size=500, update=False):
+    """
+    Create (or with `update`, upsert) the exams of a JSON Lines stream (see `export_exams`) in a single
+    transaction, parsing one line at a time, and return a summary of them.
+
+    Errors are raised as an `ExamImportError` with the number of the line,
+    and nothing is imported then.
+    """
+    importer = ExamImporter(batch_size=batch_size, update=update)
+    with transaction.atomic():
+        for number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                importer.add(json.loads(line))
+            except ValueError as exc:
+                raise ExamImportError(number, str(exc)) from exc
+            except serializers.ValidationError as exc:
+                raise ExamImportError(number, exc.detail) from exc
+        importer.finish()
+    return importer.exams
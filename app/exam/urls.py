@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import ExamExportView, ExamImportView
+
+urlpatterns = [
+    path("exams/import/", ExamImportView.as_view(), name="exam-import"),
+    path(
+        "exams/<int:exam_id>/export/",
+        ExamExportView.as_view(),
+        name="exam-export",
+    ),
+]
@@ -1 +1,48 @@
-# Create your views here.
+from django.http import StreamingHttpResponse
+from rest_framework import generics, status
+from rest_framework.permissions import IsAdminUser
+from rest_framework.response import Response
+
+from exam.models import Exam
+from exam.transfer import CONTENT_TYPE, ExamImportError, export_exams, import_exams
+
+
+class ExamExportView(generics.GenericAPIView):
+    # The export includes the answer key.
+    permission_classes = [IsAdminUser]
+    # Checking it reads the session and the user.
+    query_budget = 4
+
+    def get(self, request, *args, **kwargs):
+        exam = generics.get_object_or_404(
+            Exam.objects.only("id"), id=self.kwargs.get("exam_id")
+        )
+        response = StreamingHttpResponse(
+            export_exams([exam.id]), content_type=CONTENT_TYPE
+        )
+        response["Content-Disposition"] = f'attachment; filename="exam-{exam.id}.jsonl"'
+        return response
+
+
+class ExamImportView(generics.GenericAPIView):
+    """
+    Creates the exams of a JSON Lines body (the format of `ExamExportView`),
+    read from the request stream one line at a time. With `?update=1`, the
+    exams and questions whose ids exist are updated instead.
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        stream = request.stream
+        lines = iter(stream.readline, b"") if stream is not None else []
+        try:
+            exams = import_exams(
+                lines, update=request.query_params.get("update") in ("1", "true")
+            )
+        except ExamImportError as exc:
+            return Response(
+                {"line": exc.line, "errors": exc.errors},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"exams": exams})
@@ -0,0 +1,20 @@
+"""
+Gunicorn configuration, read from the environment.
+
+Used by `entrypoint.sh` when `APP_SERVER` is `gunicorn` (WSGI workers) or
+`uvicorn` (ASGI workers running `medway_api/asgi.py`).
+"""
+
+import multiprocessing
+import os
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
+threads = int(os.environ.get("GUNICORN_THREADS", 1))
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
+backlog = int(os.environ.get("GUNICORN_BACKLOG", 2048))
+max_requests = int(os.environ.get("GUNICORN_MAX_REQUESTS", 0))
+max_requests_jitter = int(os.environ.get("GUNICORN_MAX_REQUESTS_JITTER", 0))
+accesslog = os.environ.get("GUNICORN_ACCESS_LOG") or None
+errorlog = "-"
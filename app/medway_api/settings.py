@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "django_filters",
     "student",
@@ -48,6 +49,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "utils.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -89,6 +91,16 @@ DATABASES = {
         "PASSWORD": os.environ.get("POSTGRES_PASSWORD"),
         "HOST": os.environ.get("POSTGRES_HOST", "db"),
         "PORT": os.environ.get("POSTGRES_PORT", "5432"),
+        # Keep connections open between requests instead of connecting on every
+        # request; 0 closes them at the end of each request.
+        "CONN_MAX_AGE": int(os.environ.get("POSTGRES_CONN_MAX_AGE", 60)),
+        "CONN_HEALTH_CHECKS": os.environ.get("POSTGRES_CONN_HEALTH_CHECKS", "1") == "1",
+        # Needed behind a pooler in transaction mode (see the pgbouncer service
+        # in docker-compose.yml), where cursors can't outlive a transaction.
+        "DISABLE_SERVER_SIDE_CURSORS": os.environ.get(
+            "POSTGRES_DISABLE_SERVER_SIDE_CURSORS", "0"
+        )
+        == "1",
     }
 }
 
@@ -141,3 +153,59 @@ REST_FRAMEWORK = {
 }
 
 AUTH_USER_MODEL = "student.Student"
+
+# Exam answer keys are kept in a per-process LRU, checked against a token in
+# this cache on every read. Invalidations made by one process only reach the
+# others through it, so the alias must point to a shared cache (e.g. Redis,
+# as in the production settings) when running several processes. Keys expire
+# after the timeout (seconds) either way.
+EXAM_ANSWER_KEY_CACHE_SIZE = int(os.environ.get("EXAM_ANSWER_KEY_CACHE_SIZE", 256))
+EXAM_ANSWER_KEY_CACHE_ALIAS = os.environ.get("EXAM_ANSWER_KEY_CACHE_ALIAS", "default")
+EXAM_ANSWER_KEY_CACHE_TIMEOUT = int(
+    os.environ.get("EXAM_ANSWER_KEY_CACHE_TIMEOUT", 5 * 60)
+)
+
+# Answers are written with one INSERT per batch of this many rows, and batch
+# submission requests accept at most this many students at once.
+SUBMISSION_ANSWERS_BATCH_SIZE = 10000
+SUBMISSION_BATCH_MAX_SIZE = 5000
+
+# Accept submissions into a queue table with 202 and only cheap checks; the
+# "process_submission_queue" command validates, stores and scores them later.
+# It applies to both the sync and the async submission views.
+SUBMISSION_QUEUE_ENABLED = os.environ.get("SUBMISSION_QUEUE_ENABLED", "0") == "1"
+SUBMISSION_QUEUE_BATCH_SIZE = 500
+
+# Serve the submission and result endpoints with async views, for ASGI servers.
+SUBMISSION_ASYNC_VIEWS = os.environ.get("SUBMISSION_ASYNC_VIEWS", "0") == "1"
+
+# Rendered exam results (without the percentile, which is added on each
+# request) are immutable and served from this cache. It must be shared by all
+# processes, so a deleted or rescored submission drops out of every one.
+SUBMISSION_RESULT_CACHE_ALIAS = os.environ.get(
+    "SUBMISSION_RESULT_CACHE_ALIAS", "default"
+)
+SUBMISSION_RESULT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Running item statistics of each exam, updated with the newer submissions
+# every time they are read. Submissions are only counted once they are older
+# than the lag (seconds), which must be longer than any transaction that
+# creates submissions, and the statistics are rebuilt from scratch once they
+# are older than the max age (seconds).
+SUBMISSION_ANALYTICS_CACHE_ALIAS = os.environ.get(
+    "SUBMISSION_ANALYTICS_CACHE_ALIAS", "default"
+)
+SUBMISSION_ANALYTICS_CACHE_TIMEOUT = None
+SUBMISSION_ANALYTICS_LAG = 60
+SUBMISSION_ANALYTICS_MAX_AGE = 60 * 60 * 24
+SUBMISSION_ANALYTICS_BATCH_SIZE = 100_000
+
+# Per-view query counts and time spent in the database, serializers and
+# rendering, exposed at /metrics. Views set their own `query_budget`; requests
+# over it are logged ("log"), raise an error ("raise", used by the tests) or
+# are only counted ("off").
+REQUEST_METRICS_ENABLED = os.environ.get("REQUEST_METRICS_ENABLED", "1") == "1"
+REQUEST_METRICS_HEADERS = os.environ.get("REQUEST_METRICS_HEADERS", "0") == "1"
+REQUEST_METRICS_QUERY_BUDGET_MODE = os.environ.get(
+    "REQUEST_METRICS_QUERY_BUDGET_MODE", "log"
+)
@@ -0,0 +1,49 @@
+"""
+Django settings for serving medway_api in production.
+
+They extend the development settings in `settings.py`, turning off DEBUG
+(which also stops Django from recording every executed query) and reading the
+deployment-specific values from the environment. DJANGO_SECRET_KEY and
+DJANGO_ALLOWED_HOSTS (comma-separated) must be set.
+"""
+
+import os
+
+from django.core.exceptions import ImproperlyConfigured
+
+from .settings import *  # noqa: F401, F403
+
+
+def required_environment(name):
+    value = os.environ.get(name)
+    if not value:
+        raise ImproperlyConfigured(f"Set the {name} environment variable.")
+    return value
+
+
+DEBUG = False
+
+SECRET_KEY = required_environment("DJANGO_SECRET_KEY")
+
+ALLOWED_HOSTS = required_environment("DJANGO_ALLOWED_HOSTS").split(",")
+
+# Shared by every worker process: answer keys, results and item statistics are
+# cached and invalidated through it.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL", "redis://redis:6379/0"),
+    }
+}
+
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {
+        "console": {"class": "logging.StreamHandler"},
+    },
+    "root": {
+        "handlers": ["console"],
+        "level": os.environ.get("DJANGO_LOG_LEVEL", "WARNING"),
+    },
+}
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from question.models import Question, Alternative
+from question.models import DuplicateQuestion, Question, Alternative
+from question.search import search_query
+from utils.admin import LargeTableAdmin
 
 
 class AlternativeInline(admin.TabularInline):
@@ -11,5 +13,34 @@ class AlternativeInline(admin.TabularInline):
 
 
 @admin.register(Question)
-class QuestionAdmin(admin.ModelAdmin):
+class QuestionAdmin(LargeTableAdmin):
     inlines = [AlternativeInline]
+    list_display = ("id", "preview")
+    search_fields = ("id",)
+    preview_field = "content"
+
+    def get_search_results(self, request, queryset, search_term):
+        by_id, may_have_duplicates = super().get_search_results(
+            request, queryset, search_term
+        )
+        query = search_query(search_term)
+        if query is None:
+            return by_id, may_have_duplicates
+        return by_id | queryset.filter(search_vector=query), may_have_duplicates
+
+
+@admin.register(Alternative)
+class AlternativeAdmin(LargeTableAdmin):
+    list_display = ("id", "question_id", "option", "is_correct", "preview")
+    list_filter = ("is_correct",)
+    raw_id_fields = ("question",)
+    search_fields = ("id", "question")
+    preview_field = "content"
+
+
+@admin.register(DuplicateQuestion)
+class DuplicateQuestionAdmin(LargeTableAdmin):
+    list_display = ("id", "question_id", "duplicate_of_id", "similarity")
+    raw_id_fields = ("question", "duplicate_of")
+    search_fields = ("question", "duplicate_of")
+    ordering = ("duplicate_of", "question")
@@ -0,0 +1,218 @@
+import re
+import unicodedata
+import zlib
+from collections import defaultdict
+
+import numpy as np
+from django.contrib.postgres.aggregates import StringAgg
+from django.db import transaction
+
+from question.models import DuplicateQuestion, Question
+
+WORD_RE = re.compile(r"\w+")
+
+# Signatures are computed this many questions at a time, which bounds the
+# memory of the permuted hashes to some tens of MB.
+SIGNATURE_BATCH_SIZE = 2000
+
+# The largest prime below 2**32: permuted hashes fit in 32 bits, and
+# a * x + b never overflows 64 bits for a, x, b < 2**32.
+HASH_PRIME = 4294967291
+
+
+def shingles(text, size=3):
+    """
+    The distinct hashed word n-grams of `text`, lowercased and without
+    accents, so trivial edits still share most of them.
+    """
+    # Decomposed accents are dropped with the rest of the non-ASCII text.
+    text = unicodedata.normalize("NFKD", text.lower()).encode("ascii", "ignore")
+    words = WORD_RE.findall(text.decode())
+    grams = {
+        " ".join(words[start : start + size])
+        for start in range(max(1, len(words) - size + 1))
+    }
+    grams.discard("")
+    return np.fromiter(
+        map(zlib.crc32, map(str.encode, grams)), dtype=np.uint64, count=len(grams)
+    )
+
+
+class MinHasher:
+    """
+    MinHash signatures: for each of `num_perm` random hash permutations, the
+    smallest permuted hash among a text's shingles. Two signatures agree in a
+    position with a probability equal to the Jaccard similarity of the
+    shingle sets.
+    """
+
+    def __init__(self, num_perm=64, seed=0):
+        rng = np.random.default_rng(seed)
+        self.a = rng.integers(1, HASH_PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, HASH_PRIME, size=num_perm, dtype=np.uint64)
+
+    def signatures(self, shingle_sets):
+        """Signatures of non-empty shingle sets, one row per set."""
+        hashes = np.concatenate(shingle_sets)
+        starts = np.cumsum([0] + [len(shingle_set) for shingle_set in shingle_sets])
+        permuted = (self.a[:, None] * hashes[None, :] + self.b[:, None]) % HASH_PRIME
+        return np.minimum.reduceat(permuted, starts[:-1], axis=1).T.astype(np.uint32)
+
+
+def candidate_pairs(signatures, bands):
+    """
+    Locality-sensitive hashing of the signatures: rows that are equal in
+    any band of `num_perm / bands` positions become candidate pairs, as an
+    array of (earlier row, later row).
+
+    Each row is only paired with the first row of each bucket it falls in,
+    not with every other row there, so there are at most `bands` pairs per
+    row even when a bucket is huge.
+    """
+    rows_per_band = signatures.shape[1] // bands
+    rows = np.arange(len(signatures))
+    pairs = []
+    for band in range(bands):
+        keys = np.ascontiguousarray(
+            signatures[:, band * rows_per_band : (band + 1) * rows_per_band]
+        ).view(np.dtype((np.void, rows_per_band * signatures.itemsize)))[:, 0]
+        _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+        leaders = first[inverse.ravel()]
+        paired = leaders != rows
+        pairs.append(np.stack([leaders[paired], rows[paired]], axis=1))
+    return np.unique(np.concatenate(pairs), axis=0)
+
+
+def similarities(signatures, pairs, chunk_size=100000):
+    """The estimated Jaccard similarity of each pair of rows."""
+    result = np.empty(len(pairs))
+    for start in range(0, len(pairs), chunk_size):
+        chunk = pairs[start : start + chunk_size]
+        result[start : start + chunk_size] = (
+            signatures[chunk[:, 0]] == signatures[chunk[:, 1]]
+        ).mean(axis=1)
+    return result
+
+
+def find_duplicates(questions, threshold=0.8, num_perm=64, bands=16, seed=0):
+    """
+    Find the near duplicates among `(id, text)` pairs given in id order, in
+    time linear in the number of questions.
+
+    Returns `(question_id, duplicate_of_id, similarity)` for every question
+    that is a near duplicate of another one, in id order. A pair is a near
+    duplicate when its signatures agree in `threshold` of the positions.
+    Near duplicates are grouped, and each group keeps its oldest question:
+    the others are listed as duplicates of the member they are most similar
+    to on the way to it, with their estimated Jaccard similarity, so every
+    listed pair is a near duplicate even when a chain of edits makes the
+    ends of a group differ.
+    """
+    hasher = MinHasher(num_perm, seed)
+    ids = []
+    signatures = []
+    batch = []
+    for question_id, text in questions:
+        shingle_set = shingles(text)
+        if len(shingle_set):
+            ids.append(question_id)
+            batch.append(shingle_set)
+        if len(batch) == SIGNATURE_BATCH_SIZE:
+            signatures.append(hasher.signatures(batch))
+            batch = []
+    if batch:
+        signatures.append(hasher.signatures(batch))
+    if not signatures:
+        return []
+    signatures = np.concatenate(signatures)
+
+    pairs = candidate_pairs(signatures, bands)
+    similarity = similarities(signatures, pairs)
+    confirmed = similarity >= threshold
+    pairs, similarity = pairs[confirmed], similarity[confirmed]
+
+    # Union-find of the confirmed pairs, rooted at the earliest row, taking
+    # the most similar pairs first (Kruskal): the pairs that join two groups
+    # make a tree of each group, along the strongest links.
+    parents = np.arange(len(ids))
+    links = defaultdict(list)
+
+    def root(row):
+        while parents[row] != row:
+            parents[row] = parents[parents[row]]
+            row = parents[row]
+        return row
+
+    order = np.argsort(-similarity, kind="stable")
+    for (first, second), pair_similarity in zip(
+        pairs[order].tolist(), similarity[order].tolist()
+    ):
+        first_root, second_root = root(first), root(second)
+        if first_root != second_root:
+            parents[max(first_root, second_root)] = min(first_root, second_root)
+            links[first].append((second, pair_similarity))
+            links[second].append((first, pair_similarity))
+
+    # Walk each tree from its root, the first of its rows in row order.
+    duplicate_of = {}
+    for group_root in sorted(links):
+        if group_root in duplicate_of:
+            continue
+        duplicate_of[group_root] = None
+        pending = [group_root]
+        while pending:
+            row = pending.pop()
+            for other, pair_similarity in links[row]:
+                if other not in duplicate_of:
+                    duplicate_of[other] = (row, pair_similarity)
+                    pending.append(other)
+    return [
+        (ids[row], ids[duplicate[0]], round(duplicate[1], 4))
+        for row, duplicate in sorted(duplicate_of.items())
+        if duplicate is not None
+    ]
+
+
+def iter_question_texts(batch_size=10000):
+    """Yield `(id, text)` of every question, with its alternatives, by id."""
+    last_id = 0
+    while True:
+        rows = list(
+            Question.objects.filter(id__gt=last_id)
+            .annotate(
+                alternatives_text=StringAgg(
+                    "alternatives__content", " ", ordering="alternatives__option"
+                )
+            )
+            .order_by("id")
+            .values_list("id", "content", "alternatives_text")[:batch_size]
+        )
+        if not rows:
+            return
+        for question_id, content, alternatives_text in rows:
+            yield question_id, f"{content} {alternatives_text or ''}"
+        last_id = rows[-1][0]
+
+
+def rebuild_duplicate_report(threshold=0.8, batch_size=10000, **options):
+    """
+    Find the near-duplicate questions of the whole bank and replace the
+    `DuplicateQuestion` report with them. Returns the number of duplicates.
+    """
+    duplicates = find_duplicates(
+        iter_question_texts(batch_size), threshold=threshold, **options
+    )
+    with transaction.atomic():
+        DuplicateQuestion.objects.all().delete()
+        DuplicateQuestion.objects.bulk_create(
+            (
+                DuplicateQuestion(
+                    question_id=question_id,
+                    duplicate_of_id=duplicate_of_id,
+                    similarity=similarity,
+                )
+                for question_id, duplicate_of_id, similarity in duplicates
+            ),
+            batch_size=batch_size,
+        )
+    return len(duplicates)
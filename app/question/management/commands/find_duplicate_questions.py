@@ -0,0 +1,48 @@
+import time
+
+from django.core.management import BaseCommand, CommandError
+from question.duplicates import rebuild_duplicate_report
+
+
+class Command(BaseCommand):
+    """
+    Command that finds the near-duplicate questions of the bank and replaces
+    the duplicate report (see "DuplicateQuestion") with them.
+
+    Questions are compared by the words of their content and alternatives,
+    with MinHash signatures grouped by locality-sensitive hashing, so the
+    run time grows linearly with the size of the bank. "--threshold" is the
+    minimum estimated Jaccard similarity of a near duplicate.
+
+    You can call it by terminal like this:
+    -> "python manage.py find_duplicate_questions"
+    -> "python manage.py find_duplicate_questions --threshold 0.9"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threshold", type=float, default=0.8)
+        parser.add_argument("--num-perm", type=int, default=64)
+        parser.add_argument("--bands", type=int, default=16)
+        parser.add_argument("--batch-size", type=int, default=10000)
+        parser.add_argument("--seed", type=int, default=0)
+
+    def handle(self, *args, **options):
+        if not 0 < options["threshold"] <= 1:
+            raise CommandError("--threshold must be between 0 and 1.")
+        if options["bands"] < 1 or options["num_perm"] % options["bands"]:
+            raise CommandError("--num-perm must be a multiple of --bands.")
+
+        started = time.perf_counter()
+        count = rebuild_duplicate_report(
+            threshold=options["threshold"],
+            batch_size=options["batch_size"],
+            num_perm=options["num_perm"],
+            bands=options["bands"],
+            seed=options["seed"],
+        )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Found {count} near-duplicate questions in "
+                f"{time.perf_counter() - started:.1f}s."
+            )
+        )
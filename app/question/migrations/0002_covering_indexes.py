@@ -0,0 +1,40 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("question", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="alternative",
+            name="question",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="alternatives",
+                to="question.question",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="alternative",
+            index=models.Index(
+                fields=["question", "id"],
+                include=("is_correct",),
+                name="alternative_question_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="alternative",
+            index=models.Index(
+                condition=models.Q(("is_correct", True)),
+                fields=["id"],
+                name="alternative_correct_idx",
+            ),
+        ),
+    ]
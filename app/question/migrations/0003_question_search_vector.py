@@ -0,0 +1,102 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:09
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Questions compute their own vector, from their content and the content of
+# their alternatives, whenever the content changes or the vector is reset.
+QUESTION_TRIGGER_SQL = """
+CREATE FUNCTION question_search_vector_update() RETURNS trigger AS $$
+BEGIN
+    NEW.search_vector :=
+        setweight(to_tsvector('portuguese', NEW.content), 'A')
+        || setweight(to_tsvector('portuguese', coalesce((
+            SELECT string_agg(content, ' ' ORDER BY option)
+            FROM question_alternative
+            WHERE question_id = NEW.id
+        ), '')), 'B');
+    RETURN NEW;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER question_search_vector_update
+BEFORE INSERT OR UPDATE OF content, search_vector ON question_question
+FOR EACH ROW EXECUTE FUNCTION question_search_vector_update();
+"""
+
+# Alternatives reset the vectors of their questions once per statement, so
+# a bulk insert or COPY of alternatives costs one UPDATE of the questions.
+ALTERNATIVE_TRIGGER_SQL = """
+CREATE FUNCTION alternative_search_vector_reset() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'UPDATE' THEN
+        UPDATE question_question SET search_vector = NULL
+        WHERE id IN (
+            SELECT question_id FROM new_alternatives
+            UNION SELECT question_id FROM old_alternatives
+        );
+    ELSIF TG_OP = 'INSERT' THEN
+        UPDATE question_question SET search_vector = NULL
+        WHERE id IN (SELECT question_id FROM new_alternatives);
+    ELSE
+        UPDATE question_question SET search_vector = NULL
+        WHERE id IN (SELECT question_id FROM old_alternatives);
+    END IF;
+    RETURN NULL;
+END
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER alternative_search_vector_insert
+AFTER INSERT ON question_alternative
+REFERENCING NEW TABLE AS new_alternatives
+FOR EACH STATEMENT EXECUTE FUNCTION alternative_search_vector_reset();
+
+CREATE TRIGGER alternative_search_vector_update
+AFTER UPDATE ON question_alternative
+REFERENCING OLD TABLE AS old_alternatives NEW TABLE AS new_alternatives
+FOR EACH STATEMENT EXECUTE FUNCTION alternative_search_vector_reset();
+
+CREATE TRIGGER alternative_search_vector_delete
+AFTER DELETE ON question_alternative
+REFERENCING OLD TABLE AS old_alternatives
+FOR EACH STATEMENT EXECUTE FUNCTION alternative_search_vector_reset();
+
+UPDATE question_question SET search_vector = NULL;
+"""
+
+DROP_TRIGGERS_SQL = """
+DROP TRIGGER alternative_search_vector_delete ON question_alternative;
+DROP TRIGGER alternative_search_vector_update ON question_alternative;
+DROP TRIGGER alternative_search_vector_insert ON question_alternative;
+DROP FUNCTION alternative_search_vector_reset();
+DROP TRIGGER question_search_vector_update ON question_question;
+DROP FUNCTION question_search_vector_update();
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("question", "0002_covering_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="question",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(
+                editable=False, null=True
+            ),
+        ),
+        migrations.RunSQL(
+            QUESTION_TRIGGER_SQL + ALTERNATIVE_TRIGGER_SQL,
+            reverse_sql=DROP_TRIGGERS_SQL,
+        ),
+        migrations.AddIndex(
+            model_name="question",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="question_search_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,55 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:21
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("question", "0003_question_search_vector"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="DuplicateQuestion",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("similarity", models.FloatField()),
+                ("detected_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "duplicate_of",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="duplicates",
+                        to="question.question",
+                    ),
+                ),
+                (
+                    "question",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="duplicate_report",
+                        to="question.question",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["duplicate_of", "question"],
+                        name="duplicatequestion_group_idx",
+                    )
+                ],
+            },
+        ),
+    ]
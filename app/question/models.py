@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 from question.utils import AlternativesChoices
@@ -5,18 +7,72 @@ from question.utils import AlternativesChoices
 
 class Question(models.Model):
     content = models.TextField()
+    # The content and the alternatives' content, weighted A and B. Kept up to
+    # date by database triggers (see migration 0003), so bulk loads that skip
+    # model signals, like COPY, are indexed too.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [GinIndex(fields=["search_vector"], name="question_search_idx")]
 
     def __str__(self):
         return self.content
 
 
 class Alternative(models.Model):
+    # Indexed by "alternative_question_idx", which leads with the question.
     question = models.ForeignKey(
-        Question, related_name="alternatives", on_delete=models.CASCADE
+        Question, related_name="alternatives", on_delete=models.CASCADE, db_index=False
     )
     content = models.TextField()
     option = models.IntegerField(choices=AlternativesChoices)
     is_correct = models.BooleanField(null=True)
 
+    class Meta:
+        indexes = [
+            # Answer keys read the alternatives of a set of questions.
+            models.Index(
+                fields=["question", "id"],
+                include=["is_correct"],
+                name="alternative_question_idx",
+            ),
+            # Scoring joins answers to the correct alternatives only.
+            models.Index(
+                fields=["id"],
+                condition=models.Q(is_correct=True),
+                name="alternative_correct_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.content
+
+
+class DuplicateQuestion(models.Model):
+    """
+    A question found to be a near duplicate of another one, by the
+    "find_duplicate_questions" command, to be reviewed and merged.
+    """
+
+    question = models.OneToOneField(
+        Question, on_delete=models.CASCADE, related_name="duplicate_report"
+    )
+    # Indexed by "duplicatequestion_group_idx", which leads with it.
+    duplicate_of = models.ForeignKey(
+        Question, on_delete=models.CASCADE, related_name="duplicates", db_index=False
+    )
+    # The estimated Jaccard similarity of their words, from 0 to 1.
+    similarity = models.FloatField()
+    detected_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            # The report is read group by group, keyset paginated.
+            models.Index(
+                fields=["duplicate_of", "question"],
+                name="duplicatequestion_group_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.question_id} duplicates {self.duplicate_of_id}"
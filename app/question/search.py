@@ -0,0 +1,44 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db.models import F
+
+from question.models import Question
+
+# Must match the configuration of the triggers in migration 0003.
+SEARCH_CONFIG = "portuguese"
+
+WORD_RE = re.compile(r"\w+")
+
+
+def search_query(text):
+    """
+    Return a query matching questions that have every word of `text`, or
+    None when `text` has no words.
+
+    Words are matched as prefixes ("diagn" finds "diagnóstico"), so results
+    show up while the author is still typing.
+    """
+    words = WORD_RE.findall(text)
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words),
+        config=SEARCH_CONFIG,
+        search_type="raw",
+    )
+
+
+def search_questions(text):
+    """
+    Questions matching `text` (see `search_query`), best ranked first:
+    matches in the question itself rank above matches in its alternatives.
+    """
+    query = search_query(text)
+    if query is None:
+        return Question.objects.none()
+    return (
+        Question.objects.filter(search_vector=query)
+        .annotate(rank=SearchRank(F("search_vector"), query))
+        .order_by("-rank", "id")
+    )
@@ -0,0 +1,73 @@
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework.test import APIClient
+from question.models import Alternative, DuplicateQuestion, Question
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def questions(db):
+    stem = (
+        "Paciente de 45 anos chega à emergência com dor torácica em aperto "
+        "há duas horas, irradiando para o braço esquerdo, com sudorese."
+    )
+    questions = Question.objects.bulk_create(
+        [
+            Question(content=stem),
+            Question(content="Gestante de 30 semanas com cefaleia e edema."),
+            Question(content=stem.replace("45 anos", "45 anos de idade")),
+        ]
+    )
+    Alternative.objects.bulk_create(
+        Alternative(question=question, content=content, option=option)
+        for question in questions
+        for option, content in enumerate(
+            ["Infarto agudo do miocárdio", "Dissecção de aorta"], start=1
+        )
+    )
+    return questions
+
+
+def test_command_replaces_the_report(questions):
+    original, other, duplicate = questions
+    DuplicateQuestion.objects.create(
+        question=other, duplicate_of=original, similarity=0.5
+    )
+
+    call_command("find_duplicate_questions")
+
+    report = DuplicateQuestion.objects.filter(question__in=questions)
+    assert list(report.values_list("question", "duplicate_of")) == [
+        (duplicate.id, original.id)
+    ]
+    assert 0.8 <= report.get().similarity < 1
+
+
+def test_report_endpoint(api_client, questions, settings):
+    original, other, duplicate = questions
+    DuplicateQuestion.objects.bulk_create(
+        [
+            DuplicateQuestion(
+                question=duplicate, duplicate_of=original, similarity=0.9
+            ),
+            DuplicateQuestion(question=other, duplicate_of=original, similarity=0.8),
+        ]
+    )
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "PAGE_SIZE": 1}
+
+    response = api_client.get(reverse("question-duplicates"))
+    assert response.status_code == 200
+    (first,) = response.data["results"]
+    assert first["question"] == other.id
+    assert first["question_content"] == other.content
+    assert first["duplicate_of"] == original.id
+    assert first["duplicate_of_content"] == original.content
+
+    response = api_client.get(response.data["next"])
+    assert [item["question"] for item in response.data["results"]] == [duplicate.id]
+    assert response.data["next"] is None
@@ -0,0 +1,104 @@
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework.test import APIClient
+from question.models import Alternative, Question
+from question.search import search_questions
+from student.models import Student
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def questions(db):
+    fever = Question.objects.create(content="Criança com febre alta há três dias.")
+    pain = Question.objects.create(content="Paciente com dor torácica aguda.")
+    Alternative.objects.bulk_create(
+        [
+            Alternative(question=pain, content="Infarto agudo", option=1),
+            Alternative(question=pain, content="Pneumonia com febre", option=2),
+            Alternative(question=fever, content="Otite média", option=1),
+        ]
+    )
+    return fever, pain
+
+
+def _search(text):
+    return [question.id for question in search_questions(text)]
+
+
+def test_search_ranks_and_matches_prefixes(questions):
+    fever, pain = questions
+
+    # Both have "febre", but only in the alternatives of the second one.
+    assert _search("febre") == [fever.id, pain.id]
+    assert _search("torác agud") == [pain.id]
+    assert _search("infarto") == [pain.id]
+    assert _search("febre otite") == [fever.id]
+    assert _search("!!") == []
+
+
+def test_vector_follows_changes_from_any_write(questions):
+    fever, pain = questions
+
+    Alternative.objects.filter(question=fever).update(content="Meningite")
+    assert _search("meningite") == [fever.id]
+    assert _search("otite") == []
+
+    Alternative.objects.filter(question=pain, option=1).delete()
+    assert _search("infarto") == []
+
+    Question.objects.filter(pk=pain.pk).update(content="Gestante com cefaleia.")
+    assert _search("cefaleia") == [pain.id]
+    # The alternatives are still indexed after the question changed.
+    assert _search("pneumonia") == [pain.id]
+
+    # Raw SQL, like the COPY of the data generator, is indexed as well.
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "INSERT INTO question_question (content) VALUES (%s) RETURNING id",
+            ["Hipertensão na gestação."],
+        )
+        (question_id,) = cursor.fetchone()
+    assert _search("hipertens") == [question_id]
+
+
+def test_search_endpoint(api_client, questions, django_assert_num_queries):
+    fever, pain = questions
+    url = reverse("question-search")
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url, {"q": "febre", "limit": 1})
+    assert response.status_code == 200
+    (result,) = response.data["results"]
+    assert result["id"] == fever.id
+    assert result["content"] == fever.content
+    assert result["rank"] > 0
+
+    for params, errors in (
+        ({}, {"q": "This field is required."}),
+        (
+            {"q": "febre", "limit": 0},
+            {"limit": "Ensure this value is between 1 and 100."},
+        ),
+        ({"q": "febre", "limit": "x"}, {"limit": "A valid integer is required."}),
+    ):
+        response = api_client.get(url, params)
+        assert response.status_code == 400
+        assert response.data == errors
+
+
+def test_admin_search_by_text_or_id(client, questions):
+    fever, pain = questions
+    admin = Student.objects.create_superuser(
+        username="admin", email="admin@x.io", password="admin"
+    )
+    client.force_login(admin)
+    url = reverse("admin:question_question_changelist")
+
+    for term, expected in (("febre", {fever.id, pain.id}), (str(pain.id), {pain.id})):
+        response = client.get(url, {"q": term})
+        assert {obj.id for obj in response.context["cl"].result_list} == expected
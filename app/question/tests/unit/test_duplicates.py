@@ -0,0 +1,73 @@
+import random
+
+from question.duplicates import MinHasher, find_duplicates, shingles
+
+WORDS = (
+    "paciente anos dor febre tosse exame sangue pressão tratamento diagnóstico "
+    "conduta quadro clínico agudo crônico abdominal torácica cefaleia dispneia "
+    "hipertensão diabetes infecção antibiótico cirurgia emergência gestante"
+).split()
+
+
+def _text(rng, words=40):
+    return " ".join(rng.choice(WORDS) for _ in range(words))
+
+
+def test_shingles_ignore_case_accents_and_punctuation():
+    assert set(shingles("Pressão arterial, alta!")) == set(
+        shingles("pressao ARTERIAL alta")
+    )
+    assert len(shingles("uma")) == 1
+    assert len(shingles(" .. ")) == 0
+
+
+def test_signatures_estimate_jaccard_similarity():
+    first = shingles(" ".join(f"a{n}" for n in range(100)))
+    second = shingles(" ".join(f"a{n}" for n in range(50, 150)))
+    signatures = MinHasher(num_perm=512).signatures([first, second])
+    jaccard = len(set(first) & set(second)) / len(set(first) | set(second))
+    assert abs((signatures[0] == signatures[1]).mean() - jaccard) < 0.08
+
+
+def test_near_duplicates_are_grouped_under_the_oldest_question():
+    rng = random.Random(0)
+    original = _text(rng)
+    words = original.split()
+    edited = " ".join(words[:20] + ["hemograma"] + words[20:])
+    questions = [(10, original), (11, _text(rng)), (12, edited), (13, _text(rng))]
+    questions += [(14, original.upper()), (15, ""), (16, "")]
+
+    duplicates = {row[0]: row[1:] for row in find_duplicates(questions)}
+    assert sorted(duplicates) == [12, 14]
+    assert duplicates[14] == (10, 1.0)
+    assert duplicates[12][0] == 10 and 0.8 <= duplicates[12][1] < 1
+
+
+def test_chained_near_duplicates_are_listed_against_a_near_duplicate():
+    # Each question drops words from the start of the previous one and adds
+    # as many at the end, so the ends of the chain share too few shingles.
+    first, second, third = (
+        " ".join(f"a{n}" for n in range(start, start + 100)) for start in (0, 15, 30)
+    )
+    questions = [(10, first), (11, second), (12, third)]
+
+    duplicates = {
+        row[0]: row[1:]
+        for row in find_duplicates(questions, threshold=0.6, num_perm=256, bands=64)
+    }
+    assert sorted(duplicates) == [11, 12]
+    assert duplicates[11][0] == 10
+    assert duplicates[12][0] == 11
+    assert all(similarity >= 0.6 for _, similarity in duplicates.values())
+    assert not find_duplicates(
+        [(10, first), (12, third)], threshold=0.6, num_perm=256, bands=64
+    )
+
+
+def test_finding_duplicates_is_close_to_linear():
+    rng = random.Random(1)
+    questions = [(number, _text(rng)) for number in range(3000)]
+    questions += [(3000 + number, text) for number, text in questions[:100]]
+
+    duplicates = find_duplicates(questions)
+    assert sorted(duplicates) == [(3000 + n, n, 1.0) for n in range(100)]
@@ -0,0 +1,11 @@
+from django.urls import path
+from .views import DuplicateQuestionReportView, QuestionSearchView
+
+urlpatterns = [
+    path("questions/search/", QuestionSearchView.as_view(), name="question-search"),
+    path(
+        "questions/duplicates/",
+        DuplicateQuestionReportView.as_view(),
+        name="question-duplicates",
+    ),
+]
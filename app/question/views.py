@@ -0,0 +1,71 @@
+from rest_framework import generics, serializers
+from rest_framework.response import Response
+
+from question.models import DuplicateQuestion
+from question.search import search_questions
+from utils.pagination import KeysetPagination
+
+
+class QuestionSearchView(generics.GenericAPIView):
+    """
+    Full-text search of the question bank, so exam authors find existing
+    questions before writing duplicates.
+    """
+
+    max_limit = 100
+    query_budget = 1
+
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get("q", "").strip()
+        if not text:
+            raise serializers.ValidationError({"q": "This field is required."})
+        try:
+            limit = int(request.query_params.get("limit", 20))
+        except ValueError:
+            raise serializers.ValidationError(
+                {"limit": "A valid integer is required."}
+            ) from None
+        if not 0 < limit <= self.max_limit:
+            raise serializers.ValidationError(
+                {"limit": f"Ensure this value is between 1 and {self.max_limit}."}
+            )
+        results = search_questions(text).values("id", "content", "rank")[:limit]
+        return Response({"results": list(results)})
+
+
+class DuplicateQuestionSerializer(serializers.ModelSerializer):
+    question_content = serializers.CharField(source="question.content")
+    duplicate_of_content = serializers.CharField(source="duplicate_of.content")
+
+    class Meta:
+        model = DuplicateQuestion
+        fields = [
+            "question",
+            "question_content",
+            "duplicate_of",
+            "duplicate_of_content",
+            "similarity",
+            "detected_at",
+        ]
+
+
+class DuplicateQuestionReportView(generics.ListAPIView):
+    """
+    The near duplicates found by the "find_duplicate_questions" command,
+    grouped by the question they duplicate, to be reviewed and merged.
+    """
+
+    serializer_class = DuplicateQuestionSerializer
+    pagination_class = KeysetPagination
+    ordering = ("duplicate_of", "question")
+    query_budget = 1
+
+    def get_queryset(self):
+        return DuplicateQuestion.objects.select_related(
+            "question", "duplicate_of"
+        ).only(
+            "similarity",
+            "detected_at",
+            "question__content",
+            "duplicate_of__content",
+        )
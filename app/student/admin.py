@@ -1,8 +1,10 @@
 from django.contrib import admin
 
 from student.models import Student
+from utils.admin import LargeTableAdmin
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
-    pass
+class StudentAdmin(LargeTableAdmin):
+    list_display = ("id", "email", "username", "name", "is_active")
+    search_fields = ("id", "email", "username")
@@ -0,0 +1,23 @@
+from django.contrib import admin
+
+from submission.models import ExamSubmission
+from utils.admin import LargeTableAdmin
+
+
+@admin.register(ExamSubmission)
+class ExamSubmissionAdmin(LargeTableAdmin):
+    list_display = (
+        "id",
+        "student",
+        "exam",
+        "submission_time",
+        "total_correct",
+        "total_questions",
+        "percentage_score",
+    )
+    list_select_related = ("student", "exam")
+    raw_id_fields = ("student", "exam")
+    search_fields = ("id", "student", "exam")
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).defer("result_document")
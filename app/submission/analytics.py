@@ -0,0 +1,251 @@
+import math
+from datetime import timedelta
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.utils import timezone
+
+from exam.answer_key import get_answer_key
+from submission.models import Answer, ExamSubmission
+
+CACHE_KEY_PREFIX = "submission:item-statistics"
+
+
+class ItemStatistics:
+    """
+    Running item statistics of an exam.
+
+    Only sums and counts are kept (per alternative, per question and over the
+    total scores), so the statistics of new submissions can be added without
+    reading the previous ones again. They include every submission made before
+    `counted_until`.
+    """
+
+    def __init__(self, answer_key):
+        self.built_at = timezone.now()
+        self.counted_until = None
+        self.question_ids = np.array(sorted(set(answer_key.question_ids)), np.int64)
+        self.alternative_ids = np.array(
+            sorted(answer_key.alternative_questions), np.int64
+        )
+        self.alternative_questions = np.searchsorted(
+            self.question_ids,
+            [answer_key.alternative_questions[pk] for pk in self.alternative_ids],
+        )
+        self.correct = np.isin(
+            self.alternative_ids, list(answer_key.correct_alternative_ids)
+        )
+        self.submissions = 0
+        self.score_sum = 0.0
+        self.score_square_sum = 0.0
+        self.alternative_counts = np.zeros(len(self.alternative_ids), np.int64)
+        self.question_correct_score_sums = np.zeros(len(self.question_ids))
+        self.question_score_sums = np.zeros(len(self.question_ids))
+
+    def matches(self, answer_key):
+        layout = ItemStatistics(answer_key)
+        return (
+            np.array_equal(self.alternative_ids, layout.alternative_ids)
+            and np.array_equal(self.question_ids, layout.question_ids)
+            and np.array_equal(self.correct, layout.correct)
+        )
+
+    def add(self, submissions, answer_batches):
+        """
+        Add new submissions, given as an array of (id, total_correct) rows
+        sorted by id, and batches of their answers as
+        (submission_id, selected_alternative_id) rows. Answers of other
+        submissions are ignored.
+        """
+        submission_ids, submission_scores = submissions.T
+        self.submissions += len(submission_ids)
+        self.score_sum += float(submission_scores.sum())
+        self.score_square_sum += float(np.square(submission_scores, dtype=float).sum())
+
+        for batch in answer_batches:
+            answer_submission_ids, alternative_ids = (
+                np.asarray(batch, np.int64).reshape(-1, 2).T
+            )
+            positions = np.minimum(
+                np.searchsorted(submission_ids, answer_submission_ids),
+                len(submission_ids) - 1,
+            )
+            known = submission_ids[positions] == answer_submission_ids
+            self.__add_answers(
+                alternative_ids[known],
+                submission_scores[positions[known]].astype(float),
+            )
+
+    def __add_answers(self, alternative_ids, scores):
+        if not len(self.alternative_ids):
+            return
+        positions = np.minimum(
+            np.searchsorted(self.alternative_ids, alternative_ids),
+            len(self.alternative_ids) - 1,
+        )
+        known = self.alternative_ids[positions] == alternative_ids
+        positions, scores = positions[known], scores[known]
+        questions = self.alternative_questions[positions]
+        correct = self.correct[positions]
+
+        self.alternative_counts += np.bincount(
+            positions, minlength=len(self.alternative_ids)
+        )
+        self.question_score_sums += np.bincount(
+            questions, weights=scores, minlength=len(self.question_ids)
+        )
+        self.question_correct_score_sums += np.bincount(
+            questions[correct],
+            weights=scores[correct],
+            minlength=len(self.question_ids),
+        )
+
+    def summary(self):
+        question_counts = np.bincount(
+            self.alternative_questions,
+            weights=self.alternative_counts,
+            minlength=len(self.question_ids),
+        )
+        correct_counts = np.bincount(
+            self.alternative_questions[self.correct],
+            weights=self.alternative_counts[self.correct],
+            minlength=len(self.question_ids),
+        )
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            shares = (
+                self.alternative_counts / question_counts[self.alternative_questions]
+            )
+            difficulty = correct_counts / question_counts
+            correct_means = self.question_correct_score_sums / correct_counts
+            incorrect_means = (
+                self.question_score_sums - self.question_correct_score_sums
+            ) / (question_counts - correct_counts)
+            submissions = self.submissions or np.nan
+            score_mean = self.score_sum / submissions
+            score_std = np.sqrt(
+                max(self.score_square_sum / submissions - score_mean**2, 0)
+            )
+            discrimination = (
+                (correct_means - incorrect_means)
+                / score_std
+                * np.sqrt(difficulty * (1 - difficulty))
+            )
+
+        questions = []
+        for index, question_id in enumerate(self.question_ids):
+            alternatives = np.flatnonzero(self.alternative_questions == index)
+            questions.append(
+                {
+                    "question": int(question_id),
+                    "responses": int(question_counts[index]),
+                    "difficulty": _number(difficulty[index]),
+                    "discrimination": _number(discrimination[index]),
+                    "alternatives": [
+                        {
+                            "alternative": int(self.alternative_ids[position]),
+                            "is_correct": bool(self.correct[position]),
+                            "count": int(self.alternative_counts[position]),
+                            "share": _number(shares[position]),
+                        }
+                        for position in alternatives
+                    ],
+                }
+            )
+        return {"submissions": self.submissions, "questions": questions}
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+def _submission_window(exam_id, start, end, prefix=""):
+    lookups = {f"{prefix}exam_id": exam_id, f"{prefix}submission_time__lt": end}
+    if start is not None:
+        lookups[f"{prefix}submission_time__gte"] = start
+    return lookups
+
+
+def _answer_batches(exam_id, start, end, size):
+    rows = (
+        Answer.objects.filter(**_submission_window(exam_id, start, end, "submission__"))
+        .order_by()
+        .values_list("submission_id", "selected_alternative_id")
+        .iterator(chunk_size=size)
+    )
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def item_statistics_key(exam_id):
+    return f"{CACHE_KEY_PREFIX}:{exam_id}"
+
+
+def get_item_statistics(exam_id):
+    """
+    Return the item statistics of an exam, kept up to date incrementally.
+
+    The running sums are cached, and each call only reads the answers of the
+    submissions made since the previous one, by submission time. A submission
+    is only counted once it is older than SUBMISSION_ANALYTICS_LAG: its id and
+    time are set before its transaction commits, so a newer one may commit
+    first, and the lag must be longer than any submission transaction.
+
+    The statistics are rebuilt from scratch when the exam's answer key
+    changed, when a submission was deleted (see `reset_item_statistics`) and
+    once they are older than SUBMISSION_ANALYTICS_MAX_AGE, which also catches
+    rows written or deleted with raw SQL.
+    """
+    cache = caches[settings.SUBMISSION_ANALYTICS_CACHE_ALIAS]
+    cache_key = item_statistics_key(exam_id)
+    answer_key = get_answer_key(exam_id)
+    now = timezone.now()
+
+    statistics = cache.get(cache_key)
+    if (
+        statistics is None
+        or not statistics.matches(answer_key)
+        or statistics.built_at
+        <= now - timedelta(seconds=settings.SUBMISSION_ANALYTICS_MAX_AGE)
+    ):
+        statistics = ItemStatistics(answer_key)
+
+    start = statistics.counted_until
+    end = now - timedelta(seconds=settings.SUBMISSION_ANALYTICS_LAG)
+    submissions = np.array(
+        list(
+            ExamSubmission.objects.filter(**_submission_window(exam_id, start, end))
+            .order_by("pk")
+            .values_list("pk", "total_correct")
+        ),
+        np.int64,
+    ).reshape(-1, 2)
+    if len(submissions):
+        statistics.add(
+            submissions,
+            _answer_batches(
+                exam_id, start, end, settings.SUBMISSION_ANALYTICS_BATCH_SIZE
+            ),
+        )
+        statistics.counted_until = end
+        cache.set(cache_key, statistics, settings.SUBMISSION_ANALYTICS_CACHE_TIMEOUT)
+    return statistics
+
+
+def reset_item_statistics(exam_id):
+    """
+    Drop the cached statistics of an exam, now and once the transaction
+    commits, e.g. after a submission is deleted: running sums can't subtract it.
+    """
+    cache = caches[settings.SUBMISSION_ANALYTICS_CACHE_ALIAS]
+    cache.delete(item_statistics_key(exam_id))
+    transaction.on_commit(lambda: cache.delete(item_statistics_key(exam_id)))
@@ -0,0 +1,76 @@
+from django.db import IntegrityError, transaction
+from rest_framework import serializers
+
+from question.models import Alternative, Question
+from submission.models import DraftAnswer, DraftSubmission, ExamSubmission
+from submission.serializers import (
+    build_submission,
+    save_submissions,
+    validate_exam_answers,
+)
+
+ALREADY_SUBMITTED = "This student has already submitted this exam."
+
+
+def save_draft_answers(student_id, exam_id, answers):
+    """
+    Upsert a delta of validated answers into the student's draft of an exam,
+    creating the draft on the first one.
+
+    It takes one INSERT ... ON CONFLICT for the draft and one for the answers,
+    so saving an answer costs the same however many were saved before.
+    """
+    with transaction.atomic():
+        (draft,) = DraftSubmission.objects.bulk_create(
+            [DraftSubmission(student_id=student_id, exam_id=exam_id)],
+            update_conflicts=True,
+            unique_fields=["student", "exam"],
+            update_fields=["updated_at"],
+        )
+        DraftAnswer.objects.bulk_create(
+            [DraftAnswer(draft=draft, **answer) for answer in answers],
+            update_conflicts=True,
+            unique_fields=["draft", "question"],
+            update_fields=["selected_alternative"],
+        )
+    return draft
+
+
+def finalize_draft(draft, answer_key):
+    """
+    Turn a draft that answers every question of the exam into a scored
+    submission, and delete it.
+
+    Must run in a transaction holding a lock on the draft. The draft answers
+    are checked against the answer key with the same rules as a submission
+    sent at once, and stored through `save_submissions`.
+    """
+    if ExamSubmission.objects.filter(
+        student_id=draft.student_id, exam_id=draft.exam_id
+    ).exists():
+        raise serializers.ValidationError(ALREADY_SUBMITTED)
+
+    positions = {pk: index for index, pk in enumerate(answer_key.question_ids)}
+    rows = sorted(
+        draft.answers.values_list("question_id", "selected_alternative_id"),
+        key=lambda row: positions.get(row[0], len(positions)),
+    )
+    answers = [
+        {
+            "question": Question(pk=question_id),
+            "selected_alternative": Alternative(
+                pk=alternative_id,
+                question_id=answer_key.alternative_questions.get(alternative_id),
+            ),
+        }
+        for question_id, alternative_id in rows
+    ]
+    validate_exam_answers(answers, answer_key)
+
+    submission = build_submission(draft.student_id, answers, answer_key)
+    try:
+        save_submissions([(submission, answers)])
+    except IntegrityError as exc:
+        raise serializers.ValidationError(ALREADY_SUBMITTED) from exc
+    draft.delete()
+    return submission, answers
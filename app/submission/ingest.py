@@ -0,0 +1,106 @@
+from django.db import IntegrityError
+from rest_framework import serializers
+
+from student.models import Student
+from submission.models import ExamSubmission
+from submission.serializers import (
+    BatchSubmissionEntrySerializer,
+    build_submission,
+    save_submissions,
+    validate_exam_answers,
+)
+
+CREATED = "created"
+INVALID = "invalid"
+NOT_FOUND = "not_found"
+
+
+def ingest_submissions(answer_key, entries):
+    """
+    Validate and store many students' submissions to the same exam.
+
+    Every entry is checked with the same rules as `ExamSubmissionSerializer`,
+    against a single load of the exam's answer key, with two queries for the
+    whole batch to find missing students and previous submissions. The valid
+    entries are then written in bulk. One result is returned per entry, in the
+    same order.
+    """
+    try:
+        return _ingest_submissions(answer_key, entries)
+    except IntegrityError:
+        # A concurrent request stored a submission of one of these students
+        # after they were checked; checking again reports it as a duplicate.
+        return _ingest_submissions(answer_key, entries)
+
+
+def _ingest_submissions(answer_key, entries):
+    context = {"answer_key": answer_key}
+    entry_serializers = [
+        BatchSubmissionEntrySerializer(data=entry, context=context) for entry in entries
+    ]
+    for serializer in entry_serializers:
+        serializer.is_valid()
+
+    student_ids = {
+        serializer.validated_data["student"]
+        for serializer in entry_serializers
+        if not serializer.errors
+    }
+    existing_student_ids = set(
+        Student.objects.filter(pk__in=student_ids).values_list("pk", flat=True)
+    )
+    submitted_student_ids = set(
+        ExamSubmission.objects.filter(
+            exam_id=answer_key.exam_id, student_id__in=student_ids
+        ).values_list("student_id", flat=True)
+    )
+
+    results = []
+    pending = []
+    created = []
+    for entry, serializer in zip(entries, entry_serializers):
+        student = entry.get("student") if isinstance(entry, dict) else None
+        if serializer.errors:
+            results.append(_result(student, INVALID, serializer.errors))
+            continue
+
+        student_id = serializer.validated_data["student"]
+        answers = serializer.validated_data["answers"]
+        if student_id not in existing_student_ids:
+            results.append(
+                _result(
+                    student,
+                    NOT_FOUND,
+                    {"detail": "No Student matches the given query."},
+                )
+            )
+            continue
+
+        try:
+            if student_id in submitted_student_ids:
+                raise serializers.ValidationError(
+                    "This student has already submitted this exam."
+                )
+            validate_exam_answers(answers, answer_key)
+        except serializers.ValidationError as exc:
+            results.append(_result(student, INVALID, {"non_field_errors": exc.detail}))
+            continue
+
+        submitted_student_ids.add(student_id)
+        submission = build_submission(student_id, answers, answer_key)
+        pending.append((submission, answers))
+        results.append(_result(student, CREATED))
+        created.append((results[-1], submission))
+
+    if pending:
+        save_submissions(pending)
+    for result, submission in created:
+        result["submission"] = submission.pk
+    return results
+
+
+def _result(student, status, errors=None):
+    result = {"student": student, "status": status}
+    if errors is not None:
+        result["errors"] = errors
+    return result
@@ -0,0 +1,132 @@
+from collections import Counter
+
+from django.db import connection, transaction
+from django.db.models import Count, F, Q, Sum
+
+from submission.models import ExamScoreHistogram, ExamSubmission
+
+UPSERT_HISTOGRAM_SQL = """
+INSERT INTO submission_examscorehistogram (exam_id, score, count)
+VALUES {values}
+ON CONFLICT (exam_id, score)
+DO UPDATE SET count = submission_examscorehistogram.count + EXCLUDED.count
+"""
+
+
+def record_scores(submissions):
+    """
+    Add the scores of new submissions to their exams' histograms, with a
+    single upsert that increments the existing counts.
+    """
+    counts = Counter(
+        (submission.exam_id, submission.total_correct) for submission in submissions
+    )
+    if not counts:
+        return
+    values = ", ".join(["(%s, %s, %s)"] * len(counts))
+    params = [
+        value
+        for (exam_id, score), count in sorted(counts.items())
+        for value in (exam_id, score, count)
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(UPSERT_HISTOGRAM_SQL.format(values=values), params)
+
+
+def discard_score(exam_id, score):
+    ExamScoreHistogram.objects.filter(exam_id=exam_id, score=score, count__gt=0).update(
+        count=F("count") - 1
+    )
+
+
+def rebuild_histograms(exam_ids):
+    """Recount the histograms of the given exams from their submissions."""
+    exam_ids = set(exam_ids)
+    with transaction.atomic():
+        ExamScoreHistogram.objects.filter(exam_id__in=exam_ids).delete()
+        ExamScoreHistogram.objects.bulk_create(
+            ExamScoreHistogram(exam_id=exam_id, score=score, count=count)
+            for exam_id, score, count in ExamSubmission.objects.filter(
+                exam_id__in=exam_ids
+            )
+            .order_by()
+            .values("exam_id", "total_correct")
+            .annotate(count=Count("pk"))
+            .values_list("exam_id", "total_correct", "count")
+        )
+
+
+def get_percentile(exam_id, score):
+    """
+    Return the percentile rank of a score among the exam's submissions: the
+    share of submissions scoring lower, counting ties as half.
+
+    It reads one histogram row per distinct score, so its cost doesn't depend
+    on the number of submissions.
+    """
+    counts = ExamScoreHistogram.objects.filter(exam_id=exam_id).aggregate(
+        **_percentile_counts(score)
+    )
+    return _percentile(counts)
+
+
+async def aget_percentile(exam_id, score):
+    counts = await ExamScoreHistogram.objects.filter(exam_id=exam_id).aaggregate(
+        **_percentile_counts(score)
+    )
+    return _percentile(counts)
+
+
+def _percentile_counts(score):
+    return {
+        "below": Sum("count", filter=Q(score__lt=score), default=0),
+        "equal": Sum("count", filter=Q(score=score), default=0),
+        "total": Sum("count", default=0),
+    }
+
+
+def _percentile(counts):
+    if not counts["total"]:
+        return None
+    return (counts["below"] + counts["equal"] / 2) / counts["total"] * 100
+
+
+def get_leaderboard(exam_id, limit):
+    """
+    Return the best `limit` submissions of an exam with their ranks.
+
+    Submissions are read through the (exam, -total_correct, submission_time)
+    index, and ranks come from the histogram, so ties share the same rank.
+    """
+    ranks = {}
+    higher = 0
+    for score, count in (
+        ExamScoreHistogram.objects.filter(exam_id=exam_id, count__gt=0)
+        .order_by("-score")
+        .values_list("score", "count")
+    ):
+        ranks[score] = higher + 1
+        higher += count
+
+    submissions = (
+        ExamSubmission.objects.filter(exam_id=exam_id)
+        .order_by("-total_correct", "submission_time")
+        .values(
+            "student_id",
+            "student__email",
+            "total_correct",
+            "percentage_score",
+            "submission_time",
+        )[:limit]
+    )
+    return [
+        {
+            "rank": ranks.get(submission["total_correct"]),
+            "student": submission["student__email"],
+            "student_id": submission["student_id"],
+            "total_correct": submission["total_correct"],
+            "percentage_score": submission["percentage_score"],
+            "submission_time": submission["submission_time"],
+        }
+        for submission in submissions
+    ]
@@ -0,0 +1,58 @@
+from django.core.management import BaseCommand, CommandError
+
+from submission.leaderboard import rebuild_histograms
+from submission.models import ExamSubmission
+from submission.results import invalidate_result_documents
+
+
+class Command(BaseCommand):
+    """
+    Command that recomputes the scores stored on exam submissions.
+
+    Every batch is fixed with a single set-based UPDATE. The rendered results
+    of the fixed submissions are discarded, and the score histograms of their
+    exams are recounted. With "--verify" the
+    command only reports the submissions whose stored score is outdated and
+    fails if there is any.
+
+    You can call it by terminal like this:
+    -> "python manage.py backfill_submission_scores"
+    -> "python manage.py backfill_submission_scores --verify"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--verify", action="store_true")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        outdated_ids = (
+            ExamSubmission.objects.with_outdated_scores()
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+
+        if options["verify"]:
+            total_outdated = outdated_ids.count()
+            if total_outdated:
+                raise CommandError(
+                    f"{total_outdated} submissions have outdated scores."
+                )
+            self.stdout.write(self.style.SUCCESS("All submission scores are valid."))
+            return
+
+        total_updated = 0
+        last_id = 0
+        while True:
+            batch = list(outdated_ids.filter(pk__gt=last_id)[:batch_size])
+            if not batch:
+                break
+            submissions = ExamSubmission.objects.filter(pk__in=batch)
+            total_updated += submissions.refresh_scores()
+            invalidate_result_documents(submissions)
+            rebuild_histograms(submissions.values_list("exam_id", flat=True))
+            last_id = batch[-1]
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated the scores of {total_updated} submissions.")
+        )
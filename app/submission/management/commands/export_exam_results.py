@@ -0,0 +1,28 @@
+from django.core.management import BaseCommand, CommandError
+
+from exam.models import Exam
+from submission.reports import REPORT_STREAMS, stream_exam_results
+
+
+class Command(BaseCommand):
+    """
+    Command that streams the results of every submission to an exam.
+
+    You can call it by terminal like this:
+    -> "python manage.py export_exam_results 1 > results.csv"
+    -> "python manage.py export_exam_results 1 --output-format ndjson"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("exam_id", type=int)
+        parser.add_argument(
+            "--output-format", choices=list(REPORT_STREAMS), default="csv"
+        )
+
+    def handle(self, *args, **options):
+        exam_id = options["exam_id"]
+        if not Exam.objects.filter(id=exam_id).exists():
+            raise CommandError(f"Exam {exam_id} does not exist.")
+
+        for chunk in stream_exam_results(exam_id, options["output_format"]):
+            self.stdout.write(chunk, ending="")
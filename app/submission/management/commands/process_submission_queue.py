@@ -0,0 +1,49 @@
+import time
+
+from django.conf import settings
+from django.core.management import BaseCommand
+from django.db import close_old_connections
+
+from submission.queue import process_queued_submissions
+
+
+class Command(BaseCommand):
+    """
+    Command that drains the queue of submissions accepted while
+    SUBMISSION_QUEUE_ENABLED is on, validating, storing and scoring them in
+    batches. It keeps polling for new submissions unless "--once" is given,
+    and several workers can run at the same time.
+
+    You can call it by terminal like this:
+    -> "python manage.py process_submission_queue"
+    -> "python manage.py process_submission_queue --once --batch-size 1000"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size", type=int, default=settings.SUBMISSION_QUEUE_BATCH_SIZE
+        )
+        parser.add_argument("--poll-interval", type=float, default=1.0)
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Exit once the queue is empty instead of waiting for more.",
+        )
+
+    def handle(self, *args, **options):
+        total_processed = 0
+        while True:
+            processed = process_queued_submissions(options["batch_size"])
+            total_processed += processed
+            if processed:
+                self.stdout.write(f"Processed {processed} queued submissions.")
+                continue
+            if options["once"]:
+                break
+            # Drop broken or expired connections while idle, as requests do.
+            close_old_connections()
+            time.sleep(options["poll_interval"])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Processed {total_processed} queued submissions.")
+        )
@@ -0,0 +1,51 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:46
+
+from django.db import migrations, models
+
+BACKFILL_SCORES_SQL = """
+UPDATE submission_examsubmission AS submission
+SET total_correct = scores.total_correct,
+    total_questions = scores.total_questions,
+    percentage_score = CASE
+        WHEN scores.total_questions > 0
+        THEN scores.total_correct::double precision
+            / scores.total_questions::double precision * 100.0
+        ELSE 0
+    END
+FROM (
+    SELECT answer.submission_id,
+           COUNT(*) FILTER (WHERE alternative.is_correct) AS total_correct,
+           COUNT(*) AS total_questions
+    FROM submission_answer AS answer
+    JOIN question_alternative AS alternative
+        ON alternative.id = answer.selected_alternative_id
+    GROUP BY answer.submission_id
+) AS scores
+WHERE scores.submission_id = submission.id
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submission", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="examsubmission",
+            name="percentage_score",
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddField(
+            model_name="examsubmission",
+            name="total_correct",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="examsubmission",
+            name="total_questions",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(BACKFILL_SCORES_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
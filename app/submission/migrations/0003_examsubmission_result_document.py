@@ -0,0 +1,18 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submission", "0002_examsubmission_scores"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="examsubmission",
+            name="result_document",
+            field=models.BinaryField(null=True),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.6 on 2026-10-17 01:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+BACKFILL_HISTOGRAM_SQL = """
+INSERT INTO submission_examscorehistogram (exam_id, score, count)
+SELECT exam_id, total_correct, COUNT(*)
+FROM submission_examsubmission
+GROUP BY exam_id, total_correct
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exam", "0002_create_exams"),
+        ("submission", "0003_examsubmission_result_document"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ExamScoreHistogram",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("score", models.PositiveIntegerField()),
+                ("count", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="examsubmission",
+            index=models.Index(
+                fields=["exam", "-total_correct", "submission_time"],
+                name="submission_exam_ranking_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="examscorehistogram",
+            name="exam",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="score_histogram",
+                to="exam.exam",
+            ),
+        ),
+        migrations.AlterUniqueTogether(
+            name="examscorehistogram",
+            unique_together={("exam", "score")},
+        ),
+        migrations.RunSQL(BACKFILL_HISTOGRAM_SQL, reverse_sql=migrations.RunSQL.noop),
+    ]
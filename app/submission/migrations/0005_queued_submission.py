@@ -0,0 +1,66 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:26
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submission", "0004_exam_score_histogram"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QueuedSubmission",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("student_id", models.BigIntegerField()),
+                ("exam_id", models.BigIntegerField()),
+                ("payload", models.JSONField()),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("created", "Created"),
+                            ("invalid", "Invalid"),
+                            ("not_found", "Not found"),
+                        ],
+                        default="pending",
+                        max_length=16,
+                    ),
+                ),
+                ("errors", models.JSONField(blank=True, null=True)),
+                ("received_at", models.DateTimeField(auto_now_add=True)),
+                ("processed_at", models.DateTimeField(blank=True, null=True)),
+                (
+                    "submission",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="submission.examsubmission",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        condition=models.Q(("status", "pending")),
+                        fields=["id"],
+                        name="submission_queue_pending_idx",
+                    )
+                ],
+            },
+        ),
+    ]
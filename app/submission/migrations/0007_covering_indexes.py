@@ -0,0 +1,37 @@
+# Generated by Django 5.0.6 on 2026-10-17 02:30
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("question", "0002_covering_indexes"),
+        ("submission", "0006_draft_submissions"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="answer",
+            unique_together=set(),
+        ),
+        migrations.AlterField(
+            model_name="answer",
+            name="submission",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="answers",
+                to="submission.examsubmission",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="answer",
+            constraint=models.UniqueConstraint(
+                fields=("submission", "question"),
+                include=("selected_alternative",),
+                name="answer_submission_question_uniq",
+            ),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:05
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exam", "0003_covering_indexes"),
+        ("submission", "0007_covering_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="examsubmission",
+            index=models.Index(
+                fields=["student", "-submission_time", "-id"],
+                include=(
+                    "exam",
+                    "total_correct",
+                    "total_questions",
+                    "percentage_score",
+                ),
+                name="submission_student_history_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.6 on 2026-10-17 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exam", "0003_covering_indexes"),
+        ("submission", "0008_student_history_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="examsubmission",
+            index=models.Index(
+                fields=["exam", "submission_time"],
+                include=("total_correct",),
+                name="submission_exam_time_idx",
+            ),
+        ),
+    ]
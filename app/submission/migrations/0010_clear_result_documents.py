@@ -0,0 +1,23 @@
+# Generated by Django 5.0.6 on 2026-10-17 09:40
+
+from django.db import migrations
+
+# Stored results used to include the percentile, which is now added to them
+# on every request; they are rendered again the next time they are read.
+CLEAR_RESULT_DOCUMENTS_SQL = """
+UPDATE submission_examsubmission SET result_document = NULL
+WHERE result_document IS NOT NULL;
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submission", "0009_exam_time_index"),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            CLEAR_RESULT_DOCUMENTS_SQL, reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.0.6 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("submission", "0010_clear_result_documents"),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name="queuedsubmission",
+            name="status",
+            field=models.CharField(
+                choices=[
+                    ("pending", "Pending"),
+                    ("created", "Created"),
+                    ("invalid", "Invalid"),
+                    ("not_found", "Not found"),
+                    ("failed", "Failed"),
+                ],
+                default="pending",
+                max_length=16,
+            ),
+        ),
+    ]
@@ -2,65 +2,247 @@ from django.db import models
 from student.models import Student
 from exam.models import Exam
 from question.models import Question, Alternative
-from django.db.models import Sum, Case, When, IntegerField, Count, Prefetch
+from .utils import QueuedSubmissionStatus
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    FloatField,
+    IntegerField,
+    OuterRef,
+    Prefetch,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.lookups import GreaterThan
 
 
 class ExamSubmissionQuerySet(models.QuerySet):
-    def with_total_correct(self):
-        return self.annotate(
-            total_correct=Sum(
-                Case(
-                    When(
-                        answers__selected_alternative__is_correct=True,
-                        then=1,
-                    ),
-                    default=0,
-                    output_field=IntegerField(),
-                )
-            )
+    def with_answers(self):
+        answers_prefetch = Prefetch(
+            "answers",
+            queryset=Answer.objects.select_related("selected_alternative", "question")
+            .defer("question__search_vector")
+            .order_by("pk"),
         )
+        return self.select_related("student", "exam").prefetch_related(answers_prefetch)
 
-    def with_total_questions(self):
-        return self.annotate(total_questions=Count("answers"))
+    def with_computed_scores(self):
+        """
+        Annotate the scores computed from the answers themselves.
 
-    def annotate_performance_metrics(self):
-        answers_prefetch = Prefetch(
-            "answers",
-            queryset=Answer.objects.select_related("selected_alternative", "question"),
+        Each count runs in its own correlated subquery, so the two aggregates
+        never join the answers relation twice and inflate each other.
+        """
+        total_correct, total_questions = _computed_score_expressions()
+        return self.annotate(
+            computed_total_correct=total_correct,
+            computed_total_questions=total_questions,
+        )
+
+    def with_outdated_scores(self):
+        return self.with_computed_scores().filter(
+            ~Q(total_correct=F("computed_total_correct"))
+            | ~Q(total_questions=F("computed_total_questions"))
         )
-        return (
-            self.with_total_correct()
-            .with_total_questions()
-            .select_related("student", "exam")
-            .prefetch_related(answers_prefetch)
+
+    def refresh_scores(self):
+        """Recompute and store the scores of every submission in one UPDATE."""
+        total_correct, total_questions = _computed_score_expressions()
+        return self.update(
+            total_correct=total_correct,
+            total_questions=total_questions,
+            percentage_score=Case(
+                When(
+                    GreaterThan(total_questions, 0),
+                    then=Cast(total_correct, FloatField())
+                    / Cast(total_questions, FloatField())
+                    * Value(100.0),
+                ),
+                default=Value(0.0),
+                output_field=FloatField(),
+            ),
         )
 
 
+def _computed_score_expressions():
+    answers = Answer.objects.filter(submission=OuterRef("pk")).order_by()
+    counts = answers.values("submission").annotate(count=Count("pk")).values("count")
+    correct_counts = (
+        answers.filter(selected_alternative__is_correct=True)
+        .values("submission")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return (
+        Coalesce(Subquery(correct_counts, output_field=IntegerField()), 0),
+        Coalesce(Subquery(counts, output_field=IntegerField()), 0),
+    )
+
+
 class ExamSubmission(models.Model):
     student = models.ForeignKey(
         Student, on_delete=models.CASCADE, related_name="submissions"
     )
     exam = models.ForeignKey(Exam, on_delete=models.CASCADE, related_name="submissions")
     submission_time = models.DateTimeField(auto_now_add=True)
+    total_correct = models.PositiveIntegerField(default=0)
+    total_questions = models.PositiveIntegerField(default=0)
+    percentage_score = models.FloatField(default=0)
+    result_document = models.BinaryField(null=True, editable=False)
 
     objects = ExamSubmissionQuerySet.as_manager()
 
     class Meta:
         unique_together = ("student", "exam")
+        indexes = [
+            models.Index(
+                fields=["exam", "-total_correct", "submission_time"],
+                name="submission_exam_ranking_idx",
+            ),
+            # Keyset pagination of a student's history, newest first; the
+            # scores are included so pages don't visit the table.
+            models.Index(
+                fields=["student", "-submission_time", "-id"],
+                include=[
+                    "exam",
+                    "total_correct",
+                    "total_questions",
+                    "percentage_score",
+                ],
+                name="submission_student_history_idx",
+            ),
+            # Item analysis reads the submissions made in a window of time.
+            models.Index(
+                fields=["exam", "submission_time"],
+                include=["total_correct"],
+                name="submission_exam_time_idx",
+            ),
+        ]
+
+    def set_score(self, total_correct, total_questions):
+        self.total_correct = total_correct
+        self.total_questions = total_questions
+        self.percentage_score = (
+            (total_correct / total_questions) * 100 if total_questions > 0 else 0
+        )
 
     def __str__(self):
         return f"Submission of {self.student} for {self.exam}"
 
 
 class Answer(models.Model):
+    # Indexed by the (submission, question) constraint, which also covers the
+    # selected alternative so scoring and item analysis read only the index.
     submission = models.ForeignKey(
-        ExamSubmission, on_delete=models.CASCADE, related_name="answers"
+        ExamSubmission, on_delete=models.CASCADE, related_name="answers", db_index=False
     )
     question = models.ForeignKey(Question, on_delete=models.CASCADE)
     selected_alternative = models.ForeignKey(Alternative, on_delete=models.CASCADE)
 
     class Meta:
-        unique_together = ("submission", "question")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["submission", "question"],
+                include=["selected_alternative"],
+                name="answer_submission_question_uniq",
+            ),
+        ]
 
     def __str__(self):
         return f"Answer to {self.question} in {self.submission}"
+
+
+class DraftSubmission(models.Model):
+    """
+    Answers a student saved so far while taking an exam, one delta at a time.
+    They only become an `ExamSubmission` once the draft is finalized, so
+    results, leaderboards and reports never see unfinished answers.
+    """
+
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="draft_submissions"
+    )
+    exam = models.ForeignKey(
+        Exam, on_delete=models.CASCADE, related_name="draft_submissions"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ("student", "exam")
+
+    def __str__(self):
+        return f"Draft of {self.student} for {self.exam}"
+
+
+class DraftAnswer(models.Model):
+    draft = models.ForeignKey(
+        DraftSubmission, on_delete=models.CASCADE, related_name="answers"
+    )
+    question = models.ForeignKey(Question, on_delete=models.CASCADE)
+    selected_alternative = models.ForeignKey(Alternative, on_delete=models.CASCADE)
+
+    class Meta:
+        unique_together = ("draft", "question")
+
+    def __str__(self):
+        return f"Draft answer to {self.question} in {self.draft}"
+
+
+class ExamScoreHistogram(models.Model):
+    """Number of submissions to an exam that reached each score."""
+
+    exam = models.ForeignKey(
+        Exam, on_delete=models.CASCADE, related_name="score_histogram"
+    )
+    score = models.PositiveIntegerField()
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ("exam", "score")
+
+    def __str__(self):
+        return f"{self.count} submissions scored {self.score} in {self.exam}"
+
+
+class QueuedSubmission(models.Model):
+    """
+    Submission accepted while SUBMISSION_QUEUE_ENABLED is on, kept as sent
+    until the "process_submission_queue" command validates, stores and scores
+    it. The outcome stays on the row for the status endpoint.
+    """
+
+    student_id = models.BigIntegerField()
+    exam_id = models.BigIntegerField()
+    payload = models.JSONField()
+    status = models.CharField(
+        max_length=16,
+        choices=QueuedSubmissionStatus,
+        default=QueuedSubmissionStatus.PENDING,
+    )
+    errors = models.JSONField(null=True, blank=True)
+    submission = models.ForeignKey(
+        ExamSubmission,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name="+",
+    )
+    received_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["id"],
+                condition=Q(status=QueuedSubmissionStatus.PENDING),
+                name="submission_queue_pending_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Queued submission of student {self.student_id} for exam {self.exam_id}"
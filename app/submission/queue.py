@@ -0,0 +1,96 @@
+import logging
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from exam.answer_key import get_answer_key
+from exam.models import Exam
+from submission.ingest import ingest_submissions
+from submission.models import QueuedSubmission
+from submission.utils import QueuedSubmissionStatus
+
+logger = logging.getLogger(__name__)
+
+
+def process_queued_submissions(batch_size):
+    """
+    Validate, store and score the oldest pending queued submissions, and
+    return how many were processed.
+
+    The batch is locked with SKIP LOCKED, so several workers can drain the
+    queue at the same time without picking the same rows. Submissions to the
+    same exam go through `ingest_submissions` together, and the outcome of
+    each one is written back to its row in the same transaction.
+
+    Each exam's group runs in a savepoint. When it raises, its submissions
+    are ingested again one by one, each in its own savepoint, and the ones
+    that still raise are marked as failed with the error, so one bad row
+    can't roll back the batch and block the queue.
+    """
+    with transaction.atomic():
+        queued = list(
+            QueuedSubmission.objects.filter(status=QueuedSubmissionStatus.PENDING)
+            .select_for_update(skip_locked=True)
+            .order_by("pk")[:batch_size]
+        )
+        if not queued:
+            return 0
+
+        by_exam = defaultdict(list)
+        for queued_submission in queued:
+            by_exam[queued_submission.exam_id].append(queued_submission)
+        existing_exam_ids = set(
+            Exam.objects.filter(pk__in=by_exam).values_list("pk", flat=True)
+        )
+
+        processed_at = timezone.now()
+        for exam_id, queued_submissions in by_exam.items():
+            if exam_id in existing_exam_ids:
+                try:
+                    results = _ingest(exam_id, queued_submissions)
+                except Exception:
+                    results = [
+                        _ingest_one(exam_id, item) for item in queued_submissions
+                    ]
+            else:
+                results = [
+                    {
+                        "status": QueuedSubmissionStatus.NOT_FOUND,
+                        "errors": {"detail": "No Exam matches the given query."},
+                    }
+                ] * len(queued_submissions)
+
+            for item, result in zip(queued_submissions, results):
+                item.status = result["status"]
+                item.errors = result.get("errors")
+                item.submission_id = result.get("submission")
+                item.processed_at = processed_at
+
+        QueuedSubmission.objects.bulk_update(
+            queued, ["status", "errors", "submission", "processed_at"]
+        )
+    return len(queued)
+
+
+def _ingest(exam_id, queued_submissions):
+    with transaction.atomic():
+        return ingest_submissions(
+            get_answer_key(exam_id),
+            [
+                {"student": item.student_id, "answers": item.payload}
+                for item in queued_submissions
+            ],
+        )
+
+
+def _ingest_one(exam_id, queued_submission):
+    try:
+        (result,) = _ingest(exam_id, [queued_submission])
+    except Exception as exc:
+        logger.exception("Queued submission %s failed.", queued_submission.pk)
+        return {
+            "status": QueuedSubmissionStatus.FAILED,
+            "errors": {"detail": f"{type(exc).__name__}: {exc}"},
+        }
+    return result
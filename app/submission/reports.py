@@ -0,0 +1,80 @@
+import csv
+import io
+import json
+
+from submission.models import ExamSubmission
+
+RESULT_FIELDS = [
+    "student_id",
+    "student",
+    "submission_time",
+    "total_correct",
+    "total_questions",
+    "percentage_score",
+]
+
+REPORT_CONTENT_TYPES = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+
+def exam_result_rows(exam_id, chunk_size=2000):
+    """
+    Yield the score of every submission to an exam, read with a single query.
+
+    Rows come from a server-side cursor, so memory use doesn't depend on the
+    number of submissions.
+    """
+    return (
+        ExamSubmission.objects.filter(exam_id=exam_id)
+        .order_by("pk")
+        .values_list(
+            "student_id",
+            "student__email",
+            "submission_time",
+            "total_correct",
+            "total_questions",
+            "percentage_score",
+        )
+        .iterator(chunk_size=chunk_size)
+    )
+
+
+def _formatted_chunks(rows, size):
+    chunk = []
+    for student_id, student, submission_time, *scores in rows:
+        chunk.append((student_id, student, submission_time.isoformat(), *scores))
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(rows, chunk_size=500):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(RESULT_FIELDS)
+    yield buffer.getvalue()
+
+    for chunk in _formatted_chunks(rows, chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+
+
+def stream_ndjson(rows, chunk_size=500):
+    for chunk in _formatted_chunks(rows, chunk_size):
+        yield "".join(json.dumps(dict(zip(RESULT_FIELDS, row))) + "\n" for row in chunk)
+
+
+REPORT_STREAMS = {
+    "csv": stream_csv,
+    "ndjson": stream_ndjson,
+}
+
+
+def stream_exam_results(exam_id, output_format):
+    return REPORT_STREAMS[output_format](exam_result_rows(exam_id))
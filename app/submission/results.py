@@ -0,0 +1,227 @@
+import hashlib
+import json
+from collections import namedtuple
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+
+from submission.leaderboard import aget_percentile, get_percentile
+from submission.models import Answer, ExamSubmission
+from submission.serializers import ExamResultSerializer
+from utils.metrics import timed
+
+CACHE_KEY_PREFIX = "submission:result"
+
+ResultDocument = namedtuple("ResultDocument", ["content", "etag"])
+
+# A result as stored and cached, without its percentile: the rendered bytes,
+# their digest, and the exam and score the percentile is computed from.
+ResultBody = namedtuple("ResultBody", ["content", "digest", "exam_id", "total_correct"])
+
+
+def result_cache():
+    return caches[settings.SUBMISSION_RESULT_CACHE_ALIAS]
+
+
+def result_cache_key(student_id, exam_id):
+    return f"{CACHE_KEY_PREFIX}:{student_id}:{exam_id}"
+
+
+# Formats submission times exactly like the serializer's field.
+SUBMISSION_TIME_FIELD = serializers.DateTimeField()
+
+
+def render_result(submission):
+    data = ExamResultSerializer(instance=submission).data
+    with timed("render"):
+        return JSONRenderer().render(data)
+
+
+def result_rows(submission_id):
+    """
+    Read what a result shows with two `.values()` queries: the submission
+    and its answers, with the text of their question and alternative.
+    """
+    submission = (
+        ExamSubmission.objects.filter(pk=submission_id)
+        .values(
+            "student__email",
+            "exam__name",
+            "exam_id",
+            "submission_time",
+            "total_correct",
+            "percentage_score",
+        )
+        .get()
+    )
+    answers = (
+        Answer.objects.filter(submission_id=submission_id)
+        .order_by("pk")
+        .values_list(
+            "question__content",
+            "selected_alternative__content",
+            "selected_alternative__is_correct",
+        )
+    )
+    return submission, list(answers)
+
+
+def result_data(submission, answers):
+    """
+    Build the result payload of `result_rows` as plain dicts, the same as
+    `ExamResultSerializer` gives for the submission but without its
+    per-field work for every answer, and without the percentile (see
+    `with_percentile`). The related objects are shown as their __str__ (the
+    student's email, the exam's name and the contents).
+    """
+    with timed("serializer"):
+        return {
+            "student": submission["student__email"],
+            "exam": submission["exam__name"],
+            "submission_time": SUBMISSION_TIME_FIELD.to_representation(
+                submission["submission_time"]
+            ),
+            "answers": [
+                {
+                    "question": question,
+                    "selected_alternative": selected_alternative,
+                    "is_correct": is_correct,
+                }
+                for question, selected_alternative, is_correct in answers
+            ],
+            "total_correct": submission["total_correct"],
+            "percentage_score": submission["percentage_score"],
+        }
+
+
+def with_percentile(content, percentile):
+    """
+    Add the percentile to a rendered result as its last member, giving the
+    same bytes as rendering the result with it.
+    """
+    return b'%s,"percentile":%s}' % (content[:-1], json.dumps(percentile).encode())
+
+
+def render_result_body(submission, answers):
+    """Render `result_data`, i.e. a result without its percentile."""
+    data = result_data(submission, answers)
+    with timed("render"):
+        return JSONRenderer().render(data)
+
+
+def render_result_data(submission_id):
+    """Render a result like `render_result`, from `result_rows`."""
+    submission, answers = result_rows(submission_id)
+    return with_percentile(
+        render_result_body(submission, answers),
+        get_percentile(submission["exam_id"], submission["total_correct"]),
+    )
+
+
+def get_result_document(student_id, exam_id):
+    """
+    Return the rendered result of a submission, or None when it does not exist.
+
+    Submissions never change once made, so the result is rendered a single
+    time without its percentile, stored on the submission row and cached.
+    Only the percentile moves, whenever another student submits the same
+    exam, so it is read from the exam's score histogram on every request and
+    added to the cached bytes: reads served from the cache run that single
+    query.
+    """
+    cache = result_cache()
+    cache_key = result_cache_key(student_id, exam_id)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        body = ResultBody(*cached)
+    else:
+        submission = _stored_result(student_id, exam_id).first()
+        if submission is None:
+            return None
+        content = submission.result_document
+        if content is None:
+            content = _render_and_store(submission)
+        body = _result_body(bytes(content), submission)
+        cache.set(cache_key, tuple(body), settings.SUBMISSION_RESULT_CACHE_TIMEOUT)
+
+    return _result_document(body, get_percentile(body.exam_id, body.total_correct))
+
+
+async def aget_result_document(student_id, exam_id):
+    """Async version of `get_result_document`."""
+    cache = result_cache()
+    cache_key = result_cache_key(student_id, exam_id)
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        body = ResultBody(*cached)
+    else:
+        submission = await _stored_result(student_id, exam_id).afirst()
+        if submission is None:
+            return None
+        content = submission.result_document
+        if content is None:
+            # Only happens once per submission.
+            content = await sync_to_async(_render_and_store)(submission)
+        body = _result_body(bytes(content), submission)
+        await cache.aset(
+            cache_key, tuple(body), settings.SUBMISSION_RESULT_CACHE_TIMEOUT
+        )
+
+    percentile = await aget_percentile(body.exam_id, body.total_correct)
+    return _result_document(body, percentile)
+
+
+def _stored_result(student_id, exam_id):
+    return ExamSubmission.objects.filter(student_id=student_id, exam_id=exam_id).only(
+        "id", "exam_id", "total_correct", "result_document"
+    )
+
+
+def _render_and_store(submission):
+    content = render_result_body(*result_rows(submission.pk))
+    ExamSubmission.objects.filter(pk=submission.pk).update(result_document=content)
+    return content
+
+
+def _result_body(content, submission):
+    return ResultBody(
+        content=content,
+        digest=hashlib.blake2b(content, digest_size=16).digest(),
+        exam_id=submission.exam_id,
+        total_correct=submission.total_correct,
+    )
+
+
+def _result_document(body, percentile):
+    etag = hashlib.blake2b(body.digest, digest_size=16)
+    etag.update(json.dumps(percentile).encode())
+    return ResultDocument(
+        content=with_percentile(body.content, percentile),
+        etag=f'"{etag.hexdigest()}"',
+    )
+
+
+def invalidate_result_documents(queryset):
+    """Drop the stored and cached results of the given submissions."""
+    keys = [
+        result_cache_key(student_id, exam_id)
+        for student_id, exam_id in queryset.values_list("student_id", "exam_id")
+    ]
+    queryset.update(result_document=None)
+    _discard_cached_results(keys)
+
+
+def discard_cached_result(student_id, exam_id):
+    """Drop the cached result of a submission, e.g. once it is deleted."""
+    _discard_cached_results([result_cache_key(student_id, exam_id)])
+
+
+def _discard_cached_results(keys):
+    # Now and again once the transaction commits, so a concurrent reader
+    # cannot re-cache the uncommitted state.
+    result_cache().delete_many(keys)
+    transaction.on_commit(lambda: result_cache().delete_many(keys))
@@ -1,23 +1,210 @@
 from rest_framework import serializers
-from .models import ExamSubmission, Answer
+from .models import ExamSubmission, Answer, QueuedSubmission
+from . import leaderboard
 from student.models import Student
 from exam.models import Exam
+from exam.answer_key import get_answer_key
 from question.models import Alternative, Question
-from django.shortcuts import get_object_or_404
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.http import Http404
+from django.urls import reverse
+from django.utils.functional import cached_property
+from utils.metrics import TimedSerializerMixin
+
+
+class PreloadedPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    Primary key field that resolves its value from the objects preloaded by
+    `AnswerListSerializer`, falling back to one query per value when used
+    outside of it.
+    """
+
+    def to_internal_value(self, data):
+        preloaded = getattr(self.parent.parent, "preloaded", None)
+        if preloaded is None:
+            return super().to_internal_value(data)
+
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            pk = self.get_queryset().model._meta.pk.get_prep_value(data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+        instance = preloaded[self.field_name].get(pk)
+        if instance is None:
+            self.fail("does_not_exist", pk_value=data)
+        return instance
+
+
+class AnswerListSerializer(TimedSerializerMixin, serializers.ListSerializer):
+    """
+    Resolves every related primary key of the payload at once, so validating
+    a submission costs the same for any exam size.
+
+    Keys found in the parent's exam answer key are resolved without touching
+    the database; the remaining ones are loaded with one query per field.
+    Objects already loaded by `apreload_answers` can be passed in the
+    `preloaded_answers` context instead.
+    """
+
+    def to_internal_value(self, data):
+        self.preloaded = None
+        if isinstance(data, list):
+            preloaded = self.context.get("preloaded_answers")
+            self.preloaded = preloaded or self.__preload(data)
+        return super().to_internal_value(data)
+
+    def __preload(self, data):
+        answer_key = getattr(self.parent, "answer_key", None)
+        preloaded, missing = _preload_from_answer_key(
+            self.child.fields, data, answer_key
+        )
+        for field_name, pks in missing.items():
+            if pks:
+                field = self.child.fields[field_name]
+                preloaded[field_name].update(field.get_queryset().in_bulk(pks))
+        return preloaded
+
+
+def _preload_from_answer_key(fields, data, answer_key):
+    """
+    Return the related objects of the answers in `data` that the answer key
+    already knows about, and the primary keys that must be loaded.
+    """
+    preloaded = {}
+    missing = {}
+    for field_name in ("question", "selected_alternative"):
+        pk_field = fields[field_name].get_queryset().model._meta.pk
+        pks = set()
+        for item in data:
+            if not isinstance(item, dict) or isinstance(item.get(field_name), bool):
+                continue
+            try:
+                pks.add(pk_field.get_prep_value(item.get(field_name)))
+            except (TypeError, ValueError):
+                continue
+        pks.discard(None)
+
+        preloaded[field_name] = {}
+        if answer_key is not None:
+            for pk in pks:
+                instance = _from_answer_key(answer_key, field_name, pk)
+                if instance is not None:
+                    preloaded[field_name][pk] = instance
+            pks.difference_update(preloaded[field_name])
+        missing[field_name] = pks
+    return preloaded, missing
+
+
+def _from_answer_key(answer_key, field_name, pk):
+    if field_name == "question":
+        if pk in answer_key.alternatives:
+            return Question(pk=pk)
+    elif pk in answer_key.alternative_questions:
+        return Alternative(pk=pk, question_id=answer_key.alternative_questions[pk])
+    return None
 
 
 class AnswerSerializer(serializers.ModelSerializer):
-    question = serializers.PrimaryKeyRelatedField(queryset=Question.objects.all())
-    selected_alternative = serializers.PrimaryKeyRelatedField(
-        queryset=Alternative.objects.all()
+    question = PreloadedPrimaryKeyRelatedField(queryset=Question.objects.only("id"))
+    selected_alternative = PreloadedPrimaryKeyRelatedField(
+        queryset=Alternative.objects.only("id", "question_id")
     )
 
     class Meta:
         model = Answer
         fields = ["question", "selected_alternative"]
+        list_serializer_class = AnswerListSerializer
+
+
+async def apreload_answers(data, answer_key):
+    """
+    Resolve the related objects of a list of answers with the async ORM, to be
+    passed to the serializer as the `preloaded_answers` context.
+    """
+    fields = AnswerSerializer().fields
+    preloaded, missing = _preload_from_answer_key(fields, data, answer_key)
+    for field_name, pks in missing.items():
+        if pks:
+            queryset = fields[field_name].get_queryset().filter(pk__in=pks)
+            preloaded[field_name].update({obj.pk: obj async for obj in queryset})
+    return preloaded
+
+
+def validate_exam_answers(answers, answer_key):
+    """Check the answers of one submission against the exam's answer key."""
+    num_questions = len(answer_key.question_ids)
+    if len(answers) != num_questions:
+        raise serializers.ValidationError(
+            f"The number of answers does not match the number of questions in the exam: {num_questions}."
+        )
+
+    validate_answer_choices(answers, answer_key)
 
 
-class ExamSubmissionSerializer(serializers.ModelSerializer):
+def validate_answer_choices(answers, answer_key):
+    """
+    Check that every answer is to a different question of the exam and picks
+    one of that question's alternatives.
+    """
+    exam_question_ids = set(answer_key.question_ids)
+    submitted_question_ids = set()
+
+    for answer in answers:
+        question = answer["question"]
+
+        if question.id not in exam_question_ids:
+            raise serializers.ValidationError(
+                f"The question {answer['question'].id} does not belong to exam {answer_key.exam_id}."
+            )
+
+        if question.id in submitted_question_ids:
+            raise serializers.ValidationError(
+                f"The answer for question {question.id} is duplicated."
+            )
+        submitted_question_ids.add(question.id)
+
+        if answer["selected_alternative"].question_id != question.id:
+            raise serializers.ValidationError(
+                f"The alternative {answer['selected_alternative'].id} does not belong to question {question.id}."
+            )
+
+
+def build_submission(student_id, answers, answer_key):
+    """Build an unsaved submission of validated answers, already scored."""
+    submission = ExamSubmission(student_id=student_id, exam_id=answer_key.exam_id)
+    submission.set_score(
+        answer_key.score(answer["selected_alternative"].pk for answer in answers),
+        len(answers),
+    )
+    return submission
+
+
+def save_submissions(submissions_with_answers):
+    """
+    Store submissions and their answers with one INSERT per table, and add
+    their scores to the exams' leaderboards, inside a single transaction.
+    """
+    with transaction.atomic():
+        submissions = ExamSubmission.objects.bulk_create(
+            submission for submission, _ in submissions_with_answers
+        )
+        Answer.objects.bulk_create(
+            (
+                Answer(submission=submission, **answer)
+                for submission, answers in submissions_with_answers
+                for answer in answers
+            ),
+            batch_size=settings.SUBMISSION_ANSWERS_BATCH_SIZE,
+        )
+        leaderboard.record_scores(submissions)
+    return submissions
+
+
+class ExamSubmissionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     answers = AnswerSerializer(many=True)
 
     class Meta:
@@ -25,65 +212,204 @@ class ExamSubmissionSerializer(serializers.ModelSerializer):
         fields = ["answers"]
         read_only_fields = ["submission_time"]
 
+    @cached_property
+    def answer_key(self):
+        return get_answer_key(self.context["view"].kwargs.get("exam_id"))
+
+    @cached_property
+    def submission_state(self):
+        kwargs = self.context["view"].kwargs
+        return get_submission_state(kwargs.get("student_id"), kwargs.get("exam_id"))
+
     def validate(self, data):
+        check_submission_state(*self.submission_state)
+
+        answers = data.get("answers", [])
+
+        validate_exam_answers(answers, self.answer_key)
+
+        return data
+
+    def create(self, validated_data):
+        answers_data = validated_data.pop("answers")
         kwargs = self.context["view"].kwargs
         student_id = kwargs.get("student_id")
-        exam_id = kwargs.get("exam_id")
+        submission = build_submission(student_id, answers_data, self.answer_key)
+        save_submissions([(submission, answers_data)])
+        return submission
 
-        student = get_object_or_404(Student, id=student_id)
-        exam = get_object_or_404(Exam, id=exam_id)
 
-        if ExamSubmission.objects.filter(student=student, exam=exam).exists():
-            raise serializers.ValidationError(
-                "This student has already submitted this exam."
-            )
+def _submission_state_query(student_id, exam_id):
+    """
+    Return whether the exam exists and whether the student already submitted
+    it, in a single row that only exists when the student does. Nothing else
+    of the student (a full user row) is loaded.
+    """
+    return (
+        Student.objects.filter(id=student_id)
+        .annotate(
+            exam_exists=Exists(Exam.objects.filter(id=exam_id)),
+            already_submitted=Exists(
+                ExamSubmission.objects.filter(
+                    student_id=OuterRef("pk"), exam_id=exam_id
+                )
+            ),
+        )
+        .values_list("exam_exists", "already_submitted")
+    )
 
-        answers = data.get("answers", [])
 
-        self.__validate_answers(answers, exam)
+def get_submission_state(student_id, exam_id):
+    """
+    Return whether the student and the exam exist and whether the student
+    already submitted the exam, with one query.
+    """
+    row = _submission_state_query(student_id, exam_id).first()
+    return (False, False, False) if row is None else (True, *row)
+
+
+async def aget_submission_state(student_id, exam_id):
+    """Async version of `get_submission_state`."""
+    row = await _submission_state_query(student_id, exam_id).afirst()
+    return (False, False, False) if row is None else (True, *row)
+
+
+def check_submission_state(student_exists, exam_exists, already_submitted):
+    if not student_exists:
+        raise Http404("No Student matches the given query.")
+    if not exam_exists:
+        raise Http404("No Exam matches the given query.")
+    if already_submitted:
+        raise serializers.ValidationError(
+            "This student has already submitted this exam."
+        )
+
+
+class PrecheckedExamSubmissionSerializer(ExamSubmissionSerializer):
+    """
+    `ExamSubmissionSerializer` for async views, which make its lookups
+    beforehand and pass them in the context: the `answer_key`, the
+    `preloaded_answers` and the `submission_state` from
+    `aget_submission_state`. Validation then never touches the database.
+    """
+
+    @cached_property
+    def answer_key(self):
+        return self.context["answer_key"]
+
+    @cached_property
+    def submission_state(self):
+        return self.context["submission_state"]
+
+
+class DraftAnswersSerializer(TimedSerializerMixin, serializers.Serializer):
+    """
+    Validates a delta of answers to save into a draft: each answer must fit
+    the exam, but the draft doesn't need to be complete.
+    """
+
+    answers = AnswerSerializer(many=True, allow_empty=False)
+
+    @cached_property
+    def answer_key(self):
+        return get_answer_key(self.context["view"].kwargs.get("exam_id"))
+
+    def validate(self, data):
+        kwargs = self.context["view"].kwargs
+        check_submission_state(
+            *get_submission_state(kwargs["student_id"], kwargs["exam_id"])
+        )
+
+        validate_answer_choices(data["answers"], self.answer_key)
 
         return data
 
-    def __validate_answers(self, answers, exam):
-        num_questions = exam.questions.count()
-        if len(answers) != num_questions:
-            raise serializers.ValidationError(
-                f"The number of answers does not match the number of questions in the exam: {num_questions}."
-            )
 
-        exam_question_ids = set(exam.questions.values_list("id", flat=True))
-        submitted_question_ids = set()
+class BatchSubmissionEntrySerializer(TimedSerializerMixin, serializers.Serializer):
+    student = serializers.IntegerField()
+    answers = AnswerSerializer(many=True)
 
-        for answer in answers:
-            question = answer["question"]
+    @property
+    def answer_key(self):
+        return self.context["answer_key"]
 
-            if question.id not in exam_question_ids:
-                raise serializers.ValidationError(
-                    f"The question {answer['question'].id} does not belong to exam {exam.id}."
-                )
 
-            if question.id in submitted_question_ids:
-                raise serializers.ValidationError(
-                    f"The answer for question {question.id} is duplicated."
-                )
-            submitted_question_ids.add(question.id)
+class ExamSubmissionBatchSerializer(TimedSerializerMixin, serializers.Serializer):
+    submissions = serializers.ListField(
+        allow_empty=False, max_length=settings.SUBMISSION_BATCH_MAX_SIZE
+    )
 
-            if answer["selected_alternative"].question.id != question.id:
-                raise serializers.ValidationError(
-                    f"The alternative {answer['selected_alternative'].id} does not belong to question {question.id}."
-                )
+
+class QueuedAnswerSerializer(serializers.Serializer):
+    question = serializers.IntegerField()
+    selected_alternative = serializers.IntegerField()
+
+
+class QueuedSubmissionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    """
+    Accepts a submission into the queue after structural checks only, and
+    shows its processing status. The answers are checked against the exam by
+    the queue worker.
+    """
+
+    answers = QueuedAnswerSerializer(many=True, write_only=True)
+    student = serializers.IntegerField(source="student_id", read_only=True)
+    exam = serializers.IntegerField(source="exam_id", read_only=True)
+    status_url = serializers.SerializerMethodField()
+    result_url = serializers.SerializerMethodField()
+
+    class Meta:
+        model = QueuedSubmission
+        fields = [
+            "id",
+            "student",
+            "exam",
+            "status",
+            "errors",
+            "submission",
+            "received_at",
+            "processed_at",
+            "status_url",
+            "result_url",
+            "answers",
+        ]
+        read_only_fields = [
+            "status",
+            "errors",
+            "submission",
+            "received_at",
+            "processed_at",
+        ]
 
     def create(self, validated_data):
-        answers_data = validated_data.pop("answers")
-        kwargs = self.context["view"].kwargs
-        student_id = kwargs.get("student_id")
-        exam_id = kwargs.get("exam_id")
-        submission = ExamSubmission.objects.create(
-            student_id=student_id, exam_id=exam_id
+        answers = validated_data.pop("answers")
+        return QueuedSubmission.objects.create(payload=answers, **validated_data)
+
+    def get_status_url(self, obj):
+        return reverse("queued-submission", kwargs={"pk": obj.pk})
+
+    def get_result_url(self, obj):
+        if obj.submission_id is None:
+            return None
+        return reverse(
+            "exam-result", kwargs={"student_id": obj.student_id, "exam_id": obj.exam_id}
         )
-        for answer_data in answers_data:
-            Answer.objects.create(submission=submission, **answer_data)
-        return submission
+
+
+class SubmissionHistorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
+    exam_name = serializers.CharField(source="exam.name")
+
+    class Meta:
+        model = ExamSubmission
+        fields = [
+            "id",
+            "exam",
+            "exam_name",
+            "submission_time",
+            "total_correct",
+            "total_questions",
+            "percentage_score",
+        ]
 
 
 class AnswerResultSerializer(serializers.ModelSerializer):
@@ -99,12 +425,11 @@ class AnswerResultSerializer(serializers.ModelSerializer):
         return obj.selected_alternative.is_correct
 
 
-class ExamResultSerializer(serializers.ModelSerializer):
+class ExamResultSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     student = serializers.StringRelatedField()
     exam = serializers.StringRelatedField()
     answers = AnswerResultSerializer(many=True)
-    total_correct = serializers.IntegerField()
-    percentage_score = serializers.SerializerMethodField()
+    percentile = serializers.SerializerMethodField()
 
     class Meta:
         model = ExamSubmission
@@ -115,11 +440,8 @@ class ExamResultSerializer(serializers.ModelSerializer):
             "answers",
             "total_correct",
             "percentage_score",
+            "percentile",
         ]
 
-    def get_percentage_score(self, obj):
-        total_questions = obj.total_questions or 0
-        total_correct = obj.total_correct or 0
-        if total_questions > 0:
-            return (total_correct / total_questions) * 100
-        return 0
+    def get_percentile(self, obj):
+        return leaderboard.get_percentile(obj.exam_id, obj.total_correct)
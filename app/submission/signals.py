@@ -0,0 +1,22 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from submission.analytics import reset_item_statistics
+from submission.leaderboard import discard_score
+from submission.models import ExamSubmission
+from submission.results import discard_cached_result
+
+
+@receiver(post_delete, sender=ExamSubmission)
+def discard_submission_score(sender, instance, **kwargs):
+    discard_score(instance.exam_id, instance.total_correct)
+
+
+@receiver(post_delete, sender=ExamSubmission)
+def reset_submission_item_statistics(sender, instance, **kwargs):
+    reset_item_statistics(instance.exam_id)
+
+
+@receiver(post_delete, sender=ExamSubmission)
+def discard_submission_result(sender, instance, **kwargs):
+    discard_cached_result(instance.student_id, instance.exam_id)
@@ -0,0 +1,217 @@
+import json
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.test import RequestFactory, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from student.models import Student
+from submission.models import ExamSubmission, QueuedSubmission
+from submission.views import AsyncExamResultView, AsyncExamSubmissionCreateView
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def student(db):
+    return Student.objects.create_user(
+        username="teststudent", email="student@example.com", password="testpass"
+    )
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2, 3):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == number),
+            )
+    cache.clear()
+    return exam
+
+
+def _answers(exam, option=1):
+    return [
+        {
+            "question": exam_question.question_id,
+            "selected_alternative": Alternative.objects.get(
+                question_id=exam_question.question_id, option=option
+            ).id,
+        }
+        for exam_question in ExamQuestion.objects.filter(exam=exam).order_by("number")
+    ]
+
+
+def _async_post(student_id, exam_id, body, content_type="application/json"):
+    request = RequestFactory().post("/", body, content_type=content_type)
+    return async_to_sync(AsyncExamSubmissionCreateView.as_view())(
+        request, student_id=student_id, exam_id=exam_id
+    )
+
+
+def _async_get(student_id, exam_id, **headers):
+    request = RequestFactory().get("/", **headers)
+    return async_to_sync(AsyncExamResultView.as_view())(
+        request, student_id=student_id, exam_id=exam_id
+    )
+
+
+def _sync_post(api_client, student_id, exam_id, body):
+    url = reverse(
+        "create-submission", kwargs={"student_id": student_id, "exam_id": exam_id}
+    )
+    return api_client.post(url, body, content_type="application/json")
+
+
+def _assert_same_response(api_client, student_id, exam_id, body):
+    sync_response = _sync_post(api_client, student_id, exam_id, body)
+    async_response = _async_post(student_id, exam_id, body)
+    assert async_response.status_code == sync_response.status_code
+    assert json.loads(async_response.content) == sync_response.json()
+    return async_response
+
+
+def test_async_create_submission(student, exam):
+    answers = _answers(exam)
+    response = _async_post(student.id, exam.id, json.dumps({"answers": answers}))
+
+    assert response.status_code == 201
+    assert json.loads(response.content) == {"answers": answers}
+    submission = ExamSubmission.objects.get(student=student, exam=exam)
+    assert (submission.total_correct, submission.total_questions) == (1, 2)
+    assert submission.answers.count() == 2
+
+
+@override_settings(SUBMISSION_QUEUE_ENABLED=True)
+def test_async_create_submission_queues_like_sync_view(api_client, student, exam):
+    other = Student.objects.create(username="other", email="other@example.com")
+    body = json.dumps({"answers": _answers(exam)})
+    sync_response = _sync_post(api_client, other.id, exam.id, body)
+    response = _async_post(student.id, exam.id, body)
+
+    assert response.status_code == sync_response.status_code == 202
+    data = json.loads(response.content)
+    queued = QueuedSubmission.objects.get(student_id=student.id, exam_id=exam.id)
+    assert data["id"] == queued.id
+    assert data.keys() == sync_response.json().keys()
+    assert response["Location"] == data["status_url"]
+    assert not ExamSubmission.objects.exists()
+
+    response = _async_post(student.id, exam.id, json.dumps({"answers": [{}]}))
+    assert response.status_code == 400
+    assert "answers" in json.loads(response.content)
+
+
+def _invalid_payloads(exam):
+    answers = _answers(exam)
+    other_question = Question.objects.create(content="Not in the exam")
+    other_alternative = Alternative.objects.create(
+        question=other_question, content="Option 1", option=1, is_correct=True
+    )
+    return [
+        "{",
+        "[]",
+        json.dumps({}),
+        json.dumps({"answers": answers[:1]}),
+        json.dumps({"answers": [answers[0], answers[0]]}),
+        json.dumps({"answers": [answers[0], {**answers[1], "question": "x"}]}),
+        json.dumps({"answers": [answers[0], {**answers[1], "question": 999999}]}),
+        json.dumps(
+            {
+                "answers": [
+                    answers[0],
+                    {
+                        "question": other_question.id,
+                        "selected_alternative": other_alternative.id,
+                    },
+                ]
+            }
+        ),
+        json.dumps(
+            {
+                "answers": [
+                    answers[0],
+                    {**answers[1], "selected_alternative": answers[0]["question"]},
+                ]
+            }
+        ),
+        json.dumps(
+            {
+                "answers": [
+                    answers[0],
+                    {
+                        **answers[1],
+                        "selected_alternative": answers[0]["selected_alternative"],
+                    },
+                ]
+            }
+        ),
+    ]
+
+
+def test_async_create_submission_validates_like_sync_view(api_client, student, exam):
+    for body in _invalid_payloads(exam):
+        response = _assert_same_response(api_client, student.id, exam.id, body)
+        assert response.status_code == 400
+    assert not ExamSubmission.objects.exists()
+
+
+def test_async_create_submission_not_found_like_sync_view(api_client, student, exam):
+    body = json.dumps({"answers": _answers(exam)})
+
+    response = _assert_same_response(api_client, 999999, exam.id, body)
+    assert response.status_code == 404
+    response = _assert_same_response(api_client, student.id, 999999, body)
+    assert response.status_code == 404
+
+
+def test_async_create_submission_duplicate_like_sync_view(api_client, student, exam):
+    body = json.dumps({"answers": _answers(exam)})
+    assert _async_post(student.id, exam.id, body).status_code == 201
+
+    response = _assert_same_response(api_client, student.id, exam.id, body)
+    assert response.status_code == 400
+    assert ExamSubmission.objects.count() == 1
+
+
+def test_async_create_submission_unsupported_media_type(student, exam):
+    response = _async_post(student.id, exam.id, "answers=1", "text/plain")
+    assert response.status_code == 415
+
+
+def test_async_result_matches_sync_view(api_client, student, exam):
+    body = json.dumps({"answers": _answers(exam)})
+    assert _async_post(student.id, exam.id, body).status_code == 201
+    url = reverse("exam-result", kwargs={"student_id": student.id, "exam_id": exam.id})
+
+    response = _async_get(student.id, exam.id)
+    cache.clear()
+    sync_response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert response.content == sync_response.content
+    assert response["ETag"] == sync_response["ETag"]
+
+    response = _async_get(student.id, exam.id, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+
+
+def test_async_result_not_found(api_client, student, exam):
+    url = reverse("exam-result", kwargs={"student_id": student.id, "exam_id": exam.id})
+    sync_response = api_client.get(url)
+    response = _async_get(student.id, exam.id)
+
+    assert response.status_code == sync_response.status_code == 404
+    assert json.loads(response.content) == sync_response.json()
@@ -0,0 +1,145 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APIClient
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from student.models import Student
+from submission.models import DraftSubmission, ExamSubmission
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def student(db):
+    return Student.objects.create(username="student", email="student@x.io")
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2, 3):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2, 3):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == 1),
+            )
+    cache.clear()
+    return exam
+
+
+def _answer(exam, number, option):
+    question_id = ExamQuestion.objects.get(exam=exam, number=number).question_id
+    alternative = Alternative.objects.get(question_id=question_id, option=option)
+    return {"question": question_id, "selected_alternative": alternative.id}
+
+
+def _urls(student, exam):
+    kwargs = {"student_id": student.id, "exam_id": exam.id}
+    return (
+        reverse("draft-submission", kwargs=kwargs),
+        reverse("finalize-draft-submission", kwargs=kwargs),
+    )
+
+
+def test_draft_answers_are_saved_as_deltas_and_finalized(api_client, student, exam):
+    draft_url, finalize_url = _urls(student, exam)
+
+    for answers in (
+        [_answer(exam, 1, 2)],
+        [_answer(exam, 2, 1), _answer(exam, 1, 1)],
+        [_answer(exam, 3, 3)],
+    ):
+        response = api_client.patch(draft_url, {"answers": answers}, format="json")
+        assert response.status_code == 200
+        assert response.json() == {"answers": answers}
+
+    draft = api_client.get(draft_url).json()
+    assert sorted(draft["answers"], key=lambda answer: answer["question"]) == [
+        _answer(exam, 1, 1),
+        _answer(exam, 2, 1),
+        _answer(exam, 3, 3),
+    ]
+
+    response = api_client.post(finalize_url)
+    assert response.status_code == 201
+    assert response.json()["answers"] == [
+        _answer(exam, 1, 1),
+        _answer(exam, 2, 1),
+        _answer(exam, 3, 3),
+    ]
+    submission = ExamSubmission.objects.get(student=student, exam=exam)
+    assert (submission.total_correct, submission.total_questions) == (2, 3)
+    assert not DraftSubmission.objects.exists()
+
+    result_url = reverse(
+        "exam-result", kwargs={"student_id": student.id, "exam_id": exam.id}
+    )
+    assert api_client.get(result_url).json()["total_correct"] == 2
+    response = api_client.patch(
+        draft_url, {"answers": [_answer(exam, 1, 1)]}, format="json"
+    )
+    assert response.status_code == 400
+
+
+def test_draft_delta_costs_the_same_for_any_size(
+    api_client, student, exam, django_assert_num_queries
+):
+    draft_url, _ = _urls(student, exam)
+    api_client.patch(draft_url, {"answers": [_answer(exam, 1, 1)]}, format="json")
+
+    # Student, exam and previous submission checks (one query), draft upsert
+    # and answers upsert, plus the savepoint around the two upserts.
+    for answers in (
+        [_answer(exam, 2, 2)],
+        [_answer(exam, number, 3) for number in (1, 2, 3)],
+    ):
+        with django_assert_num_queries(5):
+            api_client.patch(draft_url, {"answers": answers}, format="json")
+
+
+def test_draft_delta_is_validated(api_client, student, exam):
+    draft_url, _ = _urls(student, exam)
+    other_question = _answer(exam, 2, 1)["question"]
+
+    for answers, error in (
+        ([], None),
+        ([_answer(exam, 1, 1), _answer(exam, 1, 2)], "is duplicated"),
+        (
+            [{**_answer(exam, 1, 1), "question": other_question}],
+            "does not belong to question",
+        ),
+    ):
+        response = api_client.patch(draft_url, {"answers": answers}, format="json")
+        assert response.status_code == 400
+        if error:
+            assert error in response.json()["non_field_errors"][0]
+    assert not DraftSubmission.objects.exists()
+
+    url = reverse("draft-submission", kwargs={"student_id": 999999, "exam_id": exam.id})
+    response = api_client.patch(url, {"answers": [_answer(exam, 1, 1)]}, format="json")
+    assert response.status_code == 404
+
+
+def test_incomplete_draft_is_not_finalized(api_client, student, exam):
+    draft_url, finalize_url = _urls(student, exam)
+    assert api_client.post(finalize_url).status_code == 404
+
+    api_client.patch(draft_url, {"answers": [_answer(exam, 1, 1)]}, format="json")
+    response = api_client.post(finalize_url)
+
+    assert response.status_code == 400
+    assert response.json() == {
+        "non_field_errors": [
+            "The number of answers does not match the number of questions in the exam: 3."
+        ]
+    }
+    assert not ExamSubmission.objects.exists()
+    assert DraftSubmission.objects.exists()
@@ -1,9 +1,17 @@
+import csv
+import io
+import json
+
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
+from exam.answer_key import get_answer_key
 from rest_framework.test import APIClient
 from student.models import Student
 from exam.models import Exam, ExamQuestion
 from question.models import Question, Alternative, AlternativesChoices
+from submission.ingest import ingest_submissions
 from submission.models import ExamSubmission, Answer
 
 
@@ -115,6 +123,30 @@ def test_create_submission_duplicate(
     assert "This student has already submitted this exam." in str(response.data)
 
 
+def test_submit_and_result_never_load_the_user_row(
+    api_client, student, exam, exam_questions, alternatives
+):
+    url = reverse(
+        "create-submission", kwargs={"student_id": student.id, "exam_id": exam.id}
+    )
+    data = {
+        "answers": [
+            {
+                "question": alternative.question_id,
+                "selected_alternative": alternative.id,
+            }
+            for alternative in alternatives
+            if alternative.option == AlternativesChoices.A
+        ]
+    }
+    with CaptureQueriesContext(connection) as queries:
+        assert api_client.post(url, data, format="json").status_code == 201
+        response = api_client.get(url + "result/")
+    assert response.status_code == 200
+    assert response.json()["student"] == student.email
+    assert not [query for query in queries if '"password"' in query["sql"]]
+
+
 def test_create_submission_invalid_answers(
     api_client, student, exam, exam_questions, alternatives
 ):
@@ -155,16 +187,65 @@ def test_get_submission_result_success(
             question=question,
             selected_alternative=correct_alternative,
         )
+    ExamSubmission.objects.filter(pk=submission.pk).refresh_scores()
     url = reverse("exam-result", kwargs={"student_id": student.id, "exam_id": exam.id})
     response = api_client.get(url, format="json")
     assert response.status_code == 200
-    data = response.data
+    data = response.json()
     assert data["student"] == str(student)
     assert data["exam"] == exam.name
     assert data["total_correct"] == exam.questions.count()
     assert data["percentage_score"] == 100.0
 
 
+@pytest.fixture
+def submitted_exam(api_client, student, exam, exam_questions, alternatives):
+    answers = [
+        {"question": alternative.question_id, "selected_alternative": alternative.id}
+        for alternative in alternatives
+        if alternative.is_correct
+    ]
+    url = reverse(
+        "create-submission", kwargs={"student_id": student.id, "exam_id": exam.id}
+    )
+    response = api_client.post(url, {"answers": answers}, format="json")
+    assert response.status_code == 201
+    return reverse("exam-result", kwargs={"student_id": student.id, "exam_id": exam.id})
+
+
+def test_get_submission_result_is_served_from_cache(
+    api_client, submitted_exam, django_assert_num_queries
+):
+    first_response = api_client.get(submitted_exam)
+    assert first_response.status_code == 200
+
+    # Only the percentile is read.
+    with django_assert_num_queries(1):
+        response = api_client.get(submitted_exam)
+    assert response.status_code == 200
+    assert response.content == first_response.content
+    assert response["ETag"] == first_response["ETag"]
+    assert "Last-Modified" not in response
+
+
+def test_get_submission_result_not_modified(api_client, submitted_exam):
+    response = api_client.get(submitted_exam)
+
+    response = api_client.get(submitted_exam, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert response.status_code == 304
+    assert response.content == b""
+
+
+def test_get_submission_result_of_a_deleted_submission(
+    api_client, submitted_exam, student, exam
+):
+    assert api_client.get(submitted_exam).status_code == 200
+
+    ExamSubmission.objects.get(student=student, exam=exam).delete()
+
+    assert api_client.get(submitted_exam).status_code == 404
+
+
 def test_get_submission_result_not_found(api_client, student, exam):
     url = reverse("exam-result", kwargs={"student_id": student.id, "exam_id": exam.id})
     response = api_client.get(url, format="json")
@@ -317,3 +398,217 @@ def test_get_submission_result_nonexistent_exam(api_client, student):
     )
     response = api_client.get(url, format="json")
     assert response.status_code == 404
+
+
+def _correct_answers(alternatives):
+    return [
+        {"question": alternative.question_id, "selected_alternative": alternative.id}
+        for alternative in alternatives
+        if alternative.is_correct
+    ]
+
+
+def test_create_submission_batch(
+    api_client, student, exam, questions, exam_questions, alternatives
+):
+    other_students = [
+        Student.objects.create_user(
+            username=f"student{number}", email=f"student{number}@example.com"
+        )
+        for number in range(4)
+    ]
+    ExamSubmission.objects.create(student=other_students[0], exam=exam)
+    extra_question = Question.objects.create(content="Extra Question")
+    extra_alternative = Alternative.objects.create(
+        question=extra_question,
+        content="Extra Option",
+        option=AlternativesChoices.A,
+        is_correct=True,
+    )
+    answers = _correct_answers(alternatives)
+    foreign_answers = [
+        answers[0],
+        {"question": extra_question.id, "selected_alternative": extra_alternative.id},
+    ]
+    mismatched_answers = [
+        answers[0],
+        {"question": questions[1].id, "selected_alternative": alternatives[0].id},
+    ]
+    data = {
+        "submissions": [
+            {"student": student.id, "answers": answers},
+            {"student": other_students[0].id, "answers": answers},
+            {"student": other_students[1].id, "answers": foreign_answers},
+            {"student": other_students[2].id, "answers": mismatched_answers},
+            {"student": 9999, "answers": answers},
+            {"student": student.id, "answers": answers},
+            {"student": other_students[3].id, "answers": [{"question": "x"}]},
+        ]
+    }
+    url = reverse("create-submission-batch", kwargs={"exam_id": exam.id})
+    response = api_client.post(url, data, format="json")
+    assert response.status_code == 207
+
+    results = response.data["results"]
+    assert [result["status"] for result in results] == [
+        "created",
+        "invalid",
+        "invalid",
+        "invalid",
+        "not_found",
+        "invalid",
+        "invalid",
+    ]
+    submission = ExamSubmission.objects.get(student=student, exam=exam)
+    assert results[0]["submission"] == submission.id
+    assert submission.total_correct == len(questions)
+    assert submission.answers.count() == len(questions)
+    assert "This student has already submitted this exam." in str(results[1])
+    assert (
+        f"The question {extra_question.id} does not belong to exam {exam.id}."
+        in str(results[2])
+    )
+    assert (
+        f"The alternative {alternatives[0].id} does not belong to question {questions[1].id}."
+        in str(results[3])
+    )
+    assert "This student has already submitted this exam." in str(results[5])
+    assert "Incorrect type" in str(results[6]["errors"]["answers"])
+    assert ExamSubmission.objects.filter(exam=exam).count() == 2
+
+
+def test_create_submission_batch_queries_do_not_grow_with_students(
+    api_client, exam, exam_questions, alternatives
+):
+    answers = _correct_answers(alternatives)
+    url = reverse("create-submission-batch", kwargs={"exam_id": exam.id})
+    get_answer_key(exam.id)
+    query_counts = []
+    for size in (2, 50):
+        students = Student.objects.bulk_create(
+            Student(username=f"batch{size}-{number}", email=f"{size}-{number}@ex.com")
+            for number in range(size)
+        )
+        data = {
+            "submissions": [
+                {"student": student.id, "answers": answers} for student in students
+            ]
+        }
+        with CaptureQueriesContext(connection) as queries:
+            response = api_client.post(url, data, format="json")
+        assert response.status_code == 207
+        query_counts.append(len(queries))
+
+    assert query_counts[0] == query_counts[1]
+    assert ExamSubmission.objects.filter(exam=exam).count() == 52
+
+
+def test_create_submission_batch_nonexistent_exam(api_client, student):
+    url = reverse("create-submission-batch", kwargs={"exam_id": 9999})
+    data = {"submissions": [{"student": student.id, "answers": []}]}
+    response = api_client.post(url, data, format="json")
+    assert response.status_code == 404
+
+
+@pytest.fixture
+def submitted_students(exam, exam_questions, alternatives):
+    answers = _correct_answers(alternatives)
+    students = Student.objects.bulk_create(
+        Student(username=f"report{number}", email=f"report{number}@example.com")
+        for number in range(3)
+    )
+    ingest_submissions(
+        get_answer_key(exam.id),
+        [{"student": student.id, "answers": answers} for student in students],
+    )
+    return students
+
+
+def test_exam_results_report_csv(api_client, exam, submitted_students):
+    url = reverse("exam-results-report", kwargs={"exam_id": exam.id})
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response.streaming
+    assert response["Content-Type"] == "text/csv"
+
+    rows = list(csv.DictReader(io.StringIO(b"".join(response).decode())))
+    assert [row["student"] for row in rows] == [
+        student.email for student in submitted_students
+    ]
+    assert all(row["total_correct"] == "2" for row in rows)
+    assert all(row["percentage_score"] == "100.0" for row in rows)
+
+
+def test_exam_results_report_ndjson(api_client, exam, submitted_students):
+    url = reverse("exam-results-report", kwargs={"exam_id": exam.id})
+    response = api_client.get(url, {"output": "ndjson"})
+    assert response.status_code == 200
+    assert response["Content-Type"] == "application/x-ndjson"
+
+    rows = [json.loads(line) for line in b"".join(response).splitlines()]
+    assert [row["student_id"] for row in rows] == [
+        student.id for student in submitted_students
+    ]
+    assert all(row["total_questions"] == 2 for row in rows)
+
+
+def test_exam_results_report_invalid_output(api_client, exam):
+    url = reverse("exam-results-report", kwargs={"exam_id": exam.id})
+    response = api_client.get(url, {"output": "xml"})
+    assert response.status_code == 400
+
+
+def test_exam_results_report_nonexistent_exam(db, api_client):
+    url = reverse("exam-results-report", kwargs={"exam_id": 9999})
+    response = api_client.get(url)
+    assert response.status_code == 404
+
+
+def test_exam_item_analysis(api_client, exam, questions, submitted_students, settings):
+    settings.SUBMISSION_ANALYTICS_LAG = 0
+    url = reverse("exam-item-analysis", kwargs={"exam_id": exam.id})
+    response = api_client.get(url)
+    assert response.status_code == 200
+    assert response.data["submissions"] == len(submitted_students)
+    assert [question["question"] for question in response.data["questions"]] == [
+        question.id for question in questions
+    ]
+    assert all(question["difficulty"] == 1.0 for question in response.data["questions"])
+
+
+def test_get_submission_result_percentile_follows_new_submissions(
+    api_client, submitted_exam, exam, alternatives
+):
+    response = api_client.get(submitted_exam)
+    assert response.json()["percentile"] == 50.0
+
+    other_student = Student.objects.create_user(
+        username="otherstudent", email="other@example.com"
+    )
+    wrong_answers = [
+        {"question": alternative.question_id, "selected_alternative": alternative.id}
+        for alternative in alternatives
+        if alternative.option == AlternativesChoices.C
+    ]
+    ingest_submissions(
+        get_answer_key(exam.id),
+        [{"student": other_student.id, "answers": wrong_answers}],
+    )
+
+    refreshed = api_client.get(submitted_exam, HTTP_IF_NONE_MATCH=response["ETag"])
+    assert refreshed.status_code == 200
+    assert refreshed.json()["percentile"] == 75.0
+    assert refreshed.json()["answers"] == response.json()["answers"]
+
+
+def test_exam_leaderboard(api_client, exam, submitted_students):
+    url = reverse("exam-leaderboard", kwargs={"exam_id": exam.id})
+    response = api_client.get(url, {"limit": 2})
+    assert response.status_code == 200
+    assert [entry["student"] for entry in response.data["results"]] == [
+        student.email for student in submitted_students[:2]
+    ]
+    assert all(entry["rank"] == 1 for entry in response.data["results"])
+
+    response = api_client.get(url, {"limit": 0})
+    assert response.status_code == 400
@@ -0,0 +1,91 @@
+import base64
+from datetime import timedelta
+
+import pytest
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from exam.models import Exam
+from student.models import Student
+from submission.models import ExamSubmission
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def student(db):
+    return Student.objects.create(username="student", email="student@x.io")
+
+
+@pytest.fixture
+def submissions(student):
+    now = timezone.now()
+    submissions = []
+    for number in range(7):
+        exam = Exam.objects.create(name=f"Exam {number}")
+        submission = ExamSubmission(student=student, exam=exam)
+        submission.set_score(number, 10)
+        submission.save()
+        submissions.append(submission)
+    # Three submissions at the same time, so pages must break ties by id.
+    for number, submission in enumerate(submissions):
+        submission.submission_time = now - timedelta(minutes=min(number, 4))
+    ExamSubmission.objects.bulk_update(submissions, ["submission_time"])
+    return submissions
+
+
+def _history_url(student):
+    return reverse("student-submission-history", kwargs={"student_id": student.id})
+
+
+def test_history_pages_newest_first(
+    api_client, settings, student, submissions, django_assert_num_queries
+):
+    settings.REST_FRAMEWORK = {**settings.REST_FRAMEWORK, "PAGE_SIZE": 3}
+    other = Student.objects.create(username="other", email="other@x.io")
+    ExamSubmission.objects.create(student=other, exam=submissions[0].exam)
+
+    pages = []
+    url = _history_url(student)
+    while url:
+        # The student check and the page itself, however deep the page is.
+        with django_assert_num_queries(2):
+            response = api_client.get(url)
+        assert response.status_code == 200
+        pages.append(response.data["results"])
+        url = response.data["next"]
+
+    # The PAGE_SIZE setting is read on each request.
+    assert [len(page) for page in pages] == [3, 3, 1]
+    seen = [item for page in pages for item in page]
+
+    expected = sorted(
+        submissions, key=lambda s: (s.submission_time, s.id), reverse=True
+    )
+    assert [item["id"] for item in seen] == [s.id for s in expected]
+    assert seen[0] == {
+        "id": expected[0].id,
+        "exam": expected[0].exam_id,
+        "exam_name": expected[0].exam.name,
+        "submission_time": expected[0]
+        .submission_time.isoformat()
+        .replace("+00:00", "Z"),
+        "total_correct": expected[0].total_correct,
+        "total_questions": 10,
+        "percentage_score": expected[0].percentage_score,
+    }
+
+
+def test_history_errors(api_client, student):
+    response = api_client.get(
+        reverse("student-submission-history", kwargs={"student_id": 0})
+    )
+    assert response.status_code == 404
+
+    for cursor in ("not-base64!", base64.urlsafe_b64encode(b'["nope", 1]').decode()):
+        response = api_client.get(_history_url(student), {"cursor": cursor})
+        assert response.status_code == 404
+        assert response.data == {"detail": "Invalid cursor"}
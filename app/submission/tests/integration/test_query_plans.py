@@ -0,0 +1,114 @@
+import json
+
+import pytest
+from django.db import connection
+from django.db.models import F, Value
+from django.db.models.lookups import LessThan
+from exam.answer_key import AnswerKey
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from student.models import Student
+from submission.models import Answer, ExamSubmission
+from utils.pagination import Row
+
+
+@pytest.fixture
+def submission(db):
+    exam = Exam.objects.create(name="Test Exam")
+    student = Student.objects.create(username="student", email="student@x.io")
+    submission = ExamSubmission.objects.create(student=student, exam=exam)
+    for number in (1, 2):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        alternatives = [
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == 1),
+            )
+            for option in (1, 2)
+        ]
+        Answer.objects.create(
+            submission=submission,
+            question=question,
+            selected_alternative=alternatives[0],
+        )
+    return submission
+
+
+@pytest.fixture
+def scans(db):
+    """
+    Return the scans of a queryset's plan as (node type, index name) pairs.
+
+    Sequential and bitmap scans are disabled, as they would always win on
+    tables this small, so a query without a usable index shows a Seq Scan.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute("SET LOCAL enable_seqscan = off")
+        cursor.execute("SET LOCAL enable_bitmapscan = off")
+
+    def scans(queryset):
+        (plan,) = json.loads(queryset.explain(format="json"))
+        nodes = [plan["Plan"]]
+        found = set()
+        while nodes:
+            node = nodes.pop()
+            if node["Node Type"].endswith("Scan"):
+                found.add((node["Node Type"], node.get("Index Name")))
+            nodes.extend(node.get("Plans", []))
+        return found
+
+    return scans
+
+
+def test_answer_key_queries_are_index_only(submission, scans):
+    assert scans(AnswerKey._question_ids(submission.exam_id)) == {
+        ("Index Only Scan", "examquestion_exam_number_uniq")
+    }
+    question_ids = list(AnswerKey._question_ids(submission.exam_id))
+    assert scans(AnswerKey._alternative_rows(question_ids)) == {
+        ("Index Only Scan", "alternative_question_idx")
+    }
+
+
+def test_submission_lookup_uses_unique_index(submission, scans):
+    queryset = ExamSubmission.objects.filter(
+        student_id=submission.student_id, exam_id=submission.exam_id
+    ).values("pk")
+    ((node_type, index_name),) = scans(queryset)
+    assert node_type in ("Index Scan", "Index Only Scan")
+    assert index_name.startswith("submission_examsubmission_student_id_exam_id")
+
+
+def test_correct_answers_count_is_index_only(submission, scans):
+    queryset = Answer.objects.filter(
+        submission=submission, selected_alternative__is_correct=True
+    ).values("selected_alternative")
+    assert scans(queryset) == {
+        ("Index Only Scan", "answer_submission_question_uniq"),
+        ("Index Only Scan", "alternative_correct_idx"),
+    }
+
+
+def test_answers_of_submission_range_are_index_only(submission, scans):
+    queryset = Answer.objects.filter(
+        submission_id__gte=submission.pk, submission_id__lte=submission.pk
+    ).values_list("submission_id", "selected_alternative_id")
+    assert scans(queryset) == {("Index Only Scan", "answer_submission_question_uniq")}
+
+
+def test_history_page_is_index_only(submission, scans):
+    queryset = (
+        ExamSubmission.objects.filter(student_id=submission.student_id)
+        .filter(
+            LessThan(
+                Row(F("submission_time"), F("id")),
+                Row(Value(submission.submission_time), Value(submission.pk)),
+            )
+        )
+        .order_by("-submission_time", "-id")
+        .values("exam_id", "submission_time", "total_correct", "percentage_score")
+    )
+    assert scans(queryset) == {("Index Only Scan", "submission_student_history_idx")}
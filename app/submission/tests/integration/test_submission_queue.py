@@ -0,0 +1,166 @@
+import io
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from student.models import Student
+from submission.models import ExamSubmission, QueuedSubmission
+from submission import queue
+from submission.queue import process_queued_submissions
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2, 3):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == 1),
+            )
+    cache.clear()
+    return exam
+
+
+@pytest.fixture
+def students(db):
+    return [
+        Student.objects.create(username=f"student{n}", email=f"student{n}@x.io")
+        for n in range(3)
+    ]
+
+
+def _answers(exam):
+    return [
+        {
+            "question": exam_question.question_id,
+            "selected_alternative": Alternative.objects.get(
+                question_id=exam_question.question_id, option=1
+            ).id,
+        }
+        for exam_question in ExamQuestion.objects.filter(exam=exam).order_by("number")
+    ]
+
+
+def _submit(api_client, student_id, exam_id, answers):
+    url = reverse(
+        "create-submission", kwargs={"student_id": student_id, "exam_id": exam_id}
+    )
+    return api_client.post(url, {"answers": answers}, format="json")
+
+
+@override_settings(SUBMISSION_QUEUE_ENABLED=True)
+def test_queued_submission_is_accepted_and_processed_later(api_client, exam, students):
+    response = _submit(api_client, students[0].id, exam.id, _answers(exam))
+
+    assert response.status_code == 202
+    data = response.json()
+    assert data["status"] == "pending"
+    assert response["Location"] == data["status_url"]
+    assert not ExamSubmission.objects.exists()
+
+    out = io.StringIO()
+    call_command("process_submission_queue", "--once", stdout=out)
+    assert "Processed 1 queued submissions." in out.getvalue()
+
+    data = api_client.get(data["status_url"]).json()
+    submission = ExamSubmission.objects.get(student=students[0], exam=exam)
+    assert data["status"] == "created"
+    assert data["submission"] == submission.pk
+    assert (submission.total_correct, submission.total_questions) == (2, 2)
+    assert api_client.get(data["result_url"]).json()["total_correct"] == 2
+
+
+@override_settings(SUBMISSION_QUEUE_ENABLED=True)
+def test_queued_submission_structural_checks(api_client, exam, students):
+    response = _submit(api_client, students[0].id, exam.id, [{"question": "x"}])
+
+    assert response.status_code == 400
+    assert "answers" in response.json()
+    assert not QueuedSubmission.objects.exists()
+
+
+@override_settings(SUBMISSION_QUEUE_ENABLED=True)
+def test_queued_submissions_report_their_outcome(api_client, exam, students):
+    answers = _answers(exam)
+    urls = [
+        _submit(api_client, students[0].id, exam.id, answers).json()["status_url"],
+        _submit(api_client, students[0].id, exam.id, answers).json()["status_url"],
+        _submit(api_client, students[1].id, exam.id, answers[:1]).json()["status_url"],
+        _submit(api_client, 999999, exam.id, answers).json()["status_url"],
+        _submit(api_client, students[2].id, 999999, answers).json()["status_url"],
+    ]
+
+    assert process_queued_submissions(batch_size=2) == 2
+    assert process_queued_submissions(batch_size=10) == 3
+    assert process_queued_submissions(batch_size=10) == 0
+
+    results = [api_client.get(url).json() for url in urls]
+    assert [result["status"] for result in results] == [
+        "created",
+        "invalid",
+        "invalid",
+        "not_found",
+        "not_found",
+    ]
+    assert results[1]["errors"] == {
+        "non_field_errors": ["This student has already submitted this exam."]
+    }
+    assert results[4]["errors"] == {"detail": "No Exam matches the given query."}
+    assert [result["result_url"] is not None for result in results] == [
+        True,
+        False,
+        False,
+        False,
+        False,
+    ]
+    assert ExamSubmission.objects.count() == 1
+
+
+def test_queued_submission_status_not_found(db, api_client):
+    response = api_client.get(reverse("queued-submission", kwargs={"pk": 999999}))
+    assert response.status_code == 404
+
+
+@override_settings(SUBMISSION_QUEUE_ENABLED=True)
+def test_queued_submission_failure_does_not_block_the_batch(
+    api_client, exam, students, monkeypatch
+):
+    answers = _answers(exam)
+    urls = [
+        _submit(api_client, student.id, exam.id, answers).json()["status_url"]
+        for student in students
+    ]
+
+    def ingest_submissions(answer_key, entries):
+        if any(entry["student"] == students[1].id for entry in entries):
+            raise RuntimeError("Poison")
+        return original_ingest_submissions(answer_key, entries)
+
+    original_ingest_submissions = queue.ingest_submissions
+    monkeypatch.setattr(queue, "ingest_submissions", ingest_submissions)
+
+    assert process_queued_submissions(batch_size=10) == 3
+    assert process_queued_submissions(batch_size=10) == 0
+
+    results = [api_client.get(url).json() for url in urls]
+    assert [result["status"] for result in results] == ["created", "failed", "created"]
+    assert results[1]["errors"] == {"detail": "RuntimeError: Poison"}
+    assert set(ExamSubmission.objects.values_list("student_id", flat=True)) == {
+        students[0].id,
+        students[2].id,
+    }
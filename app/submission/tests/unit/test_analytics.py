@@ -0,0 +1,163 @@
+import math
+from datetime import timedelta
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+from exam.answer_key import get_answer_key
+from exam.models import Exam, ExamQuestion
+from question.models import Question, Alternative
+from student.models import Student
+from submission.analytics import get_item_statistics
+from submission.ingest import ingest_submissions
+from submission.models import Answer, ExamSubmission
+
+PICKS = [(0, 0, 0), (0, 1, 0), (1, 1, 0), (0, 0, 2), (2, 0, 1)]
+
+
+@pytest.fixture
+def exam(db, settings):
+    settings.SUBMISSION_ANALYTICS_LAG = 0
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2, 3):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2, 3):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == 1),
+            )
+    cache.clear()
+    return exam
+
+
+def _submit(exam, picks):
+    questions = [eq.question for eq in ExamQuestion.objects.filter(exam=exam)]
+    entries = []
+    for number, student_picks in enumerate(picks):
+        student = Student.objects.create(
+            username=f"student{number}-{len(picks)}",
+            email=f"student{number}-{len(picks)}@example.com",
+        )
+        answers = []
+        for question, pick in zip(questions, student_picks):
+            alternative = question.alternatives.order_by("option")[pick]
+            answers.append(
+                {"question": question.id, "selected_alternative": alternative.id}
+            )
+        entries.append({"student": student.id, "answers": answers})
+    ingest_submissions(get_answer_key(exam.id), entries)
+
+
+def _expected(picks):
+    scores = [sum(pick == 0 for pick in student_picks) for student_picks in picks]
+    mean = sum(scores) / len(scores)
+    std = math.sqrt(sum((score - mean) ** 2 for score in scores) / len(scores))
+    expected = []
+    for index in range(3):
+        correct = [score for score, p in zip(scores, picks) if p[index] == 0]
+        incorrect = [score for score, p in zip(scores, picks) if p[index] != 0]
+        difficulty = len(correct) / len(scores)
+        discrimination = None
+        if correct and incorrect and std:
+            discrimination = (
+                (sum(correct) / len(correct) - sum(incorrect) / len(incorrect))
+                / std
+                * math.sqrt(difficulty * (1 - difficulty))
+            )
+        shares = [
+            sum(p[index] == option for p in picks) / len(picks) for option in range(3)
+        ]
+        expected.append((difficulty, discrimination, shares))
+    return expected
+
+
+def _assert_summary(summary, picks):
+    assert summary["submissions"] == len(picks)
+    for question, (difficulty, discrimination, shares) in zip(
+        summary["questions"], _expected(picks)
+    ):
+        assert question["responses"] == len(picks)
+        assert question["difficulty"] == pytest.approx(difficulty)
+        if discrimination is None:
+            assert question["discrimination"] is None
+        else:
+            assert question["discrimination"] == pytest.approx(discrimination)
+        assert [alternative["share"] for alternative in question["alternatives"]] == (
+            pytest.approx(shares)
+        )
+
+
+def test_item_statistics(exam):
+    _submit(exam, PICKS)
+    _assert_summary(get_item_statistics(exam.id).summary(), PICKS)
+
+
+def test_item_statistics_are_updated_incrementally(exam, django_assert_num_queries):
+    _submit(exam, PICKS[:3])
+    get_item_statistics(exam.id)
+    _submit(exam, PICKS[3:])
+
+    # Only the new submissions and their answers are read.
+    with django_assert_num_queries(2):
+        statistics = get_item_statistics(exam.id)
+    _assert_summary(statistics.summary(), PICKS)
+
+
+def test_item_statistics_without_submissions(exam):
+    summary = get_item_statistics(exam.id).summary()
+    assert summary["submissions"] == 0
+    assert all(question["difficulty"] is None for question in summary["questions"])
+
+
+def test_item_statistics_count_submissions_committed_out_of_id_order(
+    exam, settings, monkeypatch
+):
+    settings.SUBMISSION_ANALYTICS_LAG = 60
+    now = timezone.now()
+    monkeypatch.setattr("submission.analytics.timezone.now", lambda: now)
+    _submit(exam, PICKS)
+    submissions = list(ExamSubmission.objects.filter(exam=exam).order_by("pk"))
+    # The newest id was committed long ago, the others are still in flight.
+    in_flight = [submission.pk for submission in submissions[:-1]]
+    ExamSubmission.objects.filter(pk=submissions[-1].pk).update(
+        submission_time=now - timedelta(seconds=90)
+    )
+    hidden = ExamSubmission.objects.filter(pk__in=in_flight)
+    rows = list(hidden.values())
+    answers = {
+        row["id"]: list(
+            Answer.objects.filter(submission_id=row["id"]).values(
+                "question_id", "selected_alternative_id"
+            )
+        )
+        for row in rows
+    }
+    hidden.delete()
+    cache.clear()
+
+    assert get_item_statistics(exam.id).summary()["submissions"] == 1
+
+    # They commit with their lower ids after the statistics were read.
+    ExamSubmission.objects.bulk_create(ExamSubmission(**row) for row in rows)
+    hidden.update(submission_time=now - timedelta(seconds=30))
+    Answer.objects.bulk_create(
+        Answer(submission_id=submission_id, **answer)
+        for submission_id, submission_answers in answers.items()
+        for answer in submission_answers
+    )
+    assert get_item_statistics(exam.id).summary()["submissions"] == 1
+
+    now += timedelta(seconds=31)
+    _assert_summary(get_item_statistics(exam.id).summary(), PICKS)
+
+
+def test_item_statistics_are_rebuilt_after_a_delete(exam):
+    _submit(exam, PICKS)
+    get_item_statistics(exam.id)
+
+    ExamSubmission.objects.filter(exam=exam).order_by("-pk").first().delete()
+
+    _assert_summary(get_item_statistics(exam.id).summary(), PICKS[:-1])
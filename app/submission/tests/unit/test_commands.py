@@ -0,0 +1,81 @@
+import io
+import json
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from submission.models import ExamSubmission, Answer
+from student.models import Student
+from exam.models import Exam, ExamQuestion
+from question.models import Question, Alternative
+
+
+@pytest.fixture
+def submission(db):
+    student = Student.objects.create_user(
+        username="teststudent", email="student@example.com", password="testpass"
+    )
+    exam = Exam.objects.create(name="Test Exam")
+    submission = ExamSubmission.objects.create(student=student, exam=exam)
+    for number in range(1, 4):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        alternatives = [
+            Alternative.objects.create(
+                question=question, content=option, option=idx, is_correct=(idx == 1)
+            )
+            for idx, option in enumerate(["Option A", "Option B"], start=1)
+        ]
+        Answer.objects.create(
+            submission=submission,
+            question=question,
+            selected_alternative=alternatives[0 if number < 3 else 1],
+        )
+    return submission
+
+
+def test_computed_scores_are_not_inflated(submission):
+    submission = ExamSubmission.objects.with_computed_scores().get(pk=submission.pk)
+    assert submission.computed_total_correct == 2
+    assert submission.computed_total_questions == 3
+
+
+def test_backfill_submission_scores(submission):
+    call_command("backfill_submission_scores")
+
+    submission.refresh_from_db()
+    assert submission.total_correct == 2
+    assert submission.total_questions == 3
+    assert submission.percentage_score == (2 / 3) * 100
+
+
+def test_verify_submission_scores(submission):
+    with pytest.raises(CommandError) as exc_info:
+        call_command("backfill_submission_scores", "--verify")
+    assert "1 submissions have outdated scores." in str(exc_info.value)
+
+    call_command("backfill_submission_scores", "--batch-size", "1")
+    call_command("backfill_submission_scores", "--verify")
+
+
+def test_export_exam_results(submission):
+    call_command("backfill_submission_scores")
+    output = io.StringIO()
+
+    call_command(
+        "export_exam_results",
+        submission.exam_id,
+        "--output-format",
+        "ndjson",
+        stdout=output,
+    )
+
+    row = json.loads(output.getvalue())
+    assert row["student"] == "student@example.com"
+    assert row["total_correct"] == 2
+    assert row["total_questions"] == 3
+
+
+def test_export_exam_results_nonexistent_exam(db):
+    with pytest.raises(CommandError):
+        call_command("export_exam_results", 9999)
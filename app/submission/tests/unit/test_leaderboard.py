@@ -0,0 +1,85 @@
+import pytest
+from exam.answer_key import get_answer_key
+from exam.models import Exam, ExamQuestion
+from question.models import Question, Alternative
+from student.models import Student
+from submission.ingest import ingest_submissions
+from submission.leaderboard import get_leaderboard, get_percentile
+from submission.models import ExamScoreHistogram, ExamSubmission
+
+# Number of correct answers of each student, out of 3 questions.
+SCORES = [3, 1, 2, 2, 0]
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2, 3):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == 1),
+            )
+    return exam
+
+
+@pytest.fixture
+def students(exam):
+    answer_key = get_answer_key(exam.id)
+    alternatives = {
+        question_id: sorted(answer_key.alternatives[question_id])
+        for question_id in answer_key.question_ids
+    }
+    students = []
+    entries = []
+    for number, score in enumerate(SCORES):
+        student = Student.objects.create(
+            username=f"student{number}", email=f"student{number}@example.com"
+        )
+        students.append(student)
+        answers = [
+            {
+                "question": question_id,
+                "selected_alternative": alternatives[question_id][
+                    0 if index < score else 1
+                ],
+            }
+            for index, question_id in enumerate(answer_key.question_ids)
+        ]
+        entries.append({"student": student.id, "answers": answers})
+    ingest_submissions(answer_key, entries)
+    return students
+
+
+def test_histogram_is_updated_on_submission(exam, students):
+    histogram = dict(
+        ExamScoreHistogram.objects.filter(exam=exam).values_list("score", "count")
+    )
+    assert histogram == {0: 1, 1: 1, 2: 2, 3: 1}
+
+
+def test_histogram_is_updated_on_delete(exam, students):
+    ExamSubmission.objects.get(student=students[2]).delete()
+    assert ExamScoreHistogram.objects.get(exam=exam, score=2).count == 1
+
+
+def test_percentile(exam, students, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert get_percentile(exam.id, 3) == 90.0
+    assert get_percentile(exam.id, 2) == 60.0
+    assert get_percentile(exam.id, 0) == 10.0
+
+
+def test_leaderboard(exam, students):
+    leaderboard = get_leaderboard(exam.id, 4)
+    assert [entry["student_id"] for entry in leaderboard] == [
+        students[0].id,
+        students[2].id,
+        students[3].id,
+        students[1].id,
+    ]
+    assert [entry["rank"] for entry in leaderboard] == [1, 2, 2, 4]
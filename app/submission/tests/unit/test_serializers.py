@@ -2,10 +2,13 @@ import pytest
 from rest_framework.exceptions import ValidationError
 from submission.serializers import ExamSubmissionSerializer, ExamResultSerializer
 from submission.models import ExamSubmission, Answer
+from submission.results import render_result, render_result_data
 from student.models import Student
 from exam.models import Exam, ExamQuestion
 from question.models import Question, Alternative
+from django.db import connection
 from django.http import Http404
+from django.test.utils import CaptureQueriesContext
 
 
 @pytest.fixture
@@ -73,6 +76,87 @@ def test_successful_submission(
     assert submission.student == student
     assert submission.exam == exam
     assert submission.answers.count() == len(questions)
+    submission.refresh_from_db()
+    assert submission.total_correct == len(questions)
+    assert submission.total_questions == len(questions)
+    assert submission.percentage_score == 100.0
+
+
+def _create_exam_with_answers(name, number_of_questions):
+    exam = Exam.objects.create(name=name)
+    questions = Question.objects.bulk_create(
+        Question(content=f"Question {number}")
+        for number in range(1, number_of_questions + 1)
+    )
+    ExamQuestion.objects.bulk_create(
+        ExamQuestion(exam=exam, question=question, number=number)
+        for number, question in enumerate(questions, start=1)
+    )
+    alternatives = Alternative.objects.bulk_create(
+        Alternative(question=question, content="Option A", option=1, is_correct=True)
+        for question in questions
+    )
+    answers_data = [
+        {"question": alternative.question_id, "selected_alternative": alternative.id}
+        for alternative in alternatives
+    ]
+    return exam, answers_data
+
+
+def _build_submission_serializer(student, exam, answers_data, rf):
+    context = {
+        "request": rf.post("/fake-path/"),
+        "view": type(
+            "FakeView",
+            (object,),
+            {"kwargs": {"student_id": student.id, "exam_id": exam.id}},
+        )(),
+    }
+    return ExamSubmissionSerializer(data={"answers": answers_data}, context=context)
+
+
+def _count_validation_queries(student, exam, answers_data, rf):
+    serializer = _build_submission_serializer(student, exam, answers_data, rf)
+    with CaptureQueriesContext(connection) as queries:
+        assert serializer.is_valid(), serializer.errors
+    return len(queries)
+
+
+def _count_submission_writes(student, exam, answers_data, rf):
+    serializer = _build_submission_serializer(student, exam, answers_data, rf)
+    assert serializer.is_valid(), serializer.errors
+    with CaptureQueriesContext(connection) as queries:
+        serializer.save()
+    return sum(query["sql"].startswith("INSERT") for query in queries)
+
+
+def test_submission_writes_do_not_grow_with_answers(db, student, rf):
+    small_exam, small_answers = _create_exam_with_answers("Small Exam", 2)
+    large_exam, large_answers = _create_exam_with_answers("Large Exam", 120)
+
+    small_writes = _count_submission_writes(student, small_exam, small_answers, rf)
+    large_writes = _count_submission_writes(student, large_exam, large_answers, rf)
+
+    assert small_writes == large_writes == 2
+    assert Answer.objects.filter(submission__exam=large_exam).count() == 120
+
+
+def test_validation_queries_do_not_grow_with_answers(db, student, rf):
+    small_exam, small_answers = _create_exam_with_answers("Small Exam", 10)
+    large_exam, large_answers = _create_exam_with_answers("Large Exam", 500)
+
+    small_queries = _count_validation_queries(student, small_exam, small_answers, rf)
+    large_queries = _count_validation_queries(student, large_exam, large_answers, rf)
+
+    assert small_queries == large_queries
+
+
+def test_validation_is_served_from_answer_key(db, student, rf):
+    exam, answers_data = _create_exam_with_answers("Cached Exam", 50)
+    _count_validation_queries(student, exam, answers_data, rf)
+
+    # The student, exam and duplicate-submission checks only, in one query.
+    assert _count_validation_queries(student, exam, answers_data, rf) == 1
 
 
 def test_student_already_submitted(
@@ -333,9 +417,8 @@ def test_exam_result_serializer(db, student, exam, questions, alternatives):
             selected_alternative=correct_alternative,
         )
 
-    submission = ExamSubmission.objects.annotate_performance_metrics().get(
-        pk=submission.pk
-    )
+    ExamSubmission.objects.filter(pk=submission.pk).refresh_scores()
+    submission = ExamSubmission.objects.with_answers().get(pk=submission.pk)
     serializer = ExamResultSerializer(instance=submission)
 
     data = serializer.data
@@ -362,12 +445,35 @@ def test_exam_result_serializer_with_incorrect_answers(
             selected_alternative=selected_alternative,
         )
 
-    submission = ExamSubmission.objects.annotate_performance_metrics().get(
-        pk=submission.pk
-    )
+    ExamSubmission.objects.filter(pk=submission.pk).refresh_scores()
+    submission = ExamSubmission.objects.with_answers().get(pk=submission.pk)
     serializer = ExamResultSerializer(instance=submission)
 
     data = serializer.data
     assert data["total_correct"] == len(questions) - 1
     percentage = ((len(questions) - 1) / len(questions)) * 100
     assert data["percentage_score"] == percentage
+
+
+def test_result_data_renders_like_the_serializer(db, student, exam, questions):
+    questions[0].content = 'Qual é a conduta? Linha "dois" \\ </script>'
+    questions[0].save()
+    submission = ExamSubmission.objects.create(student=student, exam=exam)
+    # One selected alternative with a null is_correct and one incorrect.
+    for question, is_correct in zip(questions, (None, False)):
+        alternative = Alternative.objects.create(
+            question=question, content="Opção ção 🙂", option=1, is_correct=is_correct
+        )
+        Answer.objects.create(
+            submission=submission, question=question, selected_alternative=alternative
+        )
+    ExamSubmission.objects.filter(pk=submission.pk).refresh_scores()
+
+    expected = render_result(
+        ExamSubmission.objects.with_answers().get(pk=submission.pk)
+    )
+    with CaptureQueriesContext(connection) as queries:
+        content = render_result_data(submission.pk)
+    assert content == expected
+    # The submission, its answers and the percentile.
+    assert len(queries) == 3
@@ -1,15 +1,76 @@
+from django.conf import settings
 from django.urls import path
-from .views import ExamSubmissionCreateView, ExamResultView
+from .views import (
+    DraftSubmissionFinalizeView,
+    DraftSubmissionView,
+    AsyncExamResultView,
+    AsyncExamSubmissionCreateView,
+    ExamSubmissionBatchCreateView,
+    ExamSubmissionCreateView,
+    ExamItemAnalysisView,
+    ExamLeaderboardView,
+    ExamResultView,
+    ExamResultsReportView,
+    QueuedSubmissionView,
+    StudentSubmissionHistoryView,
+)
+
+if settings.SUBMISSION_ASYNC_VIEWS:
+    submission_create_view = AsyncExamSubmissionCreateView.as_view()
+    result_view = AsyncExamResultView.as_view()
+else:
+    submission_create_view = ExamSubmissionCreateView.as_view()
+    result_view = ExamResultView.as_view()
 
 urlpatterns = [
+    path(
+        "students/<int:student_id>/submissions/",
+        StudentSubmissionHistoryView.as_view(),
+        name="student-submission-history",
+    ),
     path(
         "students/<int:student_id>/exams/<int:exam_id>/submissions/",
-        ExamSubmissionCreateView.as_view(),
+        submission_create_view,
         name="create-submission",
     ),
     path(
         "students/<int:student_id>/exams/<int:exam_id>/submissions/result/",
-        ExamResultView.as_view(),
+        result_view,
         name="exam-result",
     ),
+    path(
+        "students/<int:student_id>/exams/<int:exam_id>/submissions/draft/",
+        DraftSubmissionView.as_view(),
+        name="draft-submission",
+    ),
+    path(
+        "students/<int:student_id>/exams/<int:exam_id>/submissions/draft/finalize/",
+        DraftSubmissionFinalizeView.as_view(),
+        name="finalize-draft-submission",
+    ),
+    path(
+        "submissions/queue/<int:pk>/",
+        QueuedSubmissionView.as_view(),
+        name="queued-submission",
+    ),
+    path(
+        "exams/<int:exam_id>/submissions/batch/",
+        ExamSubmissionBatchCreateView.as_view(),
+        name="create-submission-batch",
+    ),
+    path(
+        "exams/<int:exam_id>/results/",
+        ExamResultsReportView.as_view(),
+        name="exam-results-report",
+    ),
+    path(
+        "exams/<int:exam_id>/item-analysis/",
+        ExamItemAnalysisView.as_view(),
+        name="exam-item-analysis",
+    ),
+    path(
+        "exams/<int:exam_id>/leaderboard/",
+        ExamLeaderboardView.as_view(),
+        name="exam-leaderboard",
+    ),
 ]
@@ -0,0 +1,9 @@
+from django.db import models
+
+
+class QueuedSubmissionStatus(models.TextChoices):
+    PENDING = "pending", "Pending"
+    CREATED = "created", "Created"
+    INVALID = "invalid", "Invalid"
+    NOT_FOUND = "not_found", "Not found"
+    FAILED = "failed", "Failed"
@@ -1,32 +1,335 @@
-from rest_framework import generics
-from .models import ExamSubmission
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.http import Http404, HttpResponse, StreamingHttpResponse
+from django.utils.cache import get_conditional_response
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import generics, serializers, status
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from exam.answer_key import aget_answer_key, get_answer_key
 from exam.models import Exam
 from student.models import Student
-from .serializers import ExamResultSerializer, ExamSubmissionSerializer
+from utils.metrics import timed
+from utils.pagination import KeysetPagination
+from .analytics import get_item_statistics
+from .ingest import ingest_submissions
+from .leaderboard import get_leaderboard
+from .reports import REPORT_CONTENT_TYPES, stream_exam_results
+from .drafts import finalize_draft, save_draft_answers
+from .models import DraftSubmission, ExamSubmission, QueuedSubmission
+from .results import aget_result_document, get_result_document
+from .serializers import (
+    AnswerSerializer,
+    DraftAnswersSerializer,
+    ExamResultSerializer,
+    ExamSubmissionBatchSerializer,
+    ExamSubmissionSerializer,
+    PrecheckedExamSubmissionSerializer,
+    QueuedSubmissionSerializer,
+    SubmissionHistorySerializer,
+    aget_submission_state,
+    apreload_answers,
+    build_submission,
+    save_submissions,
+)
 
 
 class ExamSubmissionCreateView(generics.CreateAPIView):
     serializer_class = ExamSubmissionSerializer
+    query_budget = 15
 
-    def perform_create(self, serializer):
-        student_id = self.kwargs.get("student_id")
+    def get_serializer_class(self):
+        if settings.SUBMISSION_QUEUE_ENABLED:
+            return QueuedSubmissionSerializer
+        return super().get_serializer_class()
+
+    def create(self, request, *args, **kwargs):
+        if not settings.SUBMISSION_QUEUE_ENABLED:
+            return super().create(request, *args, **kwargs)
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        serializer.save(
+            student_id=self.kwargs.get("student_id"),
+            exam_id=self.kwargs.get("exam_id"),
+        )
+        return Response(
+            serializer.data,
+            status=status.HTTP_202_ACCEPTED,
+            headers={"Location": serializer.data["status_url"]},
+        )
+
+
+class QueuedSubmissionView(generics.RetrieveAPIView):
+    queryset = QueuedSubmission.objects.all()
+    serializer_class = QueuedSubmissionSerializer
+    query_budget = 2
+
+
+class DraftSubmissionView(generics.GenericAPIView):
+    serializer_class = DraftAnswersSerializer
+    query_budget = 10
+
+    def get(self, request, *args, **kwargs):
+        draft = generics.get_object_or_404(
+            DraftSubmission,
+            student_id=self.kwargs.get("student_id"),
+            exam_id=self.kwargs.get("exam_id"),
+        )
+        answers = draft.answers.order_by("pk").values(
+            "question", "selected_alternative"
+        )
+        return Response({"answers": list(answers), "updated_at": draft.updated_at})
+
+    def patch(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        save_draft_answers(
+            self.kwargs.get("student_id"),
+            self.kwargs.get("exam_id"),
+            serializer.validated_data["answers"],
+        )
+        return Response(serializer.data)
+
+
+class DraftSubmissionFinalizeView(generics.GenericAPIView):
+    query_budget = 15
+
+    def post(self, request, *args, **kwargs):
         exam_id = self.kwargs.get("exam_id")
-        student = generics.get_object_or_404(Student, id=student_id)
-        exam = generics.get_object_or_404(Exam, id=exam_id)
-        serializer.save(student=student, exam=exam)
+        with transaction.atomic():
+            draft = generics.get_object_or_404(
+                DraftSubmission.objects.select_for_update(),
+                student_id=self.kwargs.get("student_id"),
+                exam_id=exam_id,
+            )
+            try:
+                _, answers = finalize_draft(draft, get_answer_key(exam_id))
+            except serializers.ValidationError as exc:
+                raise serializers.ValidationError(
+                    {"non_field_errors": exc.detail}
+                ) from exc
+        return Response(
+            {"answers": AnswerSerializer(answers, many=True).data},
+            status=status.HTTP_201_CREATED,
+        )
+
+
+class ExamSubmissionBatchCreateView(generics.GenericAPIView):
+    serializer_class = ExamSubmissionBatchSerializer
+    query_budget = 15
+
+    def post(self, request, *args, **kwargs):
+        exam_id = self.kwargs.get("exam_id")
+        exam = generics.get_object_or_404(Exam.objects.only("id"), id=exam_id)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        results = ingest_submissions(
+            get_answer_key(exam.id), serializer.validated_data["submissions"]
+        )
+        return Response({"results": results}, status=status.HTTP_207_MULTI_STATUS)
 
 
 class ExamResultView(generics.RetrieveAPIView):
     serializer_class = ExamResultSerializer
     lookup_fields = ("student_id", "exam_id")
+    query_budget = 8
 
-    def get_queryset(self):
-        return ExamSubmission.objects.annotate_performance_metrics()
+    def retrieve(self, request, *args, **kwargs):
+        document = get_result_document(
+            self.kwargs.get("student_id"), self.kwargs.get("exam_id")
+        )
+        if document is None:
+            raise Http404
+        return _result_response(request, document)
+
+
+class StudentSubmissionHistoryView(generics.ListAPIView):
+    """
+    A student's submissions, newest first, paginated by keyset so deep pages
+    cost the same as the first one.
+    """
 
-    def get_object(self):
-        queryset = self.get_queryset()
+    serializer_class = SubmissionHistorySerializer
+    pagination_class = KeysetPagination
+    ordering = ("-submission_time", "-id")
+    query_budget = 2
+
+    def get_queryset(self):
         student_id = self.kwargs.get("student_id")
+        if not Student.objects.filter(id=student_id).exists():
+            raise Http404("No Student matches the given query.")
+        return (
+            ExamSubmission.objects.filter(student_id=student_id)
+            .select_related("exam")
+            .only(
+                "exam__name",
+                "submission_time",
+                "total_correct",
+                "total_questions",
+                "percentage_score",
+            )
+        )
+
+
+def _result_response(request, document):
+    # No Last-Modified: the percentile changes several times a second at
+    # peak, and HTTP dates only have whole seconds.
+    response = get_conditional_response(request, etag=document.etag)
+    if response is None:
+        response = HttpResponse(document.content, content_type="application/json")
+    response["ETag"] = document.etag
+    return response
+
+
+def _json_response(data, status):
+    with timed("render"):
+        content = JSONRenderer().render(data)
+    return HttpResponse(content, status=status, content_type="application/json")
+
+
+class AsyncView(View):
+    """
+    Plain Django async view, used where DRF (which has no async views) would
+    block a worker thread while waiting on the database.
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        return csrf_exempt(super().as_view(**initkwargs))
+
+
+class AsyncExamSubmissionCreateView(AsyncView):
+    """
+    Async version of `ExamSubmissionCreateView`, served instead of it when
+    SUBMISSION_ASYNC_VIEWS is on. It accepts JSON bodies only and answers with
+    the same validation rules and errors; the lookups use the async ORM and
+    only the transactional write runs in a thread. In queued mode, it queues
+    the submission in a thread like the sync view does.
+    """
+
+    query_budget = 15
+
+    async def post(self, request, student_id, exam_id):
+        if request.body and request.content_type != "application/json":
+            return _json_response(
+                {
+                    "detail": "Unsupported media type "
+                    f'"{request.META.get("CONTENT_TYPE", "")}" in request.'
+                },
+                status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            )
+        try:
+            data = json.loads(request.body) if request.body else {}
+        except ValueError as exc:
+            return _json_response(
+                {"detail": f"JSON parse error - {exc}"}, status.HTTP_400_BAD_REQUEST
+            )
+        if settings.SUBMISSION_QUEUE_ENABLED:
+            return await sync_to_async(self.queue)(data, student_id, exam_id)
+
+        answer_key = await aget_answer_key(exam_id)
+        answers = data.get("answers") if isinstance(data, dict) else None
+        context = {
+            "answer_key": answer_key,
+            "preloaded_answers": (
+                await apreload_answers(answers, answer_key)
+                if isinstance(answers, list)
+                else None
+            ),
+            "submission_state": await aget_submission_state(student_id, exam_id),
+        }
+        serializer = PrecheckedExamSubmissionSerializer(data=data, context=context)
+        try:
+            if not serializer.is_valid():
+                return _json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        except Http404 as exc:
+            return _json_response({"detail": str(exc)}, status.HTTP_404_NOT_FOUND)
+
+        answers = serializer.validated_data["answers"]
+        submission = build_submission(student_id, answers, answer_key)
+        await sync_to_async(save_submissions)([(submission, answers)])
+        return _json_response(
+            {"answers": AnswerSerializer(answers, many=True).data},
+            status.HTTP_201_CREATED,
+        )
+
+    @staticmethod
+    def queue(data, student_id, exam_id):
+        serializer = QueuedSubmissionSerializer(data=data)
+        if not serializer.is_valid():
+            return _json_response(serializer.errors, status.HTTP_400_BAD_REQUEST)
+        serializer.save(student_id=student_id, exam_id=exam_id)
+        response = _json_response(serializer.data, status.HTTP_202_ACCEPTED)
+        response["Location"] = serializer.data["status_url"]
+        return response
+
+
+class AsyncExamResultView(AsyncView):
+    """
+    Async version of `ExamResultView`, served instead of it when
+    SUBMISSION_ASYNC_VIEWS is on.
+    """
+
+    query_budget = 8
+
+    async def get(self, request, student_id, exam_id):
+        document = await aget_result_document(student_id, exam_id)
+        if document is None:
+            return _json_response({"detail": "Not found."}, status.HTTP_404_NOT_FOUND)
+        return _result_response(request, document)
+
+
+class ExamResultsReportView(generics.GenericAPIView):
+    query_budget = 2
+
+    def get(self, request, *args, **kwargs):
+        exam_id = self.kwargs.get("exam_id")
+        output_format = request.query_params.get("output", "csv")
+        if output_format not in REPORT_CONTENT_TYPES:
+            raise serializers.ValidationError(
+                {"output": f"Choose one of: {', '.join(REPORT_CONTENT_TYPES)}."}
+            )
+        exam = generics.get_object_or_404(Exam.objects.only("id"), id=exam_id)
+
+        response = StreamingHttpResponse(
+            stream_exam_results(exam.id, output_format),
+            content_type=REPORT_CONTENT_TYPES[output_format],
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="exam-{exam.id}-results.{output_format}"'
+        )
+        return response
+
+
+class ExamItemAnalysisView(generics.GenericAPIView):
+    query_budget = 6
+
+    def get(self, request, *args, **kwargs):
+        exam_id = self.kwargs.get("exam_id")
+        exam = generics.get_object_or_404(Exam.objects.only("id"), id=exam_id)
+        return Response({"exam": exam.id, **get_item_statistics(exam.id).summary()})
+
+
+class ExamLeaderboardView(generics.GenericAPIView):
+    max_limit = 100
+    query_budget = 4
+
+    def get(self, request, *args, **kwargs):
         exam_id = self.kwargs.get("exam_id")
-        student = generics.get_object_or_404(Student, id=student_id)
-        exam = generics.get_object_or_404(Exam, id=exam_id)
-        return generics.get_object_or_404(queryset, student=student, exam=exam)
+        try:
+            limit = int(request.query_params.get("limit", 10))
+        except ValueError:
+            raise serializers.ValidationError(
+                {"limit": "A valid integer is required."}
+            ) from None
+        if not 0 < limit <= self.max_limit:
+            raise serializers.ValidationError(
+                {"limit": f"Ensure this value is between 1 and {self.max_limit}."}
+            )
+        exam = generics.get_object_or_404(Exam.objects.only("id"), id=exam_id)
+        return Response({"exam": exam.id, "results": get_leaderboard(exam.id, limit)})
@@ -0,0 +1,135 @@
+from django import forms
+from django.contrib import admin
+from django.contrib.admin import helpers, widgets
+from django.core.exceptions import ValidationError
+from django.core.paginator import Paginator
+from django.db import connections
+from django.db.models import CharField, Q
+from django.db.models.functions import Substr
+from django.urls import NoReverseMatch, reverse
+from django.utils.functional import cached_property
+from django.utils.html import format_html
+from django.utils.text import capfirst
+from django.utils.translation import gettext as _
+
+PREVIEW_LENGTH = 80
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that counts an unfiltered table with the planner's estimate
+    from pg_class instead of a COUNT(*), which reads the whole table.
+
+    Tables smaller than `exact_count_below` rows, and filtered querysets
+    (searches, list filters), still get an exact count.
+    """
+
+    exact_count_below = 10_000
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        if not queryset.query.where:
+            with connections[queryset.db].cursor() as cursor:
+                cursor.execute(
+                    "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+                (estimate,) = cursor.fetchone()
+            if estimate >= self.exact_count_below:
+                return estimate
+        return super().count
+
+
+def preview_expression(field_name, length=PREVIEW_LENGTH):
+    """
+    The first `length` characters of a text field, cut by the database so
+    change lists never load whole texts.
+    """
+    return Substr(field_name, 1, length + 1, output_field=CharField())
+
+
+def truncate(text, length=PREVIEW_LENGTH):
+    return text if len(text) <= length else f"{text[:length]}…"
+
+
+class LinkOnlyRawIdWidget(widgets.ForeignKeyRawIdWidget):
+    """
+    Raw id widget that links to the related object without loading it: the
+    default one reads it for its label, which is one query per row in inlines.
+    """
+
+    def label_and_url_for_value(self, value):
+        opts = self.rel.model._meta
+        try:
+            url = reverse(
+                f"{self.admin_site.name}:{opts.app_label}_{opts.model_name}_change",
+                args=(value,),
+            )
+        except NoReverseMatch:
+            url = ""
+        return f"{capfirst(opts.verbose_name)} {value}", url
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    """
+    ModelAdmin for tables with millions of rows.
+
+    Change lists are counted with `EstimatedCountPaginator` and skip the
+    second, unfiltered count, and searches only use exact lookups on the
+    `search_fields`, which must all be indexed (unlike the default
+    "icontains", which scans the table). Search terms that aren't valid for
+    a field (e.g. text for an id) are skipped for it.
+
+    With a `preview_field`, that text field is left out of the queries and
+    only its first characters are loaded, for the "preview" column and the
+    row labels, which would otherwise show the whole text through __str__.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+    preview_field = None
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.preview_field is None:
+            return queryset
+        return queryset.annotate(
+            preview_text=preview_expression(self.preview_field)
+        ).defer(self.preview_field)
+
+    @admin.display(description="preview")
+    def preview(self, obj):
+        return truncate(obj.preview_text)
+
+    def action_checkbox(self, obj):
+        if self.preview_field is None:
+            return super().action_checkbox(obj)
+        attrs = {
+            "class": "action-select",
+            "aria-label": format_html(
+                _("Select this object for an action - {}"), self.preview(obj)
+            ),
+        }
+        checkbox = forms.CheckboxInput(attrs, lambda value: False)
+        return checkbox.render(helpers.ACTION_CHECKBOX_NAME, str(obj.pk))
+
+    def get_search_results(self, request, queryset, search_term):
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+
+        condition = Q()
+        opts = queryset.model._meta
+        for field_path in self.get_search_fields(request):
+            field = opts.get_field(field_path.split("__")[0])
+            for name in field_path.split("__")[1:]:
+                field = field.related_model._meta.get_field(name)
+            try:
+                value = field.to_python(search_term)
+            except ValidationError:
+                continue
+            condition |= Q(**{field_path: value})
+        if not condition:
+            return queryset.none(), False
+        return queryset.filter(condition), False
@@ -0,0 +1,12 @@
+from django.apps import AppConfig
+from django.db.backends.signals import connection_created
+
+
+class UtilsConfig(AppConfig):
+    default_auto_field = "django.db.models.BigAutoField"
+    name = "utils"
+
+    def ready(self):
+        from utils.metrics import install_query_recorder
+
+        connection_created.connect(install_query_recorder)
@@ -0,0 +1,284 @@
+import time
+from contextlib import nullcontext
+from datetime import timedelta
+
+import numpy as np
+from django.core.management import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.utils import timezone
+
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from question.utils import AlternativesChoices
+from student.models import Student
+from submission.leaderboard import rebuild_histograms
+from submission.models import Answer, ExamSubmission
+from utils.pgcopy import (
+    copy_arrays,
+    copy_rows,
+    dropped_foreign_keys_and_indexes,
+    reserve_ids,
+)
+
+WORDS = (
+    "paciente anos dor febre tosse exame sangue pressão tratamento diagnóstico "
+    "conduta quadro clínico agudo crônico abdominal torácica cefaleia dispneia "
+    "hipertensão diabetes infecção antibiótico cirurgia emergência gestante "
+    "criança idoso internação sintomas história familiar laboratorial imagem "
+    "tomografia radiografia ultrassom hemograma glicemia creatinina função renal "
+    "hepática cardíaca pulmonar neurológico vacina prevenção rastreamento"
+).split()
+
+
+class Command(BaseCommand):
+    """
+    Command that fills the database with synthetic students, exams and
+    submissions, for load tests and index tuning.
+
+    Rows are generated with numpy and streamed with Postgres COPY in batches
+    of "--batch-size" rows; the same "--seed" always generates the same data.
+    Each exam gets its own questions, and every student submits each exam
+    with a chance of "--submission-rate", answering right according to a
+    personal skill so scores spread like in a real exam. With
+    "--drop-constraints", the foreign keys and non-unique indexes of the
+    submissions and answers tables are dropped during the load and created
+    again at the end, which is several times faster for large loads; the
+    whole load then runs in a single transaction, so the tables keep their
+    constraints if it fails or is interrupted.
+
+    You can call it by terminal like this:
+    -> "python manage.py generate_data"
+    -> "python manage.py generate_data --students 200000 --exams 20 --questions 100"
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=10000)
+        parser.add_argument("--exams", type=int, default=10)
+        parser.add_argument("--questions", type=int, default=50, help="Per exam.")
+        parser.add_argument(
+            "--alternatives",
+            type=int,
+            default=len(AlternativesChoices),
+            choices=range(2, len(AlternativesChoices) + 1),
+        )
+        parser.add_argument("--submission-rate", type=float, default=0.8)
+        parser.add_argument("--batch-size", type=int, default=100_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--drop-constraints",
+            action="store_true",
+            help="Drop the foreign keys and indexes of the answers and "
+            "submissions tables during the load, in a single transaction.",
+        )
+
+    def handle(self, *args, **options):
+        if not 0 <= options["submission_rate"] <= 1:
+            raise CommandError("--submission-rate must be between 0 and 1.")
+        if min(options["students"], options["questions"], options["batch_size"]) < 1:
+            raise CommandError("--students, --questions and --batch-size must be >= 1.")
+
+        self.rng = np.random.default_rng(options["seed"])
+        self.batch_size = options["batch_size"]
+        self.now = timezone.now()
+        self.totals = dict.fromkeys(["submissions", "answers"], 0)
+        started = time.perf_counter()
+
+        with connection.cursor() as cursor:
+            with transaction.atomic():
+                student_ids = self.generate_students(cursor, options["students"])
+            exam_ids = []
+            with (
+                dropped_foreign_keys_and_indexes(cursor, [ExamSubmission, Answer])
+                if options["drop_constraints"]
+                else nullcontext()
+            ):
+                for _ in range(options["exams"]):
+                    with transaction.atomic():
+                        exam_ids.append(
+                            self.generate_exam(
+                                cursor,
+                                student_ids,
+                                options["questions"],
+                                options["alternatives"],
+                                options["submission_rate"],
+                            )
+                        )
+            rebuild_histograms(exam_ids)
+            for model in (
+                Student,
+                Question,
+                Alternative,
+                ExamQuestion,
+                ExamSubmission,
+                Answer,
+            ):
+                cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Generated {len(student_ids)} students, {len(exam_ids)} exams, "
+                f"{self.totals['submissions']} submissions and "
+                f"{self.totals['answers']} answers in "
+                f"{time.perf_counter() - started:.1f}s."
+            )
+        )
+
+    def sentences(self, count, words):
+        indexes = self.rng.integers(len(WORDS), size=(count, words))
+        return (" ".join(WORDS[index] for index in row).capitalize() for row in indexes)
+
+    def generate_students(self, cursor, count):
+        ids = reserve_ids(cursor, Student, count)
+        copy_rows(
+            cursor,
+            Student._meta.db_table,
+            [
+                "id",
+                "password",
+                "is_superuser",
+                "username",
+                "first_name",
+                "last_name",
+                "email",
+                "is_staff",
+                "is_active",
+                "date_joined",
+                "name",
+            ],
+            (
+                (
+                    student_id,
+                    "!",
+                    False,
+                    f"generated-{student_id}",
+                    "",
+                    "",
+                    f"generated-{student_id}@example.com",
+                    False,
+                    True,
+                    self.now,
+                    f"Generated student {student_id}",
+                )
+                for student_id in ids
+            ),
+            self.batch_size,
+        )
+        return np.arange(ids.start, ids.stop, dtype=np.int64)
+
+    def generate_exam(
+        self, cursor, student_ids, questions, alternatives, submission_rate
+    ):
+        (exam_id,) = reserve_ids(cursor, Exam, 1)
+        Exam.objects.create(id=exam_id, name=f"Generated exam {exam_id}")
+
+        question_ids = reserve_ids(cursor, Question, questions)
+        copy_rows(
+            cursor,
+            Question._meta.db_table,
+            ["id", "content"],
+            zip(question_ids, (f"{s}?" for s in self.sentences(questions, 20))),
+            self.batch_size,
+        )
+        copy_arrays(
+            cursor,
+            ExamQuestion._meta.db_table,
+            ["exam_id", "question_id", "number"],
+            [
+                np.full(questions, exam_id, dtype=np.int64),
+                np.arange(question_ids.start, question_ids.stop, dtype=np.int64),
+                np.arange(1, questions + 1, dtype=np.int32),
+            ],
+        )
+
+        # Alternatives get consecutive ids, `alternatives` per question in
+        # order, so the id of any choice is computed from its position.
+        alternative_ids = reserve_ids(cursor, Alternative, questions * alternatives)
+        correct = self.rng.integers(alternatives, size=questions)
+        copy_rows(
+            cursor,
+            Alternative._meta.db_table,
+            ["id", "question_id", "content", "option", "is_correct"],
+            (
+                (
+                    alternative_ids[index],
+                    question_ids[index // alternatives],
+                    content,
+                    index % alternatives + 1,
+                    bool(correct[index // alternatives] == index % alternatives),
+                )
+                for index, content in enumerate(
+                    self.sentences(questions * alternatives, 5)
+                )
+            ),
+            self.batch_size,
+        )
+
+        participants = student_ids[self.rng.random(len(student_ids)) < submission_rate]
+        submission_ids = reserve_ids(cursor, ExamSubmission, len(participants))
+        skills = self.rng.beta(5, 2, size=len(participants))
+        first_alternatives = (
+            alternative_ids.start + np.arange(questions, dtype=np.int64) * alternatives
+        )
+        students_per_batch = max(1, self.batch_size // questions)
+        for start in range(0, len(participants), students_per_batch):
+            stop = min(start + students_per_batch, len(participants))
+            count = stop - start
+            right = self.rng.random((count, questions)) < skills[start:stop, None]
+            wrong = (
+                correct + self.rng.integers(1, alternatives, (count, questions))
+            ) % (alternatives)
+            chosen = first_alternatives + np.where(right, correct, wrong)
+            total_correct = right.sum(axis=1)
+            seconds_ago = self.rng.integers(30 * 24 * 60 * 60, size=count)
+
+            copy_rows(
+                cursor,
+                ExamSubmission._meta.db_table,
+                [
+                    "id",
+                    "student_id",
+                    "exam_id",
+                    "submission_time",
+                    "total_correct",
+                    "total_questions",
+                    "percentage_score",
+                ],
+                (
+                    (
+                        submission_ids[start + row],
+                        participants[start + row],
+                        exam_id,
+                        self.now - timedelta(seconds=int(seconds_ago[row])),
+                        total_correct[row],
+                        questions,
+                        total_correct[row] / questions * 100,
+                    )
+                    for row in range(count)
+                ),
+                self.batch_size,
+            )
+            copy_arrays(
+                cursor,
+                Answer._meta.db_table,
+                ["submission_id", "question_id", "selected_alternative_id"],
+                [
+                    np.repeat(
+                        np.arange(
+                            submission_ids[start],
+                            submission_ids[start] + count,
+                            dtype=np.int64,
+                        ),
+                        questions,
+                    ),
+                    np.tile(
+                        np.arange(
+                            question_ids.start, question_ids.stop, dtype=np.int64
+                        ),
+                        count,
+                    ),
+                    chosen.ravel(),
+                ],
+            )
+            self.totals["submissions"] += count
+            self.totals["answers"] += count * questions
+        return exam_id
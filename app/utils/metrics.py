@@ -0,0 +1,223 @@
+import threading
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+
+REQUEST_STAGES = ("db", "serializer", "render")
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+current_request_metrics = ContextVar("current_request_metrics", default=None)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class RequestMetrics:
+    """
+    What a single request spent: its query count and the seconds spent in
+    the database, in serializers (validation and representation, including
+    the queries they make) and rendering the response.
+    """
+
+    def __init__(self):
+        self.started = perf_counter()
+        self.queries = 0
+        self.durations = dict.fromkeys(REQUEST_STAGES, 0.0)
+        self._active_stages = set()
+
+    def add(self, stage, seconds):
+        self.durations[stage] += seconds
+
+    def elapsed(self):
+        return perf_counter() - self.started
+
+
+@contextmanager
+def timed(stage):
+    """
+    Add the time spent in the block to a stage of the current request.
+
+    Nested blocks of the same stage (e.g. a serializer used by another one)
+    are only counted once.
+    """
+    metrics = current_request_metrics.get()
+    if metrics is None or stage in metrics._active_stages:
+        yield
+        return
+
+    metrics._active_stages.add(stage)
+    start = perf_counter()
+    try:
+        yield
+    finally:
+        metrics._active_stages.discard(stage)
+        metrics.add(stage, perf_counter() - start)
+
+
+class QueryRecorder:
+    """
+    Database execute wrapper counting the queries of the current request.
+
+    It is installed once on every connection (see `UtilsConfig.ready`), so it
+    sees the queries made from any thread the request runs code in, including
+    the ones `sync_to_async` uses for async views.
+    """
+
+    def __call__(self, execute, sql, params, many, context):
+        metrics = current_request_metrics.get()
+        if metrics is None:
+            return execute(sql, params, many, context)
+
+        start = perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            metrics.queries += 1
+            metrics.add("db", perf_counter() - start)
+
+
+def install_query_recorder(sender, connection, **kwargs):
+    if not any(isinstance(w, QueryRecorder) for w in connection.execute_wrappers):
+        connection.execute_wrappers.append(QueryRecorder())
+
+
+class TimedSerializerMixin:
+    """
+    Serializer mixin adding the time spent validating and representing data
+    to the "serializer" stage of the current request.
+    """
+
+    def is_valid(self, *args, **kwargs):
+        with timed("serializer"):
+            return super().is_valid(*args, **kwargs)
+
+    @property
+    def data(self):
+        with timed("serializer"):
+            return super().data
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+
+    def samples(self):
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            yield f"{bound:g}", cumulative
+        yield "+Inf", self.count
+
+
+class MetricsRegistry:
+    """
+    In-process request metrics, labelled by view and exposed in the
+    Prometheus text format. Each server process keeps its own.
+    """
+
+    histograms = {
+        "request_duration_seconds": (
+            "Time taken to answer a request.",
+            DURATION_BUCKETS,
+        ),
+        "request_db_queries": (
+            "SQL queries run by a request.",
+            QUERY_COUNT_BUCKETS,
+        ),
+        "request_db_duration_seconds": (
+            "Time a request spent in the database.",
+            DURATION_BUCKETS,
+        ),
+        "request_serializer_duration_seconds": (
+            "Time a request spent validating and serializing data.",
+            DURATION_BUCKETS,
+        ),
+        "request_render_duration_seconds": (
+            "Time a request spent rendering its response.",
+            DURATION_BUCKETS,
+        ),
+    }
+
+    def __init__(self, prefix="medway"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._requests = defaultdict(int)
+            self._budget_exceeded = defaultdict(int)
+            self._histograms = {
+                name: defaultdict(lambda buckets=buckets: Histogram(buckets))
+                for name, (_, buckets) in self.histograms.items()
+            }
+
+    def record(self, view, method, status_code, metrics, over_budget=False):
+        observations = {
+            "request_duration_seconds": metrics.elapsed(),
+            "request_db_queries": metrics.queries,
+            "request_db_duration_seconds": metrics.durations["db"],
+            "request_serializer_duration_seconds": metrics.durations["serializer"],
+            "request_render_duration_seconds": metrics.durations["render"],
+        }
+        with self._lock:
+            self._requests[view, method, str(status_code)] += 1
+            if over_budget:
+                self._budget_exceeded[view] += 1
+            for name, value in observations.items():
+                self._histograms[name][view].observe(value)
+
+    def render(self):
+        lines = []
+        with self._lock:
+            name = f"{self.prefix}_requests_total"
+            lines += [f"# HELP {name} Requests answered.", f"# TYPE {name} counter"]
+            for (view, method, status_code), count in sorted(self._requests.items()):
+                labels = _labels(view=view, method=method, status=status_code)
+                lines.append(f"{name}{{{labels}}} {count}")
+
+            name = f"{self.prefix}_request_query_budget_exceeded_total"
+            lines += [
+                f"# HELP {name} Requests that ran more queries than their budget.",
+                f"# TYPE {name} counter",
+            ]
+            for view, count in sorted(self._budget_exceeded.items()):
+                lines.append(f"{name}{{{_labels(view=view)}}} {count}")
+
+            for short_name, (description, _) in self.histograms.items():
+                name = f"{self.prefix}_{short_name}"
+                lines += [f"# HELP {name} {description}", f"# TYPE {name} histogram"]
+                for view, histogram in sorted(self._histograms[short_name].items()):
+                    for bound, count in histogram.samples():
+                        labels = _labels(view=view, le=bound)
+                        lines.append(f"{name}_bucket{{{labels}}} {count}")
+                    labels = _labels(view=view)
+                    lines.append(f"{name}_sum{{{labels}}} {histogram.sum:g}")
+                    lines.append(f"{name}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _labels(**labels):
+    return ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items())
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
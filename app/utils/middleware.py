@@ -0,0 +1,98 @@
+import logging
+from time import perf_counter
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from utils.metrics import (
+    QueryBudgetExceeded,
+    RequestMetrics,
+    current_request_metrics,
+    registry,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RequestMetricsMiddleware:
+    """
+    Record the query count and the time spent in the database, serializers
+    and rendering of every request, per view, for the /metrics endpoint.
+
+    Views may set a `query_budget`: requests running more queries than that
+    are logged, or raise `QueryBudgetExceeded` (meant for tests), depending
+    on REQUEST_METRICS_QUERY_BUDGET_MODE. With REQUEST_METRICS_HEADERS on,
+    the numbers are also sent in `Server-Timing` and `X-Query-Count` headers.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.REQUEST_METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        try:
+            response = self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    async def __acall__(self, request):
+        metrics = RequestMetrics()
+        token = current_request_metrics.set(metrics)
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_request_metrics.reset(token)
+        return self.finish(request, response, metrics)
+
+    def process_template_response(self, request, response):
+        # DRF responses are rendered after the view returns, right after this.
+        metrics = current_request_metrics.get()
+        if metrics is not None:
+            start = perf_counter()
+            response.add_post_render_callback(
+                lambda rendered: metrics.add("render", perf_counter() - start)
+            )
+        return response
+
+    def finish(self, request, response, metrics):
+        match = request.resolver_match
+        view = match.view_name if match else "unmatched"
+        view_class = getattr(match.func, "view_class", None) if match else None
+        budget = getattr(view_class, "query_budget", None)
+        over_budget = budget is not None and metrics.queries > budget
+
+        registry.record(
+            view, request.method, response.status_code, metrics, over_budget
+        )
+        if settings.REQUEST_METRICS_HEADERS:
+            response["X-Query-Count"] = str(metrics.queries)
+            response["Server-Timing"] = ", ".join(
+                f"{stage};dur={seconds * 1000:.2f}"
+                for stage, seconds in [
+                    *metrics.durations.items(),
+                    ("total", metrics.elapsed()),
+                ]
+            )
+
+        if over_budget:
+            message = (
+                f"{request.method} {request.path} ({view}) ran {metrics.queries} "
+                f"queries, over its budget of {budget}."
+            )
+            if settings.REQUEST_METRICS_QUERY_BUDGET_MODE == "raise":
+                raise QueryBudgetExceeded(message)
+            if settings.REQUEST_METRICS_QUERY_BUDGET_MODE == "log":
+                logger.warning(message)
+        return response
@@ -0,0 +1,96 @@
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Field, Func, Value
+from django.db.models.lookups import GreaterThan, LessThan
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+
+class Row(Func):
+    function = "ROW"
+    output_field = Field()
+
+
+class KeysetPagination(BasePagination):
+    """
+    Pagination on the position of the last item of the previous page.
+
+    The view's `ordering` must be unique (end it with the primary key) and go
+    in a single direction, e.g. ("-submission_time", "-id"). Pages are
+    selected with a row comparison on those fields, `(a, b) < (x, y)`, so
+    with an index in the same order every page costs the same as the first:
+    there is no OFFSET to skip and no COUNT(*) of the whole result.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+    # Defaults to the PAGE_SIZE setting.
+    page_size = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.fields = [
+            queryset.model._meta.get_field(name.lstrip("-")) for name in view.ordering
+        ]
+        queryset = queryset.order_by(*view.ordering)
+
+        position = self.decode_cursor(request)
+        if position is not None:
+            lookup = LessThan if view.ordering[0].startswith("-") else GreaterThan
+            queryset = queryset.filter(
+                lookup(
+                    Row(*(F(field.attname) for field in self.fields)),
+                    Row(*map(Value, position)),
+                )
+            )
+
+        page_size = self.page_size or api_settings.PAGE_SIZE
+        page = list(queryset[: page_size + 1])
+        self.has_next = len(page) > page_size
+        self.page = page[:page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = [field.value_to_string(self.page[-1]) for field in self.fields]
+        cursor = base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_previous_link(self):
+        return None
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(position, list) or len(position) != len(self.fields):
+                raise ValueError
+            return [
+                field.to_python(value) for field, value in zip(self.fields, position)
+            ]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "The pagination cursor value.",
+                "schema": {"type": "string"},
+            }
+        ]
@@ -0,0 +1,139 @@
+import datetime
+import io
+import struct
+from contextlib import contextmanager
+
+import numpy as np
+from django.db import connection, transaction
+
+COPY_BINARY_HEADER = b"PGCOPY\n\xff\r\n\x00" + struct.pack(">ii", 0, 0)
+COPY_BINARY_TRAILER = struct.pack(">h", -1)
+
+
+def reserve_ids(cursor, model, count):
+    """
+    Take `count` consecutive primary keys from the model's sequence, so rows
+    loaded with COPY can reference each other before they are inserted.
+    """
+    if count == 0:
+        return range(0)
+    table = model._meta.db_table
+    cursor.execute(
+        "SELECT setval(pg_get_serial_sequence(%s, 'id'), "
+        "nextval(pg_get_serial_sequence(%s, 'id')) + %s - 1)",
+        [table, table, count],
+    )
+    (last_id,) = cursor.fetchone()
+    return range(last_id - count + 1, last_id + 1)
+
+
+@contextmanager
+def dropped_foreign_keys_and_indexes(cursor, models):
+    """
+    Drop the foreign keys and non-unique indexes of the models' tables during
+    the block, and create them again after it.
+
+    Postgres validates a new foreign key and builds an index over a whole
+    table much faster than it checks and indexes rows one by one while COPY
+    inserts them. The drop, the block and the re-creation run in a single
+    transaction, so if the block fails or the process dies, the DDL is rolled
+    back with the loaded rows and the tables keep their constraints. Unique
+    indexes stay, and the tables are locked until the block is over, so only
+    use it for bulk loads into a local database.
+    """
+    quote_name = connection.ops.quote_name
+    tables = [model._meta.db_table for model in models]
+    with transaction.atomic():
+        cursor.execute(
+            "SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid) "
+            "FROM pg_constraint "
+            "WHERE contype = 'f' AND conrelid::regclass::text = ANY(%s)",
+            [tables],
+        )
+        foreign_keys = cursor.fetchall()
+        cursor.execute(
+            "SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid) "
+            "FROM pg_index WHERE NOT indisunique AND indrelid::regclass::text = ANY(%s)",
+            [tables],
+        )
+        indexes = cursor.fetchall()
+
+        for table, name, _ in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {quote_name(table)} DROP CONSTRAINT {quote_name(name)}"
+            )
+        for name, _ in indexes:
+            cursor.execute(f"DROP INDEX {quote_name(name)}")
+
+        yield
+
+        for _, definition in indexes:
+            cursor.execute(definition)
+        for table, name, definition in foreign_keys:
+            cursor.execute(
+                f"ALTER TABLE {quote_name(table)} "
+                f"ADD CONSTRAINT {quote_name(name)} {definition}"
+            )
+
+
+def copy_rows(cursor, table, columns, rows, batch_size):
+    """Load tuples into a table with COPY in text format, `batch_size` at a time."""
+    buffer = io.StringIO()
+    pending = 0
+    for row in rows:
+        buffer.write("\t".join(map(_text_value, row)) + "\n")
+        pending += 1
+        if pending == batch_size:
+            _copy(cursor, table, columns, "text", buffer)
+            buffer = io.StringIO()
+            pending = 0
+    if pending:
+        _copy(cursor, table, columns, "text", buffer)
+
+
+def copy_arrays(cursor, table, columns, arrays):
+    """
+    Load numeric columns, given as numpy arrays of the same length, with COPY
+    in binary format. Each array's item size must match its column type
+    (8 bytes for bigint, 4 for integer, 1 for boolean).
+    """
+    dtype = [("fields", ">i2")]
+    for index, values in enumerate(arrays):
+        dtype += [
+            (f"size{index}", ">i4"),
+            (f"value{index}", values.dtype.newbyteorder(">")),
+        ]
+    rows = np.empty(len(arrays[0]), dtype=dtype)
+    rows["fields"] = len(arrays)
+    for index, values in enumerate(arrays):
+        rows[f"size{index}"] = values.dtype.itemsize
+        rows[f"value{index}"] = values
+
+    buffer = io.BytesIO(COPY_BINARY_HEADER + rows.tobytes() + COPY_BINARY_TRAILER)
+    _copy(cursor, table, columns, "binary", buffer)
+
+
+def _copy(cursor, table, columns, copy_format, buffer):
+    buffer.seek(0)
+    quote_name = connection.ops.quote_name
+    cursor.copy_expert(
+        f"COPY {quote_name(table)} ({', '.join(map(quote_name, columns))}) "
+        f"FROM STDIN WITH (FORMAT {copy_format})",
+        buffer,
+    )
+
+
+def _text_value(value):
+    if value is None:
+        return "\\N"
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    return (
+        str(value)
+        .replace("\\", "\\\\")
+        .replace("\t", "\\t")
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
@@ -0,0 +1,84 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from exam.models import Exam, ExamQuestion
+from question.models import Question
+from student.models import Student
+from utils.admin import EstimatedCountPaginator
+
+
+@pytest.fixture
+def admin_client(client, db):
+    admin = Student.objects.create_superuser(
+        username="admin", email="admin@x.io", password="admin"
+    )
+    client.force_login(admin)
+    return client
+
+
+def test_large_tables_are_counted_with_the_estimate(admin_client, monkeypatch):
+    monkeypatch.setattr(EstimatedCountPaginator, "exact_count_below", 0)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE student_student")
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(reverse("admin:student_student_changelist"))
+    assert response.status_code == 200
+    assert not [q for q in queries if "COUNT(*)" in q["sql"]]
+    assert any("pg_class" in q["sql"] for q in queries)
+
+    # Searches are filtered, so they are counted exactly.
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(
+            reverse("admin:student_student_changelist"), {"q": "admin@x.io"}
+        )
+    assert [q for q in queries if "COUNT(*)" in q["sql"]]
+    assert response.context["cl"].result_count == 1
+
+
+def test_search_uses_exact_lookups(admin_client):
+    exam = Exam.objects.create(name="Exact search")
+    url = reverse("admin:exam_exam_changelist")
+
+    response = admin_client.get(url, {"q": str(exam.id)})
+    assert [obj.id for obj in response.context["cl"].result_list] == [exam.id]
+
+    # Text isn't a valid id, so nothing matches without touching the table.
+    response = admin_client.get(url, {"q": "Exact search"})
+    assert list(response.context["cl"].result_list) == []
+
+
+def test_question_list_loads_only_a_preview(admin_client):
+    question = Question.objects.create(content="Long question " * 100)
+
+    with CaptureQueriesContext(connection) as queries:
+        response = admin_client.get(reverse("admin:question_question_changelist"))
+    assert response.status_code == 200
+    column = '"question_question"."content"'
+    for query in queries:
+        assert query["sql"].count(column) == query["sql"].count(f"SUBSTRING({column}")
+    assert ("Long question " * 100)[:80] + "…" in response.content.decode()
+    assert question.content not in response.content.decode()
+
+
+def test_exam_change_page_queries_do_not_grow_with_its_questions(admin_client):
+    def change_page_queries(questions):
+        exam = Exam.objects.create(name=f"{questions} questions")
+        for number in range(1, questions + 1):
+            question = Question.objects.create(content=f"Question {number}")
+            ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        url = reverse("admin:exam_exam_change", args=(exam.id,))
+        with CaptureQueriesContext(connection) as queries:
+            response = admin_client.get(url)
+        assert response.status_code == 200
+        return len(queries), response.content.decode()
+
+    # The first request also caches the content types.
+    change_page_queries(1)
+    queries, _ = change_page_queries(2)
+    more_queries, content = change_page_queries(20)
+    assert more_queries == queries
+    question = Question.objects.get(content="Question 20")
+    url = reverse("admin:question_question_change", args=(question.id,))
+    assert f'<a href="{url}">Question {question.id}</a>' in content
@@ -0,0 +1,170 @@
+import logging
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.core.cache import cache
+from django.db import connection
+from django.test import AsyncClient, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative, Question
+from student.models import Student
+from submission.views import ExamLeaderboardView
+from utils.metrics import QueryBudgetExceeded, registry
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+@pytest.fixture(autouse=True)
+def clean_registry():
+    registry.reset()
+
+
+@pytest.fixture
+def student(db):
+    return Student.objects.create(username="student", email="student@x.io")
+
+
+@pytest.fixture
+def exam(db):
+    exam = Exam.objects.create(name="Test Exam")
+    for number in (1, 2):
+        question = Question.objects.create(content=f"Question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        for option in (1, 2):
+            Alternative.objects.create(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=(option == 1),
+            )
+    cache.clear()
+    return exam
+
+
+def _answers(exam):
+    return [
+        {
+            "question": exam_question.question_id,
+            "selected_alternative": Alternative.objects.get(
+                question_id=exam_question.question_id, option=1
+            ).id,
+        }
+        for exam_question in ExamQuestion.objects.filter(exam=exam)
+    ]
+
+
+def _submit(api_client, student, exam, answers=None):
+    url = reverse(
+        "create-submission", kwargs={"student_id": student.id, "exam_id": exam.id}
+    )
+    answers = _answers(exam) if answers is None else answers
+    return api_client.post(url, {"answers": answers}, format="json")
+
+
+def _server_timing(response):
+    entries = (entry.split(";dur=") for entry in response["Server-Timing"].split(", "))
+    return {stage: float(duration) for stage, duration in entries}
+
+
+@override_settings(REQUEST_METRICS_HEADERS=True)
+def test_headers_report_queries_and_stage_timings(api_client, student, exam):
+    answers = _answers(exam)
+    with CaptureQueriesContext(connection) as queries:
+        response = _submit(api_client, student, exam, answers)
+
+    assert response.status_code == 201
+    assert int(response["X-Query-Count"]) == len(queries)
+    timings = _server_timing(response)
+    assert set(timings) == {"db", "serializer", "render", "total"}
+    assert 0 < timings["db"] < timings["total"]
+    assert 0 < timings["serializer"] < timings["total"]
+    assert 0 < timings["render"] < timings["total"]
+
+    url = reverse("exam-result", kwargs={"student_id": student.id, "exam_id": exam.id})
+    timings = _server_timing(api_client.get(url))
+    assert timings["serializer"] > 0 and timings["render"] > 0
+
+
+def test_headers_are_off_by_default(api_client, student, exam):
+    response = _submit(api_client, student, exam)
+    assert "X-Query-Count" not in response
+    assert "Server-Timing" not in response
+
+
+def test_metrics_endpoint_exports_per_view_metrics(api_client, student, exam):
+    _submit(api_client, student, exam)
+    _submit(api_client, student, exam)
+
+    response = api_client.get(reverse("metrics"))
+
+    assert response.status_code == 200
+    assert response["Content-Type"].startswith("text/plain; version=0.0.4")
+    lines = response.content.decode().splitlines()
+    assert (
+        'medway_requests_total{view="create-submission",method="POST",status="201"} 1'
+        in lines
+    )
+    assert (
+        'medway_requests_total{view="create-submission",method="POST",status="400"} 1'
+        in lines
+    )
+    assert "# TYPE medway_request_db_queries histogram" in lines
+    assert (
+        'medway_request_db_queries_bucket{view="create-submission",le="+Inf"} 2'
+        in lines
+    )
+    assert 'medway_request_db_queries_count{view="create-submission"} 2' in lines
+    assert any(
+        line.startswith('medway_request_serializer_duration_seconds_sum{view="create')
+        for line in lines
+    )
+
+
+def test_query_budget_raises(api_client, exam, monkeypatch):
+    monkeypatch.setattr(ExamLeaderboardView, "query_budget", 1)
+    url = reverse("exam-leaderboard", kwargs={"exam_id": exam.id})
+
+    with pytest.raises(QueryBudgetExceeded, match="over its budget of 1"):
+        api_client.get(url)
+
+
+@override_settings(REQUEST_METRICS_QUERY_BUDGET_MODE="log")
+def test_query_budget_logs(api_client, exam, monkeypatch, caplog):
+    monkeypatch.setattr(ExamLeaderboardView, "query_budget", 1)
+    url = reverse("exam-leaderboard", kwargs={"exam_id": exam.id})
+
+    with caplog.at_level(logging.WARNING, logger="utils.middleware"):
+        response = api_client.get(url)
+
+    assert response.status_code == 200
+    assert "(exam-leaderboard) ran" in caplog.text
+    lines = api_client.get(reverse("metrics")).content.decode().splitlines()
+    assert (
+        'medway_request_query_budget_exceeded_total{view="exam-leaderboard"} 1' in lines
+    )
+
+
+@override_settings(REQUEST_METRICS_HEADERS=True)
+def test_async_requests_count_queries_made_in_threads(exam):
+    url = reverse("exam-leaderboard", kwargs={"exam_id": exam.id})
+    with CaptureQueriesContext(connection) as queries:
+        response = async_to_sync(AsyncClient().get)(url)
+
+    assert response.status_code == 200
+    assert int(response["X-Query-Count"]) == len(queries) > 0
+
+
+@override_settings(REQUEST_METRICS_ENABLED=False, REQUEST_METRICS_HEADERS=True)
+def test_metrics_can_be_disabled(api_client, student, exam):
+    response = _submit(api_client, student, exam)
+
+    assert "X-Query-Count" not in response
+    assert (
+        "create-submission" not in api_client.get(reverse("metrics")).content.decode()
+    )
@@ -0,0 +1,107 @@
+import io
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connection
+from django.db.models import F, Sum
+from exam.answer_key import get_answer_key
+from exam.models import Exam, ExamQuestion
+from question.models import Alternative
+from student.models import Student
+from submission.models import Answer, ExamScoreHistogram, ExamSubmission
+from utils.management.commands.generate_data import Command
+
+
+def _generate(*args):
+    out = io.StringIO()
+    call_command(
+        "generate_data",
+        "--students=40",
+        "--exams=2",
+        "--questions=6",
+        "--alternatives=4",
+        "--batch-size=7",
+        *args,
+        stdout=out,
+    )
+    return out.getvalue()
+
+
+def _generated_exams():
+    return Exam.objects.filter(name__startswith="Generated exam").order_by("pk")
+
+
+def _scores(exam):
+    return list(exam.submissions.order_by("pk").values_list("total_correct", flat=True))
+
+
+def _contents(exam):
+    return list(exam.questions.order_by("pk").values_list("content", flat=True))
+
+
+def _constraints_and_indexes():
+    with connection.cursor() as cursor:
+        return {
+            table: (connection.introspection.get_constraints(cursor, table))
+            for table in ("submission_answer", "submission_examsubmission")
+        }
+
+
+def test_generate_data(db):
+    constraints = _constraints_and_indexes()
+    output = _generate("--submission-rate=0.5", "--drop-constraints")
+    assert _constraints_and_indexes() == constraints
+
+    submissions = ExamSubmission.objects.count()
+    assert f"Generated 40 students, 2 exams, {submissions} submissions" in output
+    assert 0 < submissions < 80
+    assert Student.objects.filter(username__startswith="generated-").count() == 40
+    exams = _generated_exams()
+    assert exams.count() == 2
+    assert ExamQuestion.objects.filter(exam__in=exams).count() == 12
+    assert (
+        Alternative.objects.filter(question__examquestion__exam__in=exams).count() == 48
+    )
+    assert Answer.objects.count() == submissions * 6
+    for exam in exams:
+        answer_key = get_answer_key(exam.id)
+        assert len(answer_key.question_ids) == 6
+        assert len(answer_key.correct_alternative_ids) == 6
+    assert not Answer.objects.exclude(
+        selected_alternative__question=F("question")
+    ).exists()
+    assert not ExamSubmission.objects.with_outdated_scores().exists()
+    assert (
+        ExamScoreHistogram.objects.aggregate(total=Sum("count"))["total"] == submissions
+    )
+    assert Student.objects.first().has_usable_password() is False
+
+
+def test_generate_data_is_reproducible(db):
+    _generate("--seed=3")
+    first, second = _generated_exams()
+
+    _generate("--seed=3")
+    third, fourth = _generated_exams()[2:]
+    assert _scores(third) == _scores(first)
+    assert _scores(fourth) == _scores(second)
+    assert _contents(third) == _contents(first)
+    assert _contents(fourth) == _contents(second)
+
+
+def test_generate_data_rejects_invalid_rate(db):
+    with pytest.raises(CommandError, match="--submission-rate"):
+        _generate("--submission-rate=2")
+
+
+def test_generate_data_keeps_constraints_when_interrupted(db, monkeypatch):
+    constraints = _constraints_and_indexes()
+
+    def generate_exam(self, cursor, *args):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(Command, "generate_exam", generate_exam)
+    with pytest.raises(KeyboardInterrupt):
+        _generate("--drop-constraints")
+    assert _constraints_and_indexes() == constraints
@@ -0,0 +1,10 @@
+from django.http import HttpResponse
+
+from utils.metrics import registry
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def metrics_view(request):
+    """Request metrics of this process, in the Prometheus text format."""
+    return HttpResponse(registry.render(), content_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,72 @@
+"""
+Compare the API's throughput under the development server and the
+production application servers.
+
+Each server is started in turn, the same way `entrypoint.sh` starts it for
+the matching `APP_SERVER`, and `loadtest.py` is run against it. The
+`POSTGRES_*` variables of the current environment are passed through, and
+the database must already be migrated and hold the exam the URL points to.
+The production servers also need a Redis server at `REDIS_URL` (by default
+redis://127.0.0.1:6379/0).
+
+    python benchmarks/compare_app_servers.py \\
+        --url http://127.0.0.1:8001/exams/1/leaderboard/ --workers 4
+"""
+
+import argparse
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+from harness import load_test, running_server
+
+
+def servers(address, args):
+    gunicorn = [sys.executable, "-m", "gunicorn", "--bind", address]
+    yield "runserver", [
+        sys.executable,
+        "manage.py",
+        "runserver",
+        "--noreload",
+        address,
+    ], {"DJANGO_SETTINGS_MODULE": "medway_api.settings"}
+    yield "gunicorn", gunicorn + ["medway_api.wsgi:application"], {}
+    yield "uvicorn", gunicorn + [
+        "--worker-class",
+        "uvicorn_worker.UvicornWorker",
+        "medway_api.asgi:application",
+    ], {"POSTGRES_CONN_MAX_AGE": "0"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8001/exams/1/leaderboard/")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--threads", type=int, default=1)
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    production = {
+        "DJANGO_SETTINGS_MODULE": "medway_api.settings_production",
+        "DJANGO_SECRET_KEY": os.environ.get("DJANGO_SECRET_KEY", "benchmark"),
+        "DJANGO_ALLOWED_HOSTS": url.hostname,
+        "REDIS_URL": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+        "WEB_CONCURRENCY": str(args.workers),
+        "GUNICORN_THREADS": str(args.threads),
+    }
+    results = []
+    for label, command, environment in servers(f"{url.hostname}:{url.port}", args):
+        with running_server(
+            command, url.hostname, url.port, {**production, **environment}
+        ):
+            results.append(load_test(args.url, label, args.concurrency, args.duration))
+
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
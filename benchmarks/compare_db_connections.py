@@ -0,0 +1,63 @@
+"""
+Compare the API's throughput with and without database connection reuse.
+
+The development server is started once per configuration, with the
+`POSTGRES_*` variables of the current environment plus the ones of that
+configuration, and `loadtest.py` is run against it. The target database must
+already be migrated and hold the exam the URL points to.
+
+    python benchmarks/compare_db_connections.py \\
+        --url http://127.0.0.1:8001/exams/1/leaderboard/
+
+Pass `--pgbouncer-host`/`--pgbouncer-port` to also measure through the
+pgbouncer service of docker-compose.yml.
+"""
+
+import argparse
+import json
+import sys
+from urllib.parse import urlsplit
+
+from harness import load_test, running_server
+
+
+def configurations(args):
+    yield "no reuse", {"POSTGRES_CONN_MAX_AGE": "0"}
+    yield "persistent", {"POSTGRES_CONN_MAX_AGE": "60"}
+    if args.pgbouncer_host:
+        yield "pgbouncer", {
+            "POSTGRES_HOST": args.pgbouncer_host,
+            "POSTGRES_PORT": str(args.pgbouncer_port),
+            "POSTGRES_CONN_MAX_AGE": "60",
+            "POSTGRES_DISABLE_SERVER_SIDE_CURSORS": "1",
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8001/exams/1/leaderboard/")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--pgbouncer-host")
+    parser.add_argument("--pgbouncer-port", type=int, default=6432)
+    args = parser.parse_args()
+
+    url = urlsplit(args.url)
+    command = [
+        sys.executable,
+        "manage.py",
+        "runserver",
+        "--noreload",
+        f"{url.hostname}:{url.port}",
+    ]
+    results = []
+    for label, environment in configurations(args):
+        with running_server(command, url.hostname, url.port, environment):
+            results.append(load_test(args.url, label, args.concurrency, args.duration))
+
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Compare the sync and async submission and result views at high concurrency.
+
+For each server setup, a fresh exam and its students are created in the
+database of the current `POSTGRES_*` environment. Every student then submits
+the exam once, and the results are read back in a loop, both with
+`--concurrency` clients (1000 by default):
+
+- gunicorn: WSGI workers with threads, running the sync DRF views.
+- uvicorn (sync views): ASGI workers running the same sync views.
+- uvicorn (async views): ASGI workers with SUBMISSION_ASYNC_VIEWS on.
+
+    python benchmarks/compare_sync_async.py --students 5000 --workers 2
+
+Each async request holds its own database connection while it waits, so at
+this concurrency Postgres needs a high `max_connections` or the pgbouncer
+service of docker-compose.yml (`--pgbouncer-host`). The servers also need a
+Redis server at `REDIS_URL` (by default redis://127.0.0.1:6379/0).
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+from harness import APP_DIR, load_test, running_server
+
+
+def prepare(students, questions):
+    sys.path.insert(0, str(APP_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "medway_api.settings")
+    import django
+
+    django.setup()
+    from exam.models import Exam, ExamQuestion
+    from question.models import Alternative, Question
+    from student.models import Student
+
+    tag = time.time_ns()
+    exam = Exam.objects.create(name=f"Benchmark {tag}")
+    answers = []
+    for number in range(1, questions + 1):
+        question = Question.objects.create(content=f"Benchmark question {number}")
+        ExamQuestion.objects.create(exam=exam, question=question, number=number)
+        alternatives = Alternative.objects.bulk_create(
+            Alternative(
+                question=question,
+                content=f"Option {option}",
+                option=option,
+                is_correct=option == 1,
+            )
+            for option in range(1, 6)
+        )
+        answers.append(
+            {"question": question.id, "selected_alternative": alternatives[0].id}
+        )
+    student_ids = [
+        student.id
+        for student in Student.objects.bulk_create(
+            Student(username=f"benchmark-{tag}-{n}", email=f"benchmark-{tag}-{n}@x.io")
+            for n in range(students)
+        )
+    ]
+    if student_ids != list(range(student_ids[0], student_ids[0] + students)):
+        raise RuntimeError("The benchmark needs consecutive student ids.")
+    return exam.id, student_ids[0], json.dumps({"answers": answers}).encode()
+
+
+def servers(address, args):
+    gunicorn = [sys.executable, "-m", "gunicorn", "--bind", address]
+    uvicorn = gunicorn + [
+        "--worker-class",
+        "uvicorn_worker.UvicornWorker",
+        "medway_api.asgi:application",
+    ]
+    asgi = {"POSTGRES_CONN_MAX_AGE": "0"}
+    yield "gunicorn", gunicorn + ["medway_api.wsgi:application"], {
+        "GUNICORN_THREADS": str(args.threads)
+    }
+    yield "uvicorn (sync views)", uvicorn, asgi
+    yield "uvicorn (async views)", uvicorn, {**asgi, "SUBMISSION_ASYNC_VIEWS": "1"}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--students", type=int, default=5000)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--pgbouncer-host")
+    parser.add_argument("--pgbouncer-port", type=int, default=6432)
+    args = parser.parse_args()
+
+    address = f"{args.host}:{args.port}"
+    common = {
+        "DJANGO_SETTINGS_MODULE": "medway_api.settings_production",
+        "DJANGO_SECRET_KEY": os.environ.get("DJANGO_SECRET_KEY", "benchmark"),
+        "DJANGO_ALLOWED_HOSTS": args.host,
+        "REDIS_URL": os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0"),
+        "WEB_CONCURRENCY": str(args.workers),
+        "GUNICORN_BACKLOG": str(args.concurrency * 2),
+    }
+    if args.pgbouncer_host:
+        common.update(
+            POSTGRES_HOST=args.pgbouncer_host,
+            POSTGRES_PORT=str(args.pgbouncer_port),
+            POSTGRES_DISABLE_SERVER_SIDE_CURSORS="1",
+        )
+
+    results = []
+    for label, command, environment in servers(address, args):
+        exam_id, first_student, body = prepare(args.students, args.questions)
+        with tempfile.NamedTemporaryFile(suffix=".json") as body_file:
+            body_file.write(body)
+            body_file.flush()
+            with running_server(
+                command, args.host, args.port, {**common, **environment}
+            ):
+                base = f"http://{address}/students/{{n}}/exams/{exam_id}/submissions/"
+                results.append(
+                    load_test(
+                        base,
+                        f"{label}: submit",
+                        args.concurrency,
+                        None,
+                        method="POST",
+                        body=body_file.name,
+                        requests=args.students,
+                        start=first_student,
+                    )
+                )
+                results.append(
+                    load_test(
+                        base + "result/",
+                        f"{label}: result",
+                        args.concurrency,
+                        args.duration,
+                        start=first_student,
+                        cycle=args.students,
+                    )
+                )
+
+    for result in results:
+        print(json.dumps(result))
+
+
+if __name__ == "__main__":
+    main()
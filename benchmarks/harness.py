@@ -0,0 +1,71 @@
+"""Helpers to run `loadtest.py` against servers started by the benchmarks."""
+
+import asyncio
+import contextlib
+import os
+import socket
+import subprocess
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+from loadtest import run
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+
+def wait_for_port(host, port, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"The server didn't start listening on {host}:{port}.")
+
+
+@contextlib.contextmanager
+def running_server(command, host, port, environment=None):
+    """Run `command` from the app directory until the block exits."""
+    server = subprocess.Popen(
+        command,
+        cwd=APP_DIR,
+        env={**os.environ, **(environment or {})},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        wait_for_port(host, port)
+        yield server
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def load_test(
+    url,
+    label,
+    concurrency,
+    duration,
+    method="GET",
+    body=None,
+    requests=None,
+    start=1,
+    cycle=None,
+):
+    return asyncio.run(
+        run(
+            SimpleNamespace(
+                url=url,
+                method=method,
+                body=body,
+                concurrency=concurrency,
+                duration=duration,
+                requests=requests,
+                start=start,
+                cycle=cycle,
+                label=label,
+            )
+        )
+    )
@@ -0,0 +1,180 @@
+"""
+Minimal HTTP load generator for the API, using only the standard library.
+
+It keeps `--concurrency` clients busy over keep-alive connections for
+`--duration` seconds (or `--requests` requests) and prints requests per second
+and latency percentiles as JSON, so runs can be compared side by side.
+
+Examples:
+    python benchmarks/loadtest.py http://127.0.0.1:8000/exams/1/leaderboard/
+    python benchmarks/loadtest.py \\
+        "http://127.0.0.1:8000/students/{n}/exams/1/submissions/" \\
+        --method POST --body answers.json --start 1 --requests 1000
+
+`{n}` in the URL is replaced by a request counter starting at `--start`,
+which lets every request target a different student. With `--cycle`, the
+counter wraps around after that many values.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+
+def percentile(values, fraction):
+    if not values:
+        return None
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+class Client:
+    def __init__(self, host, port):
+        self.host = host
+        self.port = port
+        self.reader = None
+        self.writer = None
+
+    async def request(self, method, path, body):
+        for attempt in range(2):
+            if self.writer is None:
+                self.reader, self.writer = await asyncio.open_connection(
+                    self.host, self.port
+                )
+            headers = [
+                f"{method} {path} HTTP/1.1",
+                f"Host: {self.host}:{self.port}",
+                "Accept: application/json",
+                f"Content-Length: {len(body)}",
+            ]
+            if body:
+                headers.append("Content-Type: application/json")
+            self.writer.write(("\r\n".join(headers) + "\r\n\r\n").encode() + body)
+            try:
+                await self.writer.drain()
+                return await self.read_response()
+            except (ConnectionError, asyncio.IncompleteReadError):
+                await self.close()
+                # Only retry requests that are safe to send twice, e.g. when
+                # the server closed an idle keep-alive connection.
+                if attempt or method not in ("GET", "HEAD"):
+                    raise
+
+    async def read_response(self):
+        status_line = await self.reader.readuntil(b"\r\n")
+        status = int(status_line.split()[1])
+        headers = {}
+        while True:
+            line = await self.reader.readuntil(b"\r\n")
+            if line == b"\r\n":
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+
+        if headers.get("transfer-encoding") == "chunked":
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+        elif "content-length" in headers:
+            await self.reader.readexactly(int(headers["content-length"]))
+        elif status not in (204, 304):
+            await self.reader.read()
+            await self.close()
+
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status
+
+    async def close(self):
+        if self.writer is not None:
+            self.writer.close()
+            try:
+                await self.writer.wait_closed()
+            except ConnectionError:
+                pass
+        self.reader = self.writer = None
+
+
+async def run(args):
+    url = urlsplit(args.url)
+    path_template = (url.path or "/") + (f"?{url.query}" if url.query else "")
+    body = b""
+    if args.body:
+        with open(args.body, "rb") as file:
+            body = file.read()
+
+    counter = iter(range(args.start, args.start + (args.requests or 10**12)))
+    deadline = time.perf_counter() + args.duration if not args.requests else None
+    latencies = []
+    statuses = {}
+    errors = 0
+
+    async def worker():
+        nonlocal errors
+        client = Client(url.hostname, url.port or 80)
+        try:
+            for number in counter:
+                if deadline is not None and time.perf_counter() >= deadline:
+                    break
+                if args.cycle:
+                    number = args.start + (number - args.start) % args.cycle
+                path = path_template.replace("{n}", str(number))
+                started = time.perf_counter()
+                try:
+                    status = await client.request(args.method, path, body)
+                except (OSError, asyncio.IncompleteReadError, ValueError):
+                    errors += 1
+                    await client.close()
+                    continue
+                latencies.append(time.perf_counter() - started)
+                statuses[status] = statuses.get(status, 0) + 1
+        finally:
+            await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+    elapsed = time.perf_counter() - started
+
+    return {
+        "label": args.label,
+        "url": args.url,
+        "method": args.method,
+        "concurrency": args.concurrency,
+        "requests": len(latencies),
+        "errors": errors,
+        "statuses": {str(status): count for status, count in sorted(statuses.items())},
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms": (
+            {
+                name: round(percentile(latencies, fraction) * 1000, 2)
+                for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+            }
+            if latencies
+            else None
+        ),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url")
+    parser.add_argument("--method", default="GET")
+    parser.add_argument("--body", help="File with the request body.")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=15)
+    parser.add_argument("--requests", type=int, help="Stop after this many requests.")
+    parser.add_argument("--start", type=int, default=1)
+    parser.add_argument("--cycle", type=int, help="Number of distinct `{n}` values.")
+    parser.add_argument("--label", default="")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Microbenchmark of the per-answer cost of rendering an exam result.
+
+For every exam size in `--questions`, one student submits the exam in a
+fresh test database, and the result is rendered `--repeat` times each way:
+
+- serializer: `ExamResultSerializer` over the model instances of
+  `ExamSubmission.objects.with_answers()`.
+- values: `render_result_body` over the `.values()` rows of `result_rows`,
+  plus the percentile.
+
+Both are timed from the database to the rendered bytes ("total") and with
+the submission and its answers already loaded ("build", which still reads
+the percentile), and reported in microseconds per answer. The two outputs
+are checked to be byte-identical.
+
+    python benchmarks/result_rendering.py --questions 10 100 1000 --repeat 50
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from statistics import median
+
+from suite import create_exam, setup_django
+
+
+def timed_median(function, repeat):
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        durations.append(time.perf_counter() - started)
+    return median(durations)
+
+
+def run_case(questions, repeat, rng):
+    from django.test import Client
+    from django.urls import reverse
+    from rest_framework.renderers import JSONRenderer
+    from submission.models import ExamSubmission
+    from submission.leaderboard import get_percentile
+    from submission.results import (
+        render_result,
+        render_result_body,
+        render_result_data,
+        result_rows,
+        with_percentile,
+    )
+    from submission.serializers import ExamResultSerializer
+
+    exam, (student,), (payload,) = create_exam(questions, 1, rng)
+    url = reverse(
+        "create-submission", kwargs={"student_id": student.id, "exam_id": exam.id}
+    )
+    response = Client().post(url, payload, content_type="application/json")
+    assert response.status_code == 201, response.content
+    submission_id = ExamSubmission.objects.get(student=student, exam=exam).pk
+
+    def serializer_total():
+        return render_result(
+            ExamSubmission.objects.with_answers().get(pk=submission_id)
+        )
+
+    instance = ExamSubmission.objects.with_answers().get(pk=submission_id)
+    rows = result_rows(submission_id)
+
+    def serializer_build():
+        return JSONRenderer().render(ExamResultSerializer(instance=instance).data)
+
+    def values_build():
+        submission, answers = rows
+        return with_percentile(
+            render_result_body(submission, answers),
+            get_percentile(submission["exam_id"], submission["total_correct"]),
+        )
+
+    if serializer_total() != render_result_data(submission_id):
+        raise SystemExit(f"Outputs differ for {questions} questions.")
+
+    timings = {
+        "serializer": {
+            "total": timed_median(serializer_total, repeat),
+            "build": timed_median(serializer_build, repeat),
+        },
+        "values": {
+            "total": timed_median(lambda: render_result_data(submission_id), repeat),
+            "build": timed_median(values_build, repeat),
+        },
+    }
+    return {
+        "questions": questions,
+        "us_per_answer": {
+            path: {
+                stage: round(seconds / questions * 1e6, 2)
+                for stage, seconds in stages.items()
+            }
+            for path, stages in timings.items()
+        },
+        "speedup": {
+            stage: round(timings["serializer"][stage] / timings["values"][stage], 2)
+            for stage in ("total", "build")
+        },
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--questions", type=int, nargs="+", default=[10, 100, 1000], metavar="N"
+    )
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    setup_django()
+    from django.test import override_settings
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+    )
+
+    setup_test_environment(debug=False)
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        with override_settings(
+            REQUEST_METRICS_QUERY_BUDGET_MODE="off", SUBMISSION_QUEUE_ENABLED=False
+        ):
+            rng = random.Random(args.seed)
+            results = []
+            for questions in args.questions:
+                results.append(run_case(questions, args.repeat, rng))
+                print(json.dumps(results[-1]), file=sys.stderr)
+    finally:
+        teardown_databases(databases, verbosity=0)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
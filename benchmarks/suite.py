@@ -0,0 +1,265 @@
+"""
+Reproducible latency and query count benchmark of the submission endpoints.
+
+For every exam size in `--questions` (5 alternatives per question), an exam
+and `--students` students are generated in a fresh test database, then the
+requests run in-process through Django's test client, one at a time:
+
+- submit: every student submits the exam once, with answers drawn from
+  `--seed`, so two runs send exactly the same requests.
+- result: every student reads their result for the first time.
+- result (cached): every student reads it again.
+
+    python benchmarks/suite.py --questions 10 100 1000 --students 2000 \\
+        --output before.json
+    python benchmarks/suite.py --baseline before.json --output after.json
+
+The JSON report has the p50/p95/p99 latency and the query counts of each
+endpoint and exam size. With `--baseline`, the run is compared with an
+earlier report, and the exit status is 1 when an endpoint runs more queries
+or its p95 latency grew by more than `--tolerance`. It uses the database of
+the current `POSTGRES_*` environment (the test database is created next to
+it and dropped at the end).
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from statistics import mean
+
+from harness import APP_DIR
+from loadtest import percentile
+
+ENDPOINTS = ("submit", "result", "result (cached)")
+
+
+def setup_django():
+    sys.path.insert(0, str(APP_DIR))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "medway_api.settings")
+    import django
+
+    django.setup()
+
+
+def create_exam(questions, students, rng):
+    """Create an exam and its students, returning the payload of each student."""
+    from exam.models import Exam, ExamQuestion
+    from question.models import Alternative, Question
+    from student.models import Student
+
+    exam = Exam.objects.create(name=f"Benchmark exam with {questions} questions")
+    question_objects = Question.objects.bulk_create(
+        Question(content=f"Benchmark question {number}")
+        for number in range(1, questions + 1)
+    )
+    ExamQuestion.objects.bulk_create(
+        ExamQuestion(exam=exam, question=question, number=number)
+        for number, question in enumerate(question_objects, start=1)
+    )
+    alternatives = Alternative.objects.bulk_create(
+        Alternative(
+            question=question,
+            content=f"Option {option}",
+            option=option,
+            is_correct=option == 1,
+        )
+        for question in question_objects
+        for option in range(1, 6)
+    )
+    choices = [alternatives[n : n + 5] for n in range(0, len(alternatives), 5)]
+
+    student_objects = Student.objects.bulk_create(
+        Student(
+            username=f"benchmark-{exam.id}-{n}", email=f"benchmark-{exam.id}-{n}@x.io"
+        )
+        for n in range(students)
+    )
+    payloads = [
+        json.dumps(
+            {
+                "answers": [
+                    {
+                        "question": alternative.question_id,
+                        "selected_alternative": alternative.id,
+                    }
+                    for alternative in map(rng.choice, choices)
+                ]
+            }
+        )
+        for _ in student_objects
+    ]
+    return exam, student_objects, payloads
+
+
+def measure(client, requests):
+    """Run `(method, url, body)` requests and return their latencies and queries."""
+    latencies = []
+    queries = []
+    statuses = {}
+    for method, url, body in requests:
+        started = time.perf_counter()
+        if method == "POST":
+            response = client.post(url, body, content_type="application/json")
+        else:
+            response = client.get(url)
+        latencies.append(time.perf_counter() - started)
+        queries.append(int(response["X-Query-Count"]))
+        statuses[str(response.status_code)] = (
+            statuses.get(str(response.status_code), 0) + 1
+        )
+    return {
+        "requests": len(latencies),
+        "statuses": statuses,
+        "latency_ms": {
+            name: round(percentile(latencies, fraction) * 1000, 2)
+            for name, fraction in (("p50", 0.5), ("p95", 0.95), ("p99", 0.99))
+        },
+        "mean_latency_ms": round(mean(latencies) * 1000, 2),
+        "queries": {
+            "min": min(queries),
+            "max": max(queries),
+            "mean": round(mean(queries), 2),
+        },
+    }
+
+
+def run_case(client, questions, students, rng):
+    from django.urls import reverse
+
+    exam, student_objects, payloads = create_exam(questions, students, rng)
+    submit_urls = [
+        reverse(
+            "create-submission", kwargs={"student_id": student.id, "exam_id": exam.id}
+        )
+        for student in student_objects
+    ]
+    result_urls = [url + "result/" for url in submit_urls]
+
+    requests = {
+        "submit": [("POST", url, body) for url, body in zip(submit_urls, payloads)],
+        "result": [("GET", url, None) for url in result_urls],
+        "result (cached)": [("GET", url, None) for url in result_urls],
+    }
+    for endpoint in ENDPOINTS:
+        yield {
+            "endpoint": endpoint,
+            "questions": questions,
+            "students": students,
+            **measure(client, requests[endpoint]),
+        }
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=APP_DIR,
+            capture_output=True,
+            check=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(args):
+    setup_django()
+    from django.conf import settings
+    from django.test import Client, override_settings
+    from django.test.utils import (
+        setup_databases,
+        setup_test_environment,
+        teardown_databases,
+    )
+
+    setup_test_environment(debug=False)
+    databases = setup_databases(verbosity=0, interactive=False)
+    try:
+        with override_settings(
+            REQUEST_METRICS_ENABLED=True,
+            REQUEST_METRICS_HEADERS=True,
+            REQUEST_METRICS_QUERY_BUDGET_MODE="off",
+            SUBMISSION_QUEUE_ENABLED=False,
+        ):
+            rng = random.Random(args.seed)
+            client = Client()
+            results = []
+            for questions in args.questions:
+                results.extend(run_case(client, questions, args.students, rng))
+                print(json.dumps(results[-3:]), file=sys.stderr)
+    finally:
+        teardown_databases(databases, verbosity=0)
+
+    return {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "settings": settings.SETTINGS_MODULE,
+        "seed": args.seed,
+        "results": results,
+    }
+
+
+def compare(report, baseline, tolerance):
+    """Print the changes from `baseline`, returning whether any is a regression."""
+    previous = {
+        (result["endpoint"], result["questions"]): result
+        for result in baseline["results"]
+    }
+    regression = False
+    for result in report["results"]:
+        before = previous.get((result["endpoint"], result["questions"]))
+        if before is None:
+            continue
+        p95_ratio = result["latency_ms"]["p95"] / before["latency_ms"]["p95"]
+        more_queries = result["queries"]["max"] > before["queries"]["max"]
+        slower = p95_ratio > 1 + tolerance
+        regression = regression or more_queries or slower
+        print(
+            f"{result['endpoint']} ({result['questions']} questions): "
+            f"p95 {before['latency_ms']['p95']} -> {result['latency_ms']['p95']} ms "
+            f"({p95_ratio - 1:+.0%}), "
+            f"max queries {before['queries']['max']} -> {result['queries']['max']}"
+            + (" REGRESSION" if more_queries or slower else ""),
+            file=sys.stderr,
+        )
+    return regression
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--questions", type=int, nargs="+", default=[10, 100, 1000], metavar="N"
+    )
+    parser.add_argument("--students", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Write the JSON report to this file.")
+    parser.add_argument("--baseline", help="Compare with an earlier JSON report.")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Allowed relative growth of the p95 latency against the baseline.",
+    )
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if compare(report, baseline, args.tolerance):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,36 @@
 #!/bin/bash
 
+# The application servers run the production settings unless told otherwise.
+case "${APP_SERVER:-runserver}" in
+    gunicorn|uvicorn)
+        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:-medway_api.settings_production}"
+        ;;
+    *)
+        export DJANGO_SETTINGS_MODULE="${DJANGO_SETTINGS_MODULE:-medway_api.settings}"
+        ;;
+esac
+
+# Other commands, like the submission queue worker, run with the same
+# settings as the server.
+if [ "$#" -gt 0 ]; then
+    exec "$@"
+fi
+
 python manage.py wait_for_postgres
 python manage.py migrate
-python manage.py runserver 0.0.0.0:8000
+
+case "${APP_SERVER:-runserver}" in
+    gunicorn)
+        exec gunicorn medway_api.wsgi:application
+        ;;
+    uvicorn)
+        # Persistent connections aren't reused across requests under ASGI and
+        # pile up instead, so pool them with pgbouncer if needed.
+        export POSTGRES_CONN_MAX_AGE=0
+        exec gunicorn medway_api.asgi:application \
+            --worker-class uvicorn_worker.UvicornWorker
+        ;;
+    *)
+        exec python manage.py runserver 0.0.0.0:8000
+        ;;
+esac